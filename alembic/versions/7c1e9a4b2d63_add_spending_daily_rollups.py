@@ -0,0 +1,44 @@
+"""Add spending_daily_rollups and backfill it from spending_logs
+
+Revision ID: 7c1e9a4b2d63
+Revises: dee6dee22db5
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9a4b2d63'
+down_revision: Union[str, None] = 'dee6dee22db5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'spending_daily_rollups',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False, server_default=''),
+        sa.Column('currency', sa.String(length=3), nullable=False, server_default='USD'),
+        sa.Column('total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'category', 'currency', name='spending_daily_rollups_pkey'),
+    )
+    # Backfill; same grouping as `python -m backend.services.spending_rollup_service rebuild`
+    op.execute(
+        "INSERT INTO spending_daily_rollups (user_id, day, category, currency, total, count) "
+        "SELECT user_id, date, coalesce(category, ''), coalesce(currency, 'USD'), sum(amount), count(*) "
+        "FROM spending_logs WHERE date IS NOT NULL "
+        "GROUP BY user_id, date, coalesce(category, ''), coalesce(currency, 'USD')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('spending_daily_rollups')
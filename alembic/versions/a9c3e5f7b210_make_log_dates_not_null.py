@@ -0,0 +1,56 @@
+"""Make spending/medical log dates NOT NULL and index the list order
+
+Revision ID: a9c3e5f7b210
+Revises: f4a8b2c6d913
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e5f7b210'
+down_revision: Union[str, None] = 'f4a8b2c6d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# `date` leads the keyset page key (date, timestamp, id) of both lists; a NULL date made the cursor
+# after such a row match nothing. (table, old index, new index). Checked by `python -m backend.benchmarks.query_plans`.
+TABLES = [
+    ('spending_logs', 'ix_spending_logs_user_id_date', 'ix_spending_logs_user_id_date_page'),
+    ('medical_logs', 'ix_medical_logs_user_id_date', 'ix_medical_logs_user_id_date_page'),
+]
+PAGE_COLUMNS = ['user_id', sa.text('date DESC'), sa.text('timestamp DESC'), sa.text('id DESC')]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Undated spending logs were never rolled up; count them on the day they get
+    op.execute("""
+        INSERT INTO spending_daily_rollups (user_id, day, category, currency, total, count)
+        SELECT user_id, COALESCE(timestamp::date, CURRENT_DATE), COALESCE(category, ''), COALESCE(currency, 'USD'), SUM(amount), COUNT(*)
+        FROM spending_logs WHERE date IS NULL GROUP BY 1, 2, 3, 4
+        ON CONFLICT ON CONSTRAINT spending_daily_rollups_pkey
+        DO UPDATE SET total = spending_daily_rollups.total + EXCLUDED.total, count = spending_daily_rollups.count + EXCLUDED.count
+    """)
+    for table, _, _ in TABLES:
+        op.execute(f"UPDATE {table} SET date = COALESCE(timestamp::date, CURRENT_DATE) WHERE date IS NULL")
+        op.alter_column(table, 'date', existing_type=sa.Date(), nullable=False)
+    # CONCURRENTLY avoids locking writes on large tables; it can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for table, old, new in TABLES:
+            op.create_index(new, table, PAGE_COLUMNS, unique=False, postgresql_concurrently=True, if_not_exists=True)
+            op.drop_index(old, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, old, new in reversed(TABLES):
+            op.create_index(old, table, ['user_id', 'date'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+            op.drop_index(new, table_name=table, postgresql_concurrently=True, if_exists=True)
+    for table, _, _ in reversed(TABLES):
+        op.alter_column(table, 'date', existing_type=sa.Date(), nullable=True)
@@ -0,0 +1,44 @@
+"""Add composite (user_id, time) indexes for per-user listings
+
+Revision ID: dee6dee22db5
+Revises: 4ae57849b93b
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dee6dee22db5'
+down_revision: Union[str, None] = '4ae57849b93b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial predicate). Checked by `python -m backend.benchmarks.query_plans`.
+INDEXES = [
+    ('ix_notes_user_id_timestamp', 'notes', ['user_id', sa.text('timestamp DESC')], None),
+    ('ix_notes_user_id_date_associated', 'notes', ['user_id', 'date_associated'], None),
+    ('ix_investment_notes_user_id_timestamp', 'investment_notes', ['user_id', sa.text('timestamp DESC')], None),
+    ('ix_spending_logs_user_id_date', 'spending_logs', ['user_id', 'date'], None),
+    ('ix_medical_logs_user_id_date', 'medical_logs', ['user_id', 'date'], None),
+    ('ix_reminders_active_user_id_remind_at', 'reminders', ['user_id', 'remind_at'], sa.text('is_active')),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY avoids locking writes on large tables; it can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True,
+                            postgresql_where=where, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,33 @@
+"""Add triggered_at to reminders for the reminder dispatcher
+
+Revision ID: e2c7a9d41f06
+Revises: b5d0f3a8c914
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7a9d41f06'
+down_revision: Union[str, None] = 'b5d0f3a8c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reminders', sa.Column('triggered_at', sa.DateTime(timezone=True), nullable=True))
+    # Reminders already past due predate the dispatcher; mark them fired so they don't all go off at deploy
+    op.execute("UPDATE reminders SET triggered_at = remind_at WHERE remind_at < now()")
+    op.create_index('ix_reminders_pending_remind_at', 'reminders', ['remind_at'],
+                    postgresql_where=sa.text("is_active = true AND triggered_at IS NULL"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reminders_pending_remind_at', table_name='reminders')
+    op.drop_column('reminders', 'triggered_at')
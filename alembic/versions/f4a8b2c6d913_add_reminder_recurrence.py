@@ -0,0 +1,35 @@
+"""Add recurrence columns to reminders
+
+Revision ID: f4a8b2c6d913
+Revises: e2c7a9d41f06
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8b2c6d913'
+down_revision: Union[str, None] = 'e2c7a9d41f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reminders', sa.Column('recurrence_rule', sa.String(), nullable=True))
+    op.add_column('reminders', sa.Column('recurrence_start', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('reminders', sa.Column('recurrence_end', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_reminders_recurring_user_id_start', 'reminders', ['user_id', 'recurrence_start'],
+                    postgresql_where=sa.text("recurrence_rule IS NOT NULL"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reminders_recurring_user_id_start', table_name='reminders')
+    op.drop_column('reminders', 'recurrence_end')
+    op.drop_column('reminders', 'recurrence_start')
+    op.drop_column('reminders', 'recurrence_rule')
@@ -16,11 +16,13 @@ from backend.db.models.user import UserDB # Import DB model
 from backend.schemas.token import TokenData
 from backend.schemas.user import User # Import Pydantic model
 from backend import crud # Import crud package
+from backend.core.timing import timed_stage
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
 
 # --- Dependency to get the UserDB object ---
 # Needed for operations that require the SQLAlchemy model instance (like update)
+@timed_stage("auth") # Token decode + user lookup
 def get_current_user_db_object(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> Optional[UserDB]:
@@ -4,7 +4,8 @@ from fastapi import APIRouter
 
 from backend.api.v1.endpoints import (
     auth, users, process, notes, reminders,
-    spending, investments, medical, summary # Added summary router import
+    spending, investments, medical, summary, # Added summary router import
+    jobs, events,
 )
 
 api_router = APIRouter()
@@ -18,3 +19,5 @@ api_router.include_router(spending.router, prefix="/spending", tags=["Spending"]
 api_router.include_router(investments.router, prefix="/investments", tags=["Investments"])
 api_router.include_router(medical.router, prefix="/medical", tags=["Medical"])
 api_router.include_router(summary.router, prefix="/summary", tags=["Summary"]) # Include summary router
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
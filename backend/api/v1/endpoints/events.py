@@ -0,0 +1,91 @@
+# backend/api/v1/endpoints/events.py
+# Per-user push channel as Server-Sent Events: fired reminders, finished background jobs and
+# data changes (see services/event_hub.py), so clients don't have to poll. EventSource can't send an
+# Authorization header, so browsers first POST /events/ticket and open the stream with ?ticket=: a
+# short-lived token that only opens this stream, never the long-lived access token, because query
+# strings end up in access logs (ours redact it: core/logs.py).
+import asyncio
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+
+from backend import crud
+from backend.api import deps
+from backend.db import session as db_session
+from backend.core import security
+from backend.core.config import settings
+from backend.schemas.token import StreamTicket
+from backend.schemas.user import User
+from backend.services.event_hub import hub
+
+router = APIRouter()
+
+optional_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token", auto_error=False)
+RETRY_MS = 3000 # Client reconnect delay (SSE `retry:`)
+
+
+def _authenticate(token: Optional[str], ticket: Optional[str]) -> int:
+    """
+    User id for a bearer `token` or a stream `ticket`. Uses its own short-lived session: a stream must
+    not hold a pooled connection open.
+    """
+    if not token and not ticket:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    db = db_session.SessionLocal()
+    try:
+        if token: user_db = deps.get_current_user_db_object(db=db, token=token)
+        else:
+            payload = security.decode_stream_ticket(ticket)
+            user_db = crud.user.get_by_email(db, email=payload["sub"]) if payload and payload.get("sub") else None
+            if user_db is None: raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired stream ticket")
+        if not user_db.is_active: raise HTTPException(status_code=400, detail="Inactive user")
+        return user_db.id
+    finally:
+        db.close()
+
+
+def _format(event: Dict[str, Any]) -> str:
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, separators=(',', ':'), default=str)}\n\n"
+
+
+@router.post("/ticket", response_model=StreamTicket)
+async def create_ticket(current_user: User = Depends(deps.get_current_active_user)):
+    """ A ticket for `GET /events?ticket=`, valid EVENTS_TICKET_SECONDS; get a new one for each (re)connect. """
+    return {"ticket": security.create_stream_ticket(current_user.email), "expires_in": settings.EVENTS_TICKET_SECONDS}
+
+
+@router.get("/", response_class=StreamingResponse)
+async def stream_events(
+    token: Optional[str] = Depends(optional_oauth2),
+    ticket: Optional[str] = Query(None, description="From POST /events/ticket, for EventSource clients that can't set headers"),
+):
+    """
+    text/event-stream of this user's events: `reminder` (fired), `job` (done/failed), `change`
+    (entity + created/updated/deleted ids) and `resync` (events were lost: re-fetch lists).
+    """
+    user_id = await run_in_threadpool(_authenticate, token, ticket)
+    if not hub.accepting:
+        detail = "Event stream limit reached on this server" if hub.running else "Event streams are not available"
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail, headers={"Retry-After": "5"})
+
+    async def stream():
+        subscription = hub.subscribe(user_id) # Here, not before: a client gone before the first read never subscribes
+        if subscription is None:
+            yield f"retry: {RETRY_MS}\nevent: unavailable\ndata: {{}}\n\n"; return
+        try:
+            yield f"retry: {RETRY_MS}\nevent: ready\ndata: {{}}\n\n"
+            while True:
+                try: event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"; continue
+                if event is None: return # Server shutting down; the client reconnects after `retry`
+                yield _format(event)
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}) # No proxy buffering
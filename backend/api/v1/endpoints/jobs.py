@@ -0,0 +1,22 @@
+# backend/api/v1/endpoints/jobs.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from backend.db.session import get_db
+from backend.schemas.job import Job
+from backend.schemas.user import User
+from backend.api import deps
+from backend import crud
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=Job)
+def read_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """ Status and result of one of the current user's background jobs (e.g. POST /summary/{date}/jobs). """
+    job_db = crud.job.get(db=db, id=job_id)
+    if not job_db or job_db.user_id != current_user.id: raise HTTPException(status_code=404, detail="Job not found")
+    return job_db
@@ -10,6 +10,7 @@ from backend.schemas.user import User
 from backend.schemas.api_models import Message
 from backend.api import deps
 from backend import crud
+from backend.crud.pagination import InvalidCursorError, next_cursor
 from backend.core.config import logger
 
 router = APIRouter()
@@ -35,14 +36,17 @@ async def read_medical_logs(
     log_type: Optional[str] = Query(None, description="Filter by log type (case-insensitive, partial match)"),
     start_date: Optional[datetime.date] = Query(None, description="Filter logs from this date"),
     end_date: Optional[datetime.date] = Query(None, description="Filter logs up to this date"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """ Retrieve medical logs for the current user, with optional filters. """
-    logs_db = crud.medical_log.get_multi_by_owner(
-        db=db, user_id=current_user.id,
-        log_type=log_type, start_date=start_date, end_date=end_date, # Pass filters
-        skip=skip, limit=limit
-    )
-    return MedicalLogsOutput(medical_logs=logs_db)
+    try:
+        logs_db = crud.medical_log.get_multi_by_owner(
+            db=db, user_id=current_user.id,
+            log_type=log_type, start_date=start_date, end_date=end_date, # Pass filters
+            skip=skip, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e: raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return MedicalLogsOutput(medical_logs=logs_db, next_cursor=next_cursor(logs_db, crud.medical_log.page_key, limit))
 # --- End Update ---
 
 @router.get("/{log_id}", response_model=MedicalLog)
@@ -9,6 +9,7 @@ from backend.schemas.user import User
 from backend.schemas.api_models import Message
 from backend.api import deps
 from backend import crud
+from backend.crud.pagination import InvalidCursorError, next_cursor
 from backend.core.config import logger
 from backend.services import summary_service
 
@@ -27,17 +28,21 @@ async def read_global_notes(
     end_date: Optional[datetime.date] = Query(None, description="Filter notes created up to this date"),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """Retrieve global notes for the current user, optionally filtered by creation date."""
-    notes_db = crud.note.get_global(
-        db=db,
-        user_id=current_user.id,
-        start_date=start_date,
-        end_date=end_date,  # Pass filters to CRUD
-        skip=skip,
-        limit=limit,
-    )
-    return NotesOutput(notes=notes_db)
+    try:
+        notes_db = crud.note.get_global(
+            db=db,
+            user_id=current_user.id,
+            start_date=start_date,
+            end_date=end_date,  # Pass filters to CRUD
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e: raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return NotesOutput(notes=notes_db, next_cursor=next_cursor(notes_db, crud.note.page_key, limit))
 
 # --- Path Changed back to /important/{date_str} ---
 @router.get("/important/{date_str}", response_model=NotesOutput)
@@ -4,14 +4,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 import datetime
-from typing import Dict, Any, Optional
-
-# Attempt to import dateutil safely
-try:
-    import dateutil.parser
-    DATEUTIL_AVAILABLE = True
-except ImportError:
-    DATEUTIL_AVAILABLE = False
+from typing import Dict, Any
 
 # Standard library imports first
 import json
@@ -22,15 +15,18 @@ from backend.db.session import get_db
 from backend.schemas.api_models import ProcessInput, ProcessOutput
 from backend.schemas.user import User
 from backend.schemas.note import NoteCreate
-from backend.schemas.spending_log import SpendingLogCreate, SpendingLog
+from backend.schemas.spending_log import SpendingLogCreate
 from backend.schemas.investment_note import InvestmentNoteCreate
 from backend.schemas.medical_log import MedicalLogCreate
 from backend.api import deps # For authentication dependency
-from backend.services.llm import get_llm_service # For LLM calls
+from backend.services.llm import get_llm_service, CircuitOpenError, PRIORITY_INTERACTIVE, TASK_CHAT, TASK_RAG_ANSWER # For LLM calls
 from backend.services.nlu_service import get_nlu_results_hybrid # Using hybrid NLU
-from backend.services import summary_service, reminder_service # Specific services
+from backend.services import summary_service, reminder_service, analytics_service # Specific services
+from backend.services.temporal_service import parse_date as parse_date_entity, parse_datetime as parse_datetime_entity # Shared temporal parsing
 from backend import crud # Access to all CRUD operations
 from backend.core.config import logger # Central logger
+from backend.core.timing import set_request_intent, stage_timer
+from backend.core import metrics
 
 # --- Context Management (Simple In-Memory) ---
 # TODO: Replace with a persistent solution like Redis or Database integration
@@ -55,86 +51,18 @@ def update_user_context(user_id: int, new_interaction: Dict):
     if "intent" in new_interaction:
          context["last_intent"] = new_interaction["intent"]
     user_contexts[user_id] = context
+
+def _context_store_metrics():
+    yield ("conversation_context_users", "gauge", "Users with in-memory conversation context.", [({}, len(user_contexts))])
+    yield ("conversation_context_messages", "gauge", "Conversation history entries held in memory.",
+           [({}, sum(len(c["conversation_history"]) for c in list(user_contexts.values())))])
+
+metrics.register_collector(_context_store_metrics)
 # --- End Context Management ---
 
 # --- API Router ---
 router = APIRouter()
 
-# --- Helper Function to Parse Date Entities ---
-def parse_date_entity(raw_date_entity: Any) -> Optional[datetime.date]:
-    """ Parses various date inputs into a date object. """
-    if isinstance(raw_date_entity, datetime.date):
-        return raw_date_entity
-    if isinstance(raw_date_entity, datetime.datetime):
-        return raw_date_entity.date()
-    if isinstance(raw_date_entity, str):
-        raw_date_entity_lower = raw_date_entity.lower()
-        if raw_date_entity_lower == 'today':
-            return datetime.date.today()
-        elif raw_date_entity_lower == 'yesterday':
-            return datetime.date.today() - datetime.timedelta(days=1)
-        elif raw_date_entity_lower == 'tomorrow':
-             return datetime.date.today() + datetime.timedelta(days=1)
-        else:
-            try:
-                # Attempt ISO format first
-                return datetime.date.fromisoformat(raw_date_entity)
-            except ValueError:
-                # Fallback to dateutil if available
-                if DATEUTIL_AVAILABLE:
-                    try:
-                        # Default to None if parsing fails completely
-                        parsed_dt = dateutil.parser.parse(raw_date_entity, default=datetime.datetime.now(datetime.timezone.utc))
-                        return parsed_dt.date()
-                    except (ValueError, TypeError, OverflowError) as e:
-                         logger.warning(f"dateutil could not parse date entity '{raw_date_entity}': {e}")
-                         return None
-                else:
-                     logger.warning(f"Could not parse date entity '{raw_date_entity}' with basic methods.")
-                     return None
-    logger.debug(f"Could not parse '{raw_date_entity}' as date.")
-    return None
-# --- End Helper Function ---
-
-# --- Helper Function to Parse Datetime Entities ---
-def parse_datetime_entity(raw_datetime_entity: Any) -> Optional[datetime.datetime]:
-     """ Parses various datetime inputs into a timezone-aware datetime object (UTC). """
-     if isinstance(raw_datetime_entity, datetime.datetime):
-         if raw_datetime_entity.tzinfo is None:
-             return raw_datetime_entity.replace(tzinfo=datetime.timezone.utc)
-         else:
-             return raw_datetime_entity.astimezone(datetime.timezone.utc)
-     if isinstance(raw_datetime_entity, str):
-         try:
-             # Try ISO format first (dateutil handles this well)
-             if DATEUTIL_AVAILABLE:
-                 dt = dateutil.parser.isoparse(raw_datetime_entity)
-                 if dt.tzinfo is None: return dt.replace(tzinfo=datetime.timezone.utc)
-                 else: return dt.astimezone(datetime.timezone.utc)
-             else: # Basic ISO parse if dateutil not available
-                  dt = datetime.datetime.fromisoformat(raw_datetime_entity)
-                  if dt.tzinfo is None: return dt.replace(tzinfo=datetime.timezone.utc)
-                  else: return dt.astimezone(datetime.timezone.utc)
-         except (ValueError, TypeError):
-             # Fallback to general parsing if ISO fails and dateutil is available
-             if DATEUTIL_AVAILABLE:
-                 try:
-                     now = datetime.datetime.now(datetime.timezone.utc)
-                     # Use fuzzy=False for potentially more predictable parsing
-                     dt = dateutil.parser.parse(raw_datetime_entity, default=now, fuzzy=False)
-                     if dt.tzinfo is None: return dt.replace(tzinfo=datetime.timezone.utc)
-                     else: return dt.astimezone(datetime.timezone.utc)
-                 except (ValueError, TypeError, OverflowError) as e:
-                     logger.warning(f"dateutil could not parse datetime entity '{raw_datetime_entity}': {e}")
-                     return None
-             else:
-                  logger.warning(f"Could not parse datetime entity '{raw_datetime_entity}' with basic methods.")
-                  return None
-     logger.debug(f"Could not parse '{raw_datetime_entity}' as datetime.")
-     return None
-# --- End Helper Function ---
-
-
 @router.post("/", response_model=ProcessOutput)
 async def process_input_endpoint(
     input_data: ProcessInput,
@@ -162,7 +90,8 @@ async def process_input_endpoint(
         nlu_result = await get_nlu_results_hybrid(text_input, context)
         intent = nlu_result.get("intent", "unknown")
         entities = nlu_result.get("entities", {})
-        logger.info(f"Intent: {intent} | Entities: {entities}")
+        set_request_intent(intent)
+        logger.info("Intent: %s", intent); logger.debug("Entities: %s", entities) # Entity dicts only at DEBUG
     except Exception as e:
         logger.error(f"NLU Service error: {e}", exc_info=True)
         # Update context with failure? For now, just return generic error
@@ -248,27 +177,24 @@ async def process_input_endpoint(
             time_range = entities.get('time_range', 'month')
             category_filter = entities.get('category')
             logger.info(f"Handling query_spending intent for user {user_id}. Range: {time_range}, Category: {category_filter}")
-            # Call CRUD function (placeholder logic inside)
-            spending_data_db = crud.spending_log.get_by_time_range(db=db, user_id=user_id, time_range=time_range, category=category_filter)
-            # Pass data to summary service (placeholder logic inside)
-            # --- FIX: Convert DB objects to Pydantic models, then to dicts ---
-            spending_data_pydantic = [SpendingLog.model_validate(log) for log in spending_data_db]  # Pydantic V2
-            spending_data_dict = [log.dict() for log in spending_data_pydantic]
-            # --- End Fix ---
-            reply_text = await summary_service.generate_spending_summary(spending_data=spending_data_dict, time_range=time_range)
+            start_date, end_date = parse_date_entity(entities.get('start_date')), parse_date_entity(entities.get('end_date'))
+            explicit_range = (start_date, end_date) if start_date and end_date and start_date <= end_date else None
+            # One query for this period and the previous one; stats computed locally
+            bounds = analytics_service.period_bounds(time_range, datetime.date.today(), *(explicit_range or (None, None)))
+            rows = crud.spending_log.get_series(db=db, user_id=user_id, start_date=bounds.previous_start or bounds.start,
+                                                end_date=bounds.end, category=category_filter)
+            with stage_timer("analytics"): stats = analytics_service.spending_stats(rows, bounds)
+            if input_data.explain or analytics_service.wants_explanation(text_input): # Analysis requested: LLM prompt built from the stats
+                reply_text = await summary_service.generate_spending_summary(stats, time_range, category_filter, explicit_range)
+            else: # Fast path: templated reply, no LLM call
+                reply_text = analytics_service.render_spending_reply(stats, time_range, category_filter, explicit_range)
 
         elif intent == "get_reminders":
             time_filter = entities.get('filter', 'week') # Default to upcoming week
             logger.info(f"Handling get_reminders intent for user {user_id}. Filter: {time_filter}")
             try:
                 reminders = crud.reminder.get_filtered_reminders(db=db, user_id=user_id, time_filter=time_filter)
-                if not reminders: reply_text = f"You have no reminders scheduled for '{time_filter}'." if time_filter != "all" else "You have no active reminders."
-                else:
-                    reply_text = f"Okay, here are your reminders for '{time_filter}':\n"
-                    for rem in reminders:
-                        try: rem_time_local = rem.remind_at.astimezone(); time_str = rem_time_local.strftime('%a, %b %d %I:%M %p %Z')
-                        except Exception: time_str = rem.remind_at.strftime('%Y-%m-%d %H:%M UTC')
-                        reply_text += f"- {rem.content} (at {time_str})\n"
+                reply_text = analytics_service.render_reminders_reply(reminders, time_filter)
             except Exception as e: logger.error(f"Error fetching reminders: {e}", exc_info=True); reply_text = "Sorry, couldn't fetch reminders."
 
         elif intent == "search_information":
@@ -301,8 +227,10 @@ async def process_input_endpoint(
             except Exception as e: logger.error(f"Vector search failed: {e}", exc_info=True)
             if context_notes: logger.info(f"Found {len(context_notes)} notes."); context_str += "Based on context from your past notes:\n";
             for i, note in enumerate(context_notes): context_str += f"{i+1}: {note.content}\n"; context_str += "---\n"
-            final_prompt = f"{context_str}Please answer the following question:\n\nQuestion: {question}\n\nAnswer:"; logger.debug(f"LLM prompt:\n{final_prompt}")
-            try: llm_service = get_llm_service(); answer = await llm_service.generate_text(prompt=final_prompt); reply_text = answer
+            final_prompt = f"{context_str}Please answer the following question:\n\nQuestion: {question}\n\nAnswer:"; logger.debug("LLM prompt:\n%s", final_prompt)
+            try: llm_service = get_llm_service(); answer = await llm_service.generate_text(prompt=final_prompt, task=TASK_RAG_ANSWER, priority=PRIORITY_INTERACTIVE); reply_text = answer
+            except CircuitOpenError: # LLM down: answer locally with the retrieved notes
+                reply_text = "I can't reach the language model right now." + (" Related notes:\n" + "\n".join(f"- {note.content[:200]}" for note in context_notes) if context_notes else "")
             except Exception as e: logger.error(f"LLM answer error: {e}", exc_info=True); reply_text = "Sorry, error getting answer."
 
         else: # Unknown intent from NLU, fallback to LLM chat
@@ -312,8 +240,10 @@ async def process_input_endpoint(
                  # Construct a simple chat prompt
                  # TODO: Add conversation history from context for better chat
                  chat_prompt = f"User: {text_input}\nAssistant:"
-                 llm_response = await llm_service.generate_text(prompt=chat_prompt, max_tokens=150)
+                 llm_response = await llm_service.generate_text(prompt=chat_prompt, task=TASK_CHAT, max_tokens=150, priority=PRIORITY_INTERACTIVE)
                  reply_text = llm_response.strip()
+             except CircuitOpenError:
+                 reply_text = "I can't reach the language model right now, so I can only handle notes, spending, reminders and logs. Please try again shortly."
              except Exception as e:
                  logger.error(f"LLM fallback error: {e}", exc_info=True)
                  reply_text = "Sorry, I couldn't process that request." # Generic error for final fallback
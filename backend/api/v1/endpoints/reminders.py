@@ -1,7 +1,7 @@
 # backend/api/v1/endpoints/reminders.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import datetime
 
 from backend.db.session import get_db
@@ -10,6 +10,7 @@ from backend.schemas.user import User
 from backend.schemas.api_models import Message
 from backend.api import deps
 from backend import crud
+from backend.crud.pagination import InvalidCursorError, next_cursor
 from backend.core.config import logger
 from backend.services import reminder_service
 
@@ -40,17 +41,29 @@ async def create_new_reminder(
 
 @router.get("/", response_model=List[Reminder])
 def read_reminders(
+    response: Response,
     active_only: bool = Query(True),
     time_filter: str = Query("week"),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces skip)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user)
 ):
-    reminders_db = crud.reminder.get_filtered_reminders(
-        db,
-        user_id=current_user.id,
-        time_filter=time_filter,
-        is_active=active_only
-    )
+    # Response stays a plain list for compatibility; the next page's cursor goes in X-Next-Cursor
+    try:
+        reminders_db = crud.reminder.get_filtered_reminders(
+            db,
+            user_id=current_user.id,
+            time_filter=time_filter,
+            is_active=active_only,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e: raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    following = next_cursor(reminders_db, crud.reminder.page_key, limit)
+    if following: response.headers["X-Next-Cursor"] = following
     return reminders_db
 
 
@@ -2,14 +2,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from backend.db.session import get_db
-from backend.schemas.spending_log import SpendingLog, SpendingLogCreate, SpendingLogUpdate, SpendingLogsOutput
+from backend.schemas.spending_log import SpendingLog, SpendingLogCreate, SpendingLogUpdate, SpendingLogsOutput, SpendingAggregateOutput
 from backend.schemas.user import User
 from backend.schemas.api_models import Message
 from backend.api import deps
 from backend import crud
+from backend.crud.pagination import InvalidCursorError, next_cursor
 from backend.core.config import logger
 
 router = APIRouter()
@@ -35,24 +36,54 @@ async def read_spending_logs(
     start_date: Optional[datetime.date] = Query(None, description="Filter logs from this date"),
     end_date: Optional[datetime.date] = Query(None, description="Filter logs up to this date"),
     category: Optional[str] = Query(None, description="Filter by category (case-insensitive, partial match)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces skip)"),
 ):
     """Retrieve spending logs for the current user, with optional date and category filters."""
-    logs_db = crud.spending_log.get_multi_by_owner(
-        db=db,
-        user_id=current_user.id,
-        start_date=start_date,
-        end_date=end_date,
-        category=category,  # Pass filters to CRUD
-        skip=skip,
-        limit=limit
-    )
-    # TODO: Calculate total based on fetched logs if needed, or add dedicated summary endpoint
-    total = None
-    # Example client-side calculation: 
-    if logs_db: total = sum(log.amount for log in logs_db)
-    return SpendingLogsOutput(spending_logs=logs_db, total_amount=total)
+    try:
+        logs_db = crud.spending_log.get_multi_by_owner(
+            db=db,
+            user_id=current_user.id,
+            start_date=start_date,
+            end_date=end_date,
+            category=category,  # Pass filters to CRUD
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e: raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # Total over every matching log (not just this page), summed in SQL per currency
+    totals = crud.spending_log.aggregate(db, user_id=current_user.id, period=None, by_category=False,
+                                         start_date=start_date, end_date=end_date, category=category)
+    total, currency = (totals[0]["total"], totals[0]["currency"]) if len(totals) == 1 else (None, None)
+    return SpendingLogsOutput(spending_logs=logs_db, total_amount=total, currency=currency,
+                              next_cursor=next_cursor(logs_db, crud.spending_log.page_key, limit))
 # --- End Update ---
 
+# Declared before /{log_id} so "aggregate" isn't parsed as an id
+@router.get("/aggregate", response_model=SpendingAggregateOutput)
+async def aggregate_spending(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+    period: Literal["day", "week", "month", "year", "all"] = Query("month", description="Bucket size; 'all' for one bucket over the whole range"),
+    by_category: bool = Query(True, description="Also group by category"),
+    start_date: Optional[datetime.date] = Query(None, description="Include logs from this date"),
+    end_date: Optional[datetime.date] = Query(None, description="Include logs up to this date"),
+    category: Optional[str] = Query(None, description="Filter by category (case-insensitive, partial match)"),
+):
+    """ Spending totals grouped by period bucket, category and currency, computed in the database. """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date")
+    series = crud.spending_log.aggregate(
+        db, user_id=current_user.id, period=None if period == "all" else period, by_category=by_category,
+        start_date=start_date, end_date=end_date, category=category,
+    )
+    totals = {} # currency -> {"currency", "total", "count"}, folded from the series (no second query)
+    for row in series:
+        entry = totals.setdefault(row["currency"], {"currency": row["currency"], "total": 0.0, "count": 0})
+        entry["total"] += row["total"]; entry["count"] += row["count"]
+    return SpendingAggregateOutput(period=period, start_date=start_date, end_date=end_date,
+                                   series=series, totals=list(totals.values()))
+
 
 
 @router.get("/{log_id}", response_model=SpendingLog)
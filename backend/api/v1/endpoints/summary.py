@@ -5,10 +5,12 @@ import datetime
 
 from backend.db.session import get_db
 from backend.schemas.api_models import SummaryOutput
+from backend.schemas.job import Job
 from backend.schemas.user import User
 from backend.api import deps
 from backend import crud
 from backend.services.summary_service import generate_daily_summary  # Import summary service
+from backend.crud.crud_job import PRIORITY_HIGH
 from backend.core.config import logger
 
 router = APIRouter()
@@ -34,3 +36,17 @@ async def get_daily_summary( # Make endpoint async
         raise HTTPException(status_code=500, detail="Error generating daily summary.")
 
     return SummaryOutput(summary=summary_text, date=target_date)
+
+@router.post("/{date_str}/jobs", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def queue_daily_summary(
+    date_str: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """ Generate the summary in the background; poll GET /jobs/{id} for the result. """
+    try: target_date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError: raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date format. Use YYYY-MM-DD.")
+    job_db = crud.job.enqueue(db, kind="daily_summary", payload={"date": target_date.isoformat()}, user_id=current_user.id,
+                              priority=PRIORITY_HIGH, max_attempts=3)
+    logger.info(f"Queued daily summary job {job_db.id} for user {current_user.id} on {target_date}")
+    return job_db
@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+# Offline performance harnesses. Run modules with `python -m backend.benchmarks.<name>` from the project root.
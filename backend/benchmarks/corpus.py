@@ -0,0 +1,38 @@
+# backend/benchmarks/corpus.py
+# Mixed-intent utterances for load tests. Weights roughly follow expected real traffic.
+from typing import List, Tuple
+
+# (category, utterance)
+PROCESS_CORPUS: List[Tuple[str, str]] = [
+    # Notes (fall through the rules to the LLM/heuristic save_note path)
+    ("note", "Idea for the blog: compare three budgeting apps and their export formats"),
+    ("note", "Parking spot at the airport is level 3 row F"),
+    ("note", "Jane recommended the book Deep Work, check the library"),
+    ("note", "The wifi password for the cabin is written on the fridge magnet"),
+    ("note", "Tried the new ramen place on 5th street, broth was great but noodles soggy"),
+    # Spending (rule-based)
+    ("spending", "Spent $12.50 on lunch"),
+    ("spending", "I spent $45 on groceries"),
+    ("spending", "paid €30 for the concert ticket"),
+    ("spending", "Bought a new keyboard for $89.99"),
+    ("spending", "spent ₹250 on coffee beans"),
+    # Reminders / meetings (rule-based, dateutil parsing)
+    ("reminder", "Remind me to call mom at 5pm tomorrow"),
+    ("reminder", "remind me to renew the passport on friday"),
+    ("reminder", "Set reminder to water the plants at 8am"),
+    ("reminder", "Meeting with Alex at 3pm to discuss the roadmap"),
+    ("reminder", "schedule a demo for next monday at 10am"),
+    # Data questions (LLM NLU fallback -> CRUD -> summary)
+    ("query", "How much did I spend this month?"),
+    ("query", "What reminders do I have this week"),
+    ("query", "Give me a summary of today"),
+    # Free-form questions (LLM NLU fallback -> search/QA)
+    ("question", "What did I note about the airport parking?"),
+    ("question", "Where did Jane say to find that book?"),
+    ("question", "Why was the ramen place disappointing?"),
+]
+
+
+def build_workload(total: int) -> List[Tuple[str, str]]:
+    """ Deterministic round-robin workload of `total` requests. """
+    return [PROCESS_CORPUS[i % len(PROCESS_CORPUS)] for i in range(total)]
@@ -0,0 +1,241 @@
+# backend/benchmarks/nlu_bench.py
+# NLU micro-benchmark and accuracy harness. Needs no database or LLM.
+#
+#   python -m backend.benchmarks.nlu_bench --output nlu_baseline.json
+#   python -m backend.benchmarks.nlu_bench --compare nlu_baseline.json --verbose
+#
+# Reports ns/op and peak allocated bytes/op for rule_based_processing, extract_entities,
+# parse_time_expression, validate_entities and the full hybrid path (LLM stubbed with the corpus
+# labels), plus rule hit rate and intent/entity accuracy for the rules tier and the hybrid path.
+import os
+os.environ.setdefault("DEFAULT_LLM_PROVIDER", "fake") # Must be set before backend settings load
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.services import nlu_service
+from backend.services.llm.base import LLMService
+from backend.services.llm.fake_service import NLU_INPUT_PATTERN
+from backend.benchmarks.nlu_corpus import NLU_CORPUS, TIME_EXPRESSIONS, resolve_expected_date, resolve_entities, actual_value
+from backend.benchmarks.stats import compare_to_baseline, load_json, write_json
+
+ACCURACY_KEYS = ("intent_accuracy", "entity_accuracy", "date_accuracy", "time_accuracy")
+
+
+# --- Labels ---
+def entity_matches(expected: Any, actual: Any) -> bool:
+    if actual is None: return False
+    if isinstance(expected, float):
+        try: return abs(float(actual) - expected) < 1e-6
+        except (TypeError, ValueError): return False
+    return str(actual).strip().lower() == str(expected).strip().lower()
+
+
+def score(labels, results: List[Dict[str, Any]], today: datetime.date) -> Dict[str, Any]:
+    intent_hits = entity_hits = entity_total = 0
+    misses = []
+    for (text, intent, expected), result in zip(labels, results):
+        intent_ok = result["intent"] == intent
+        intent_hits += intent_ok
+        wrong = {}
+        for key, value in resolve_entities(expected, today).items():
+            entity_total += 1
+            actual = actual_value(result.get("entities", {}), key)
+            if intent_ok and entity_matches(value, actual): entity_hits += 1
+            else: wrong[key] = {"expected": value, "got": actual}
+        if not intent_ok or wrong:
+            misses.append({"text": text, "expected": intent, "got": result["intent"], "entities": wrong})
+    return {
+        "samples": len(labels),
+        "intent_accuracy": round(intent_hits / len(labels), 4) if labels else 1.0,
+        "entity_accuracy": round(entity_hits / entity_total, 4) if entity_total else 1.0,
+        "misses": misses,
+    }
+
+
+# --- Stubbed LLM for the hybrid path ---
+def oracle_entities(intent: str, expected: Dict[str, Any], text: str, today: datetime.date) -> Dict[str, Any]:
+    """ The labelled entities, padded with whatever the intent's validation requires. """
+    entities = resolve_entities(expected, today)
+    for field in nlu_service.ENTITY_VALIDATION.get(intent, {}).get("required", []):
+        if field in entities: continue
+        if field == "datetime" and "date" in entities:
+            entities[field] = f"{entities['date']}T{entities.get('time') or '09:00:00'}+00:00"
+        else:
+            entities[field] = text
+    if intent == "save_note": entities.setdefault("content", text)
+    return entities
+
+
+class LabelledStubLLMService(LLMService):
+    """ Answers NLU prompts with the corpus label for the utterance, instantly. """
+    provider = "stub"
+
+    def __init__(self, labels, today: datetime.date):
+        self.replies = {text: json.dumps({"intent": intent, "entities": oracle_entities(intent, expected, text, today)})
+                        for text, intent, expected in labels}
+        self.calls = 0
+
+    async def generate_text(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        match = NLU_INPUT_PATTERN.search(prompt)
+        return self.replies.get(match.group(1) if match else "", '{"intent": "unknown", "entities": {}}')
+
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
+        return ""
+
+
+# --- Timing ---
+def measure(fn: Callable, args_list: List[Tuple], iterations: int) -> Dict[str, Any]:
+    """ ns/op over `iterations` passes of args_list, and mean peak traced allocation per call. """
+    if not args_list: return {"calls": 0}
+    for args in args_list: fn(*args) # Warm caches / compiled regexes
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        for args in args_list: fn(*args)
+    elapsed = time.perf_counter_ns() - started
+    tracemalloc.start()
+    peak_total = 0
+    for args in args_list:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(*args)
+        peak_total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    calls = iterations * len(args_list)
+    return {"calls": calls, "ns_per_op": round(elapsed / calls), "peak_alloc_bytes_per_op": round(peak_total / len(args_list))}
+
+
+def measure_async(coro_fn: Callable, args_list: List[Tuple], iterations: int) -> Dict[str, Any]:
+    loop = asyncio.new_event_loop()
+    try: return measure(lambda *args: loop.run_until_complete(coro_fn(*args)), args_list, iterations)
+    finally: loop.close()
+
+
+def first_rule_match(text: str) -> Optional[Tuple[str, tuple, str]]:
+    for intent, patterns in nlu_service.INTENT_PATTERNS.items():
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match: return intent, match.groups(), text
+    return None
+
+
+# --- Runs ---
+def run(iterations: int) -> Dict[str, Any]:
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    texts = [(text,) for text, _, _ in NLU_CORPUS]
+    rule_intents = set(nlu_service.INTENT_PATTERNS) | {"schedule_meeting"}
+
+    # Rules tier
+    rule_results = [nlu_service.rule_based_processing(text) for (text,) in texts]
+    hits = [(label, r) for label, r in zip(NLU_CORPUS, rule_results) if r["intent"] != "unknown"]
+    rule_labels = [(label, r) for label, r in zip(NLU_CORPUS, rule_results) if label[1] in rule_intents]
+    rules = score([l for l, _ in rule_labels], [r for _, r in rule_labels], today)
+    rules.update({
+        "hit_rate": round(len(hits) / len(NLU_CORPUS), 4),
+        "precision": round(sum(1 for l, r in hits if r["intent"] == l[1]) / len(hits), 4) if hits else 1.0,
+        "recall": round(sum(1 for l, r in rule_labels if r["intent"] == l[1]) / len(rule_labels), 4) if rule_labels else 1.0,
+    })
+
+    # Hybrid path with the labelled stub in place of the LLM
+    stub = LabelledStubLLMService(NLU_CORPUS, today)
+    nlu_service.get_llm_service = lambda *args, **kwargs: stub
+    nlu_service.is_llm_available = lambda: True
+    loop = asyncio.new_event_loop()
+    try: hybrid_results = [loop.run_until_complete(nlu_service.get_nlu_results_hybrid(text)) for (text,) in texts]
+    finally: loop.close()
+    hybrid = score(NLU_CORPUS, hybrid_results, today)
+    hybrid["llm_calls"] = stub.calls
+
+    # Temporal parsing accuracy
+    date_hits = time_hits = time_total = 0
+    time_misses = []
+    for text, expected_date, expected_time in TIME_EXPRESSIONS:
+        parsed = nlu_service.parse_time_expression(text)
+        date_ok = actual_value(parsed, "date") == resolve_expected_date(expected_date, today)
+        time_ok = expected_time is None or actual_value(parsed, "time") == expected_time
+        date_hits += date_ok
+        if expected_time is not None: time_total += 1; time_hits += time_ok
+        if not (date_ok and time_ok): time_misses.append({"text": text, "got": parsed})
+    time_parsing = {
+        "samples": len(TIME_EXPRESSIONS),
+        "date_accuracy": round(date_hits / len(TIME_EXPRESSIONS), 4),
+        "time_accuracy": round(time_hits / time_total, 4) if time_total else 1.0,
+        "misses": time_misses,
+    }
+
+    extract_args = [m for m in (first_rule_match(text) for (text,) in texts) if m]
+    validate_args = [(intent, nlu_service.extract_entities(intent, groups, text)) for intent, groups, text in extract_args]
+    functions = {
+        "rule_based_processing": measure(nlu_service.rule_based_processing, texts, iterations),
+        "extract_entities": measure(nlu_service.extract_entities, extract_args, iterations),
+        "parse_time_expression": measure(nlu_service.parse_time_expression, [(t,) for t, _, _ in TIME_EXPRESSIONS], iterations),
+        "validate_entities": measure(nlu_service.validate_entities, validate_args, iterations),
+        "get_nlu_results_hybrid": measure_async(nlu_service.get_nlu_results_hybrid, texts, max(1, iterations // 10)),
+    }
+    return {
+        "meta": {"timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(), "iterations": iterations,
+                 "utterances": len(NLU_CORPUS), "python": sys.version.split()[0]},
+        "functions": functions, "rules": rules, "hybrid": hybrid, "time_parsing": time_parsing,
+    }
+
+
+def accuracy_regressions(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    regressions = []
+    for section in ("rules", "hybrid", "time_parsing"):
+        for key in ACCURACY_KEYS:
+            old = baseline.get(section, {}).get(key)
+            new = report[section].get(key)
+            if old is not None and new is not None and new < old:
+                regressions.append(f"{section}.{key}: {old:.3f} -> {new:.3f}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any], verbose: bool):
+    print(f"{'function':<26}{'ns/op':>12}{'peak B/op':>12}")
+    for name, stats in report["functions"].items():
+        print(f"{name:<26}{stats.get('ns_per_op', 0):>12,}{stats.get('peak_alloc_bytes_per_op', 0):>12,}")
+    rules, hybrid, tp = report["rules"], report["hybrid"], report["time_parsing"]
+    print(f"\nRules:  hit rate {rules['hit_rate']:.0%}  precision {rules['precision']:.0%}  recall {rules['recall']:.0%}  "
+          f"intent acc {rules['intent_accuracy']:.0%}  entity acc {rules['entity_accuracy']:.0%}")
+    print(f"Hybrid: intent acc {hybrid['intent_accuracy']:.0%}  entity acc {hybrid['entity_accuracy']:.0%}  "
+          f"LLM calls {hybrid['llm_calls']}/{hybrid['samples']}")
+    print(f"Time:   date acc {tp['date_accuracy']:.0%}  time acc {tp['time_accuracy']:.0%}")
+    if verbose:
+        for section in ("rules", "hybrid", "time_parsing"):
+            for miss in report[section]["misses"]: print(f"  [{section}] {json.dumps(miss, default=str)}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark and score the NLU service.")
+    parser.add_argument("--iterations", type=int, default=200, help="Passes over the corpus per function.")
+    parser.add_argument("--output", help="Write the JSON report (baseline) here.")
+    parser.add_argument("--compare", help="Baseline JSON; exits 1 on slower ns/op or lower accuracy.")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed ns/op regression fraction.")
+    parser.add_argument("--verbose", action="store_true", help="List every mislabelled utterance.")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("aura_backend.nlu").setLevel(logging.ERROR) # Keep per-call logging out of the timings/output
+    report = run(args.iterations)
+    print_report(report, args.verbose)
+    if args.output:
+        write_json(args.output, report); print(f"\nReport written to {args.output}")
+    if args.compare:
+        baseline = load_json(args.compare)
+        regressions = compare_to_baseline(report["functions"], baseline.get("functions", {}), metric="ns_per_op", tolerance=args.tolerance)
+        regressions += accuracy_regressions(report, baseline)
+        if regressions:
+            print("\nRegressions vs baseline:\n  " + "\n  ".join(regressions)); return 1
+        print("\nNo regressions vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# backend/benchmarks/nlu_corpus.py
+# Labelled utterances for the NLU benchmark / accuracy harness.
+#
+# Each entry is (utterance, expected intent, expected entities). Only the listed entities are scored.
+# Relative dates are written against the run's reference day:
+#   "+N"       -> today + N days
+#   "wd:fri"   -> upcoming friday (today counts)
+#   "next:fri" -> first friday strictly after today
+import datetime
+from typing import Any, Dict, List, Tuple
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+NLU_CORPUS: List[Tuple[str, str, Dict[str, Any]]] = [
+    # --- Spending (rules tier) ---
+    ("Spent $12.50 on lunch", "log_spending", {"amount": 12.5, "currency": "$", "description": "lunch"}),
+    ("I spent $45 on groceries", "log_spending", {"amount": 45.0, "currency": "$", "description": "groceries"}),
+    ("paid €30 for the concert ticket", "log_spending", {"amount": 30.0, "currency": "€", "description": "the concert ticket"}),
+    ("Bought a new keyboard for $89.99", "log_spending", {"amount": 89.99, "currency": "$", "description": "a new keyboard"}),
+    ("spent ₹250 on coffee beans", "log_spending", {"amount": 250.0, "currency": "₹", "description": "coffee beans"}),
+    ("purchased running shoes for £60", "log_spending", {"amount": 60.0, "currency": "£", "description": "running shoes"}),
+    ("expensed $18,40 for the taxi", "log_spending", {"amount": 18.4, "currency": "$", "description": "the taxi"}),
+    ("paid 25 for parking", "log_spending", {"amount": 25.0, "description": "parking"}),
+    # --- Reminders (rules tier + temporal parsing) ---
+    ("Remind me to call mom at 5pm tomorrow", "set_reminder", {"content": "call mom", "date": "+1", "time": "17:00:00"}),
+    ("remind me to renew the passport on friday", "set_reminder", {"content": "renew the passport", "date": "wd:fri"}),
+    ("Set reminder to water the plants at 8am", "set_reminder", {"content": "water the plants", "time": "08:00:00"}),
+    ("remind me to pay rent on 2030-03-01", "set_reminder", {"content": "pay rent", "date": "2030-03-01"}),
+    ("alert me about the dentist appointment at 9:30am", "set_reminder", {"content": "the dentist appointment", "time": "09:30:00"}),
+    ("remind me to submit the report in 3 days", "set_reminder", {"content": "submit the report", "date": "+3"}),
+    ("remind me to book flights on next monday", "set_reminder", {"content": "book flights", "date": "next:mon"}),
+    # --- Meetings (rules tier) ---
+    ("Meeting with Alex at 3pm to discuss the roadmap", "schedule_meeting", {"person": "Alex", "time": "15:00:00", "subject": "the roadmap"}),
+    ("meet with Priya on thursday", "schedule_meeting", {"person": "Priya", "date": "wd:thu"}),
+    ("schedule a demo for next monday at 10am", "schedule_meeting", {"subject": "Demo", "date": "next:mon", "time": "10:00:00"}),
+    ("arrange an appointment for tomorrow at 11am", "schedule_meeting", {"date": "+1", "time": "11:00:00"}),
+    ("call with the bank at 4pm", "schedule_meeting", {"person": "the bank", "time": "16:00:00"}),
+    # --- Queries and questions (LLM tier) ---
+    ("How much did I spend this month?", "query_spending", {"time_range": "month"}),
+    ("What reminders do I have this week", "get_reminders", {"filter": "week"}),
+    ("Show my upcoming meetings", "get_reminders", {}),
+    ("Give me a summary of today", "get_summary", {}),
+    ("What did I note about the airport parking?", "search_information", {"query": "airport parking"}),
+    ("Where did Jane say to find that book?", "search_information", {}),
+    ("Log symptom: headache started this morning", "log_medical", {"log_type": "symptom"}),
+    ("Note on my index fund: rebalance in Q3", "log_investment", {}),
+    # --- Free-form notes (no rule should fire) ---
+    ("Idea for the blog: compare three budgeting apps and their export formats", "save_note", {}),
+    ("Parking spot at the airport is level 3 row F", "save_note", {}),
+    ("Jane recommended the book Deep Work, check the library", "save_note", {}),
+    ("The wifi password for the cabin is written on the fridge magnet", "save_note", {}),
+]
+
+# Free-standing temporal expressions for the parser micro-benchmark: (text, expected date, expected time)
+TIME_EXPRESSIONS: List[Tuple[str, str, str]] = [
+    ("5pm tomorrow", "+1", "17:00:00"),
+    ("tomorrow at 9am", "+1", "09:00:00"),
+    ("friday", "wd:fri", None),
+    ("next monday at 10am", "next:mon", "10:00:00"),
+    ("8am", "+0", "08:00:00"),
+    ("9:30am", "+0", "09:30:00"),
+    ("15:45", "+0", "15:45:00"),
+    ("2030-03-01", "2030-03-01", None),
+    ("2030-03-01T14:00:00", "2030-03-01", "14:00:00"),
+    ("in 3 days", "+3", None),
+    ("in 2 weeks", "+14", None),
+    ("noon", "+0", "12:00:00"),
+    ("March 3rd 2030 at 4pm", "2030-03-03", "16:00:00"),
+]
+
+
+def resolve_expected_date(value: str, today: datetime.date) -> str:
+    """ Turns the relative date notation ("+N", "wd:fri", "next:fri") into an ISO date. """
+    if value.startswith("+"): return (today + datetime.timedelta(days=int(value[1:]))).isoformat()
+    if value.startswith(("wd:", "next:")):
+        kind, name = value.split(":")
+        days = (WEEKDAYS.index(name) - today.weekday()) % 7
+        if kind == "next" and days == 0: days = 7
+        return (today + datetime.timedelta(days=days)).isoformat()
+    return value
+
+
+def resolve_entities(expected: Dict[str, Any], today: datetime.date) -> Dict[str, Any]:
+    return {k: resolve_expected_date(v, today) if k == "date" else v for k, v in expected.items()}
+
+
+def actual_value(entities: Dict[str, Any], key: str) -> Any:
+    """ Entity value as scored; date/time fall back to the combined datetime entity. """
+    value = entities.get(key)
+    if value is None and key in ("date", "time") and entities.get("datetime"):
+        dt = str(entities["datetime"])
+        value = dt[:10] if key == "date" else dt[11:19]
+    return value
@@ -0,0 +1,173 @@
+# backend/benchmarks/process_load.py
+# End-to-end load test / latency benchmark for the /process pipeline.
+#
+# Drives process_input_endpoint directly (no HTTP/auth) with a mixed-intent corpus against the
+# database in DATABASE_URL (Postgres + pgvector, migrated) and the offline "fake" LLM provider.
+#
+#   python -m backend.benchmarks.process_load --requests 300 --concurrency 8 --output bench_baseline.json
+#   python -m backend.benchmarks.process_load --requests 300 --concurrency 8 --compare bench_baseline.json
+#
+# Reports throughput plus p50/p95/p99 per resolved intent, per corpus category and per stage
+# (from backend.core.timing: auth is skipped, nlu includes nlu_rules and any LLM NLU call).
+import os
+os.environ.setdefault("DEFAULT_LLM_PROVIDER", "fake") # Must be set before backend settings load
+
+import argparse
+import asyncio
+import contextvars
+import datetime
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Any
+
+from backend.core.config import settings, logger
+from backend.db import session as db_session
+from backend.db import models
+from backend import crud
+from backend.schemas.user import User, UserCreate
+from backend.schemas.api_models import ProcessInput
+from backend.api.v1.endpoints import process
+from backend.core.timing import start_request_timings
+from backend.benchmarks.corpus import build_workload
+from backend.benchmarks.stats import summarize_ms, compare_to_baseline, load_json, write_json
+
+BENCH_USER_EMAIL = "bench-process@example.com"
+
+# Resolved intent of the current request (stage timings come from backend.core.timing)
+_current_intent = contextvars.ContextVar("bench_intent", default=None)
+
+
+def install_instrumentation():
+    """ Captures the NLU intent per request; stages are recorded by the app's own timing hooks. """
+    original_nlu = process.get_nlu_results_hybrid
+    async def capture_intent(text, user_context=None):
+        result = await original_nlu(text, user_context)
+        holder = _current_intent.get()
+        if holder is not None: holder["intent"] = result.get("intent", "unknown")
+        return result
+    process.get_nlu_results_hybrid = capture_intent
+
+
+# --- Setup ---
+def prepare_user(reset: bool) -> User:
+    db = db_session.SessionLocal()
+    try:
+        user_db = crud.user.get_by_email(db, email=BENCH_USER_EMAIL)
+        if user_db is None:
+            user_db = crud.user.create(db, obj_in=UserCreate(email=BENCH_USER_EMAIL, password="bench-password", full_name="Benchmark"))
+        if reset:
+            # Bulk deletes skip CRUDSpendingLog.remove, so the user's spending rollups go with the logs
+            for model in (models.NoteDB, models.SpendingLogDB, models.SpendingDailyRollupDB, models.ReminderDB,
+                          models.MedicalLogDB, models.InvestmentNoteDB):
+                db.query(model).filter(model.user_id == user_db.id).delete(synchronize_session=False)
+            db.commit()
+        process.user_contexts.pop(user_db.id, None)
+        return User.model_validate(user_db)
+    finally:
+        db.close()
+
+
+async def run_request(category: str, text: str, user: User) -> Dict[str, Any]:
+    holder = {"intent": "unknown"}
+    token = _current_intent.set(holder)
+    timings = start_request_timings()
+    db = db_session.SessionLocal()
+    started = time.perf_counter()
+    ok = True
+    try:
+        await process.process_input_endpoint(ProcessInput(text=text), db=db, current_user=user)
+    except Exception as e:
+        ok = False
+        logger.error(f"Benchmark request failed ({category}: '{text}'): {e}", exc_info=True)
+    finally:
+        db.close()
+        _current_intent.reset(token)
+    return {"category": category, "intent": holder["intent"], "ok": ok,
+            "total": time.perf_counter() - started, "stages": {stage: seconds for stage, (seconds, _) in timings.stages.items()}}
+
+
+async def run_load(workload, user: User, concurrency: int) -> (List[Dict[str, Any]], float):
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in workload: queue.put_nowait(item)
+    results: List[Dict[str, Any]] = []
+
+    async def worker():
+        while not queue.empty():
+            category, text = queue.get_nowait()
+            results.append(await run_request(category, text, user))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+def build_report(results: List[Dict[str, Any]], elapsed: float, args) -> Dict[str, Any]:
+    by_intent, by_category, by_stage = defaultdict(list), defaultdict(list), defaultdict(list)
+    for r in results:
+        by_intent[r["intent"]].append(r["total"])
+        by_category[r["category"]].append(r["total"])
+        for stage, seconds in r["stages"].items(): by_stage[stage].append(seconds)
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "requests": len(results), "concurrency": args.concurrency,
+            "llm_provider": settings.DEFAULT_LLM_PROVIDER,
+            "fake_llm_latency_ms": settings.FAKE_LLM_LATENCY_MS,
+        },
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "errors": sum(1 for r in results if not r["ok"]),
+        "total": summarize_ms([r["total"] for r in results]),
+        "by_intent": {k: summarize_ms(v) for k, v in sorted(by_intent.items())},
+        "by_category": {k: summarize_ms(v) for k, v in sorted(by_category.items())},
+        "by_stage": {k: summarize_ms(v) for k, v in sorted(by_stage.items())},
+    }
+
+
+def flatten_series(report: Dict[str, Any]) -> Dict[str, Dict]:
+    series = {"total": report["total"]}
+    for group in ("by_intent", "by_stage"):
+        for name, stats in report.get(group, {}).items(): series[f"{group[3:]}:{name}"] = stats
+    return series
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\nRequests: {report['meta']['requests']}  concurrency: {report['meta']['concurrency']}  "
+          f"throughput: {report['throughput_rps']} req/s  errors: {report['errors']}")
+    print(f"{'series':<28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in flatten_series(report).items():
+        print(f"{name:<28}{stats.get('count', 0):>7}{stats.get('p50_ms', 0):>10.1f}{stats.get('p95_ms', 0):>10.1f}{stats.get('p99_ms', 0):>10.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the /process pipeline.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="Unrecorded requests first (model loading, pools).")
+    parser.add_argument("--no-reset", action="store_true", help="Keep the benchmark user's existing rows.")
+    parser.add_argument("--output", help="Write the JSON report (baseline) here.")
+    parser.add_argument("--compare", help="Baseline JSON to compare p95s against; exits 1 on regression.")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed p95 regression fraction.")
+    args = parser.parse_args(argv)
+
+    if db_session.SessionLocal is None:
+        print("DATABASE_URL is not configured.", file=sys.stderr); return 2
+    install_instrumentation()
+    user = prepare_user(reset=not args.no_reset)
+
+    if args.warmup: asyncio.run(run_load(build_workload(args.warmup), user, args.concurrency))
+    results, elapsed = asyncio.run(run_load(build_workload(args.requests), user, args.concurrency))
+    report = build_report(results, elapsed, args)
+    print_report(report)
+    if args.output:
+        write_json(args.output, report); print(f"\nReport written to {args.output}")
+    if args.compare:
+        regressions = compare_to_baseline(flatten_series(report), flatten_series(load_json(args.compare)), tolerance=args.tolerance)
+        if regressions:
+            print("\nRegressions vs baseline:\n  " + "\n  ".join(regressions)); return 1
+        print("\nNo p95 regressions vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
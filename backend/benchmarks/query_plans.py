@@ -0,0 +1,125 @@
+# backend/benchmarks/query_plans.py
+# Query-plan regression check for the per-user list queries. Runs every CRUD list method against
+# the database in DATABASE_URL (migrated to head), EXPLAINs the SQL each one issues and exits 1 if
+# an expected index (the composites from migration dee6dee22db5, the spending rollup primary key)
+# isn't in the plan.
+#
+#   python -m backend.benchmarks.query_plans
+#   python -m backend.benchmarks.query_plans --show-plans
+#
+# Nothing is written: queries run for a user id with no rows, inside a rolled-back transaction with
+# sequential scans disabled, so plans reflect whether an index *can* serve the query rather than
+# the size of a dev database.
+import os
+os.environ.setdefault("DEFAULT_LLM_PROVIDER", "fake") # Must be set before backend settings load
+
+import argparse
+import datetime
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from backend.db import session as db_session
+from backend import crud
+
+PLAN_USER_ID = -1 # No such user; EXPLAIN doesn't need rows
+
+NOTES_TS = "ix_notes_user_id_timestamp"
+NOTES_DATE = "ix_notes_user_id_date_associated"
+INVESTMENTS_TS = "ix_investment_notes_user_id_timestamp"
+SPENDING_DATE = "ix_spending_logs_user_id_date_page"
+SPENDING_ROLLUP = "spending_daily_rollups_pkey"
+MEDICAL_DATE = "ix_medical_logs_user_id_date_page"
+REMINDERS_ACTIVE = "ix_reminders_active_user_id_remind_at"
+REMINDERS_PENDING = "ix_reminders_pending_remind_at"
+REMINDERS_RECURRING = "ix_reminders_recurring_user_id_start"
+
+
+def plan_checks(today: datetime.date) -> List[Tuple[str, Callable[[Session], Any], Set[str]]]:
+    """ (name, call, indexes that must all appear in the plans of the statements it issues) """
+    month_ago, user = today - datetime.timedelta(days=30), PLAN_USER_ID
+    return [
+        ("note.get_multi_by_owner", lambda db: crud.note.get_multi_by_owner(db, user_id=user, start_date=month_ago, end_date=today), {NOTES_TS}),
+        ("note.get_global", lambda db: crud.note.get_global(db, user_id=user, start_date=month_ago, end_date=today), {NOTES_TS}),
+        ("note.get_by_date", lambda db: crud.note.get_by_date(db, user_id=user, date=today), {NOTES_DATE, NOTES_TS}),
+        ("timeline.get_for_date", lambda db: crud.timeline.get_for_date(db, user_id=user, date=today),
+         {NOTES_DATE, NOTES_TS, SPENDING_DATE, MEDICAL_DATE}),
+        ("investment_note.get_multi_by_owner", lambda db: crud.investment_note.get_multi_by_owner(db, user_id=user, start_date=month_ago, end_date=today), {INVESTMENTS_TS}),
+        ("spending_log.get_multi_by_owner", lambda db: crud.spending_log.get_multi_by_owner(db, user_id=user, start_date=month_ago, end_date=today), {SPENDING_DATE}),
+        ("spending_log.get_by_date", lambda db: crud.spending_log.get_by_date(db, user_id=user, date=today), {SPENDING_DATE}),
+        ("spending_log.aggregate", lambda db: crud.spending_log.aggregate(db, user_id=user, period="month", start_date=month_ago, end_date=today), {SPENDING_ROLLUP}),
+        ("spending_log.get_by_time_range", lambda db: crud.spending_log.get_by_time_range(db, user_id=user, time_range="month"), {SPENDING_DATE}),
+        ("medical_log.get_multi_by_owner", lambda db: crud.medical_log.get_multi_by_owner(db, user_id=user, start_date=month_ago, end_date=today), {MEDICAL_DATE}),
+        ("medical_log.get_by_date", lambda db: crud.medical_log.get_by_date(db, user_id=user, date=today), {MEDICAL_DATE}),
+        ("reminder.get_filtered_reminders", lambda db: crud.reminder.get_filtered_reminders(db, user_id=user, time_filter="week", is_active=True), {REMINDERS_ACTIVE, REMINDERS_RECURRING}),
+        ("reminder.get_upcoming_reminders", lambda db: crud.reminder.get_upcoming_reminders(db, user_id=user), {REMINDERS_ACTIVE, REMINDERS_RECURRING}),
+        ("reminder.get_due_window", lambda db: crud.reminder.get_due_window(
+            db, until=datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=5), limit=1000), {REMINDERS_PENDING}),
+    ]
+
+
+def capture_selects(db: Session, call: Callable[[Session], Any]) -> List[Tuple[str, Any]]:
+    """ Runs `call` and returns the (statement, parameters) of every SELECT it executed. """
+    captured = []
+    engine = db.get_bind()
+    def listener(conn, cursor, statement, parameters, context, executemany): captured.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", listener)
+    try: call(db)
+    finally: event.remove(engine, "before_cursor_execute", listener)
+    return [(statement, params) for statement, params in captured if statement.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []): yield from plan_nodes(child)
+
+
+def explain(db: Session, statement: str, params: Any, fmt: str = "JSON") -> Any:
+    cursor = db.connection().connection.cursor() # Raw DBAPI cursor, same transaction (SET LOCAL applies)
+    try:
+        cursor.execute(f"EXPLAIN (FORMAT {fmt}) {statement}", params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return rows[0][0] if fmt == "JSON" else "\n".join(row[0] for row in rows)
+
+
+def run(show_plans: bool) -> int:
+    checks = plan_checks(datetime.date.today())
+    db = db_session.SessionLocal()
+    failures = 0
+    try:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        print(f"{'query':<38}{'result':<8}indexes used")
+        for name, call, expected in checks:
+            used: Set[str] = set()
+            statements = capture_selects(db, call)
+            for statement, params in statements:
+                plan = explain(db, statement, params)
+                used.update(node["Index Name"] for node in plan_nodes(plan[0]["Plan"]) if "Index Name" in node)
+            missing = expected - used
+            failures += bool(missing)
+            print(f"{name:<38}{'FAIL' if missing else 'ok':<8}{', '.join(sorted(used)) or '-'}"
+                  + (f"  (missing: {', '.join(sorted(missing))})" if missing else ""))
+            if show_plans or missing:
+                for statement, params in statements: print("    " + explain(db, statement, params, fmt="TEXT").replace("\n", "\n    "))
+    finally:
+        db.rollback()
+        db.close()
+    print(f"\n{failures} of {len(checks)} queries missing an expected index." if failures else "\nAll list queries use their indexes.")
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check that CRUD list queries are planned with the composite indexes.")
+    parser.add_argument("--show-plans", action="store_true", help="Print the text plan of every checked statement.")
+    args = parser.parse_args(argv)
+    if db_session.SessionLocal is None:
+        print("DATABASE_URL is not configured."); return 2
+    return run(args.show_plans)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# backend/benchmarks/stats.py
+# Small helpers shared by the benchmark harnesses.
+import json
+from typing import Dict, List, Any
+
+
+def percentile(values: List[float], p: float) -> float:
+    """ Nearest-rank percentile (p in 0..100). """
+    if not values: return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize_ms(samples_seconds: List[float]) -> Dict[str, Any]:
+    """ count / mean / p50 / p95 / p99 / max in milliseconds. """
+    ms = [s * 1000.0 for s in samples_seconds]
+    if not ms: return {"count": 0}
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 3),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+def compare_to_baseline(current: Dict[str, Dict], baseline: Dict[str, Dict], metric: str = "p95_ms",
+                        tolerance: float = 0.15) -> List[str]:
+    """ Returns a line per series whose `metric` regressed by more than `tolerance` (fraction) vs baseline. """
+    regressions = []
+    for name, series in current.items():
+        old = (baseline.get(name) or {}).get(metric)
+        new = series.get(metric)
+        if not old or new is None: continue
+        if new > old * (1 + tolerance):
+            regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f: return json.load(f)
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    with open(path, "w", encoding="utf-8") as f: json.dump(data, f, indent=2, sort_keys=True, default=str)
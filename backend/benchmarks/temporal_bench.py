@@ -0,0 +1,105 @@
+# backend/benchmarks/temporal_bench.py
+# Compares the fast-path temporal parser with the previous dateutil-fuzzy implementation.
+#
+#   python -m backend.benchmarks.temporal_bench --iterations 500
+#
+# "cold" clears the memo cache before every call (fast paths + dateutil fallback only);
+# "warm" is the steady state where repeated expressions hit the per-day cache.
+import argparse
+import datetime
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import dateutil.parser
+from dateutil.relativedelta import relativedelta
+
+from backend.services import temporal_service
+from backend.benchmarks.nlu_corpus import TIME_EXPRESSIONS, resolve_expected_date, actual_value
+
+LEGACY_TIME_RELATED = re.compile(
+    r'\b(\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm)?)|'
+    r'(next\s+(week|month|year|monday|tuesday|wednesday|thursday|friday|saturday|sunday))|'
+    r'(in\s+\d+\s+(hours?|days?|weeks?))|'
+    r'(tomorrow|tonight|today|noon|midnight)\b', re.I
+)
+
+
+def legacy_parse_time_expression(text: str) -> Dict[str, Any]:
+    """ The nlu_service implementation before the temporal module (fuzzy dateutil first), minus logging. """
+    parsed = {"date": None, "time": None, "datetime": None}
+    if not text: return parsed
+    now = datetime.datetime.now(datetime.timezone.utc)
+    try:
+        dt = dateutil.parser.parse(text, fuzzy=True, default=now)
+        dt = dt.replace(tzinfo=datetime.timezone.utc) if dt.tzinfo is None else dt.astimezone(datetime.timezone.utc)
+        return {"date": dt.date().isoformat(), "time": dt.time().isoformat(timespec='seconds'),
+                "datetime": dt.isoformat(timespec='seconds')}
+    except (ValueError, OverflowError, TypeError):
+        pass
+    relative_match = re.search(r'in\s+(\d+)\s+(hour|day|week)s?', text, re.I)
+    if relative_match:
+        num, unit = relative_match.groups()
+        future = now + relativedelta(**{f"{unit}s": int(num)})
+        parsed.update({"datetime": future.isoformat(timespec='seconds'), "date": future.date().isoformat(),
+                       "time": future.time().isoformat(timespec='seconds')})
+    elif 'tomorrow' in text.lower():
+        tomorrow_date = (now + relativedelta(days=1)).date()
+        parsed["date"] = tomorrow_date.isoformat()
+        time_match = LEGACY_TIME_RELATED.search(text)
+        if time_match:
+            try:
+                time_only_dt = dateutil.parser.parse(time_match.group(0), default=now)
+                final_dt = datetime.datetime.combine(tomorrow_date, time_only_dt.time(), tzinfo=datetime.timezone.utc)
+                parsed["datetime"] = final_dt.isoformat(timespec='seconds')
+                parsed["time"] = final_dt.time().isoformat(timespec='seconds')
+            except Exception:
+                pass
+    return parsed
+
+
+def cold_parse(text: str) -> Dict[str, Any]:
+    temporal_service._parse_for_day.cache_clear()
+    return temporal_service.parse_time_expression(text)
+
+
+def time_per_op(fn: Callable, inputs: List[str], iterations: int) -> int:
+    for text in inputs: fn(text)
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        for text in inputs: fn(text)
+    return round((time.perf_counter_ns() - started) / (iterations * len(inputs)))
+
+
+def accuracy(fn: Callable, today: datetime.date) -> Dict[str, float]:
+    date_hits = time_hits = time_total = 0
+    for text, expected_date, expected_time in TIME_EXPRESSIONS:
+        parsed = fn(text)
+        date_hits += actual_value(parsed, "date") == resolve_expected_date(expected_date, today)
+        if expected_time is not None:
+            time_total += 1
+            time_hits += actual_value(parsed, "time") == expected_time
+    return {"date_accuracy": round(date_hits / len(TIME_EXPRESSIONS), 4), "time_accuracy": round(time_hits / time_total, 4)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark temporal parsing against the legacy implementation.")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    inputs = [text for text, _, _ in TIME_EXPRESSIONS]
+    print(f"{'implementation':<16}{'ns/op':>12}{'speedup':>10}{'date acc':>10}{'time acc':>10}")
+    legacy_ns = time_per_op(legacy_parse_time_expression, inputs, args.iterations)
+    for name, fn in (("legacy", legacy_parse_time_expression), ("fast (cold)", cold_parse),
+                     ("fast (warm)", temporal_service.parse_time_expression)):
+        ns = legacy_ns if name == "legacy" else time_per_op(fn, inputs, args.iterations)
+        acc = accuracy(fn, today)
+        print(f"{name:<16}{ns:>12,}{legacy_ns / ns:>9.1f}x{acc['date_accuracy']:>10.0%}{acc['time_accuracy']:>10.0%}")
+    print(f"\nParser tiers: {temporal_service.get_temporal_parser_metrics()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
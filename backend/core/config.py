@@ -6,7 +6,7 @@ from urllib.parse import urlparse
 from pydantic_settings import BaseSettings
 # Keep other pydantic imports
 from pydantic import PostgresDsn, AnyHttpUrl, validator, HttpUrl, Field
-from typing import List, Optional, Union, Literal
+from typing import List, Optional, Union, Literal, Dict, Any
 
 # Load .env file from the project root
 load_dotenv()
@@ -38,9 +38,36 @@ class Settings(BaseSettings):
 
     # Logging
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
+    LOG_FORMAT: Literal["text", "json"] = Field(default="text", env="LOG_FORMAT")
+    LOG_QUEUE_ENABLED: bool = Field(default=True, env="LOG_QUEUE_ENABLED") # Format/write logs on a background thread
+    LOG_SAMPLING: Optional[str] = Field(default=None, env="LOG_SAMPLING") # e.g. "aura_backend.timing=0.1,backend.services.llm=0.25" (below WARNING only)
+    SERVER_TIMING_ENABLED: bool = Field(default=True, env="SERVER_TIMING_ENABLED") # Per-stage Server-Timing response header
+    METRICS_ENABLED: bool = Field(default=True, env="METRICS_ENABLED") # Prometheus-style /metrics endpoint
+
+    # Database diagnostics (see db/instrumentation.py)
+    DB_SLOW_QUERY_MS: float = Field(default=200.0, env="DB_SLOW_QUERY_MS") # Log statements slower than this; 0 disables
+    DB_EXPLAIN_SLOW_QUERIES: bool = Field(default=False, env="DB_EXPLAIN_SLOW_QUERIES") # Log EXPLAIN (ANALYZE, BUFFERS) for slow SELECTs (Postgres)
+    DB_N_PLUS_ONE_THRESHOLD: int = Field(default=0, env="DB_N_PLUS_ONE_THRESHOLD") # Warn when one statement shape repeats this often per request; 0 disables (set in development)
+
+    # Background jobs (see services/job_queue.py)
+    JOB_WORKERS: int = Field(default=2, env="JOB_WORKERS") # Async job workers inside the API process; 0 = run `python -m backend.services.job_queue` instead
+    JOB_POLL_INTERVAL_SECONDS: float = Field(default=1.0, env="JOB_POLL_INTERVAL_SECONDS") # Idle poll for jobs enqueued by other processes
+    JOB_LEASE_SECONDS: float = Field(default=300.0, env="JOB_LEASE_SECONDS") # A claimed job is requeued after this (worker crashed); keep above the longest job
+    JOB_RETRY_BASE_SECONDS: float = Field(default=5.0, env="JOB_RETRY_BASE_SECONDS") # Backoff doubles per attempt from here...
+    JOB_RETRY_MAX_SECONDS: float = Field(default=600.0, env="JOB_RETRY_MAX_SECONDS") # ...up to this
+    JOB_RETENTION_HOURS: float = Field(default=24.0, env="JOB_RETENTION_HOURS") # Finished jobs (and their results) are deleted after this
+    EMBEDDINGS_IN_BACKGROUND: bool = Field(default=True, env="EMBEDDINGS_IN_BACKGROUND") # Embed notes in batched jobs instead of inside the request
+    REMINDER_DISPATCH_ENABLED: bool = Field(default=True, env="REMINDER_DISPATCH_ENABLED") # Fire reminders from the API process; false = run `python -m backend.services.reminder_dispatcher`
+    REMINDER_DISPATCH_WINDOW_SECONDS: float = Field(default=300.0, env="REMINDER_DISPATCH_WINDOW_SECONDS") # Reminders due this far ahead are held in memory; reloaded every half window
+    REMINDER_DISPATCH_MAX_LOADED: int = Field(default=1000, env="REMINDER_DISPATCH_MAX_LOADED") # Cap per window load (a busier window is loaded in parts)
+    EVENTS_ENABLED: bool = Field(default=True, env="EVENTS_ENABLED") # Per-user push events (GET /events) for fired reminders, finished jobs and data changes
+    EVENTS_MAX_CONNECTIONS: int = Field(default=1000, env="EVENTS_MAX_CONNECTIONS") # Open /events streams per worker process; more get 503
+    EVENTS_QUEUE_SIZE: int = Field(default=100, env="EVENTS_QUEUE_SIZE") # Undelivered events per stream before it is reset with a "resync" event
+    EVENTS_KEEPALIVE_SECONDS: float = Field(default=25.0, env="EVENTS_KEEPALIVE_SECONDS") # Comment line sent on idle streams (keeps proxies from closing them)
+    EVENTS_TICKET_SECONDS: int = Field(default=60, env="EVENTS_TICKET_SECONDS") # Lifetime of a /events/ticket (only opens an event stream; sent in the URL)
 
     # --- LLM Configuration ---
-    DEFAULT_LLM_PROVIDER: Literal["openai", "gemini", "ollama"] = Field(default="openai", env="DEFAULT_LLM_PROVIDER")
+    DEFAULT_LLM_PROVIDER: Literal["openai", "gemini", "ollama", "fake", "replay"] = Field(default="openai", env="DEFAULT_LLM_PROVIDER")
 
     # OpenAI Settings
     OPENAI_API_KEY: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
@@ -48,11 +75,49 @@ class Settings(BaseSettings):
 
     # Google Gemini Settings
     GOOGLE_API_KEY: Optional[str] = Field(default=None, env="GOOGLE_API_KEY")
-    # GOOGLE_MODEL_NAME: str = Field(default="gemini-1.5-flash", env="GOOGLE_MODEL_NAME") # Optional
-
-    # Ollama Settings
-    #OLLAMA_BASE_URL: Optional[HttpUrl] = Field(default="http://localhost:11434", env="OLLAMA_BASE_URL")
-    #OLLAMA_DEFAULT_MODEL: str = Field(default="llama3", env="OLLAMA_DEFAULT_MODEL")
+    GOOGLE_MODEL_NAME: str = Field(default="gemini-1.5-flash", env="GOOGLE_MODEL_NAME")
+
+    # Ollama Settings (leave OLLAMA_BASE_URL unset to disable, e.g. "http://localhost:11434")
+    OLLAMA_BASE_URL: Optional[HttpUrl] = Field(default=None, env="OLLAMA_BASE_URL")
+    OLLAMA_DEFAULT_MODEL: str = Field(default="llama3", env="OLLAMA_DEFAULT_MODEL")
+    OLLAMA_KEEP_ALIVE: Optional[str] = Field(default="10m", env="OLLAMA_KEEP_ALIVE") # Keep model loaded between calls
+
+    # Per-task model profiles (see services/llm/tasks.py). Models are per provider; a missing
+    # model falls back to the provider default above. Env var takes JSON.
+    LLM_TASK_PROFILES: Dict[str, Dict[str, Any]] = Field(default={
+        "nlu": {"models": {"openai": "gpt-4o-mini", "gemini": "gemini-1.5-flash-8b"}, "max_tokens": 300, "temperature": 0.1},
+        "chat": {"max_tokens": 150},
+        "summary": {"max_tokens": 600, "temperature": 0.3},
+        "rag_answer": {"max_tokens": 400, "temperature": 0.2},
+    }, env="LLM_TASK_PROFILES")
+
+    # Multi-provider routing (used when more than one provider is configured)
+    LLM_ROUTING_ENABLED: bool = Field(default=True, env="LLM_ROUTING_ENABLED")
+    LLM_HEDGE_AFTER_SECONDS: float = Field(default=0.0, env="LLM_HEDGE_AFTER_SECONDS") # 0 disables hedging
+
+    # Circuit breaker (per provider)
+    LLM_BREAKER_FAILURE_THRESHOLD: int = Field(default=3, env="LLM_BREAKER_FAILURE_THRESHOLD") # Consecutive failures before opening
+    LLM_BREAKER_RESET_SECONDS: float = Field(default=30.0, env="LLM_BREAKER_RESET_SECONDS") # Open time before a half-open probe
+
+    # Offline stand-in providers for load tests ("fake" / "replay", see services/llm/fake_service.py)
+    FAKE_LLM_LATENCY_DISTRIBUTION: Literal["fixed", "uniform", "lognormal"] = Field(default="lognormal", env="FAKE_LLM_LATENCY_DISTRIBUTION")
+    FAKE_LLM_LATENCY_MS: float = Field(default=300.0, env="FAKE_LLM_LATENCY_MS") # Fixed value / uniform centre / lognormal median
+    FAKE_LLM_LATENCY_JITTER: float = Field(default=0.5, env="FAKE_LLM_LATENCY_JITTER") # Uniform +/- fraction or lognormal sigma
+    FAKE_LLM_TOKENS_PER_SECOND: float = Field(default=50.0, env="FAKE_LLM_TOKENS_PER_SECOND") # 0 = instant output
+    FAKE_LLM_ERROR_RATE: float = Field(default=0.0, env="FAKE_LLM_ERROR_RATE")
+    FAKE_LLM_SEED: Optional[int] = Field(default=42, env="FAKE_LLM_SEED")
+    LLM_REPLAY_FILE: str = Field(default="llm_replay.jsonl", env="LLM_REPLAY_FILE")
+    LLM_REPLAY_MODE: Literal["replay", "record"] = Field(default="replay", env="LLM_REPLAY_MODE")
+    LLM_RECORD_PROVIDER: Literal["openai", "gemini", "ollama"] = Field(default="openai", env="LLM_RECORD_PROVIDER")
+
+    # LLM Rate Limits (per provider, per minute; 0 disables the limit)
+    OPENAI_REQUESTS_PER_MINUTE: int = Field(default=500, env="OPENAI_REQUESTS_PER_MINUTE")
+    OPENAI_TOKENS_PER_MINUTE: int = Field(default=200000, env="OPENAI_TOKENS_PER_MINUTE")
+    GEMINI_REQUESTS_PER_MINUTE: int = Field(default=60, env="GEMINI_REQUESTS_PER_MINUTE")
+    GEMINI_TOKENS_PER_MINUTE: int = Field(default=1000000, env="GEMINI_TOKENS_PER_MINUTE")
+    OLLAMA_REQUESTS_PER_MINUTE: int = Field(default=0, env="OLLAMA_REQUESTS_PER_MINUTE")
+    OLLAMA_TOKENS_PER_MINUTE: int = Field(default=0, env="OLLAMA_TOKENS_PER_MINUTE")
+    LLM_QUEUE_MAX_WAIT_SECONDS: float = Field(default=30.0, env="LLM_QUEUE_MAX_WAIT_SECONDS") # Max time a call may wait for capacity
 
 
     # --- Add Validations for LLM Keys based on Provider ---
@@ -77,9 +142,10 @@ settings = Settings()
 
 # Logging Configuration
 import logging
+from backend.core.logs import configure_logging
 # Use LOG_LEVEL from settings after validation
 log_level_processed = settings.LOG_LEVEL.upper()
-logging.basicConfig(level=log_level_processed)
+configure_logging(log_level_processed, settings.LOG_FORMAT, settings.LOG_QUEUE_ENABLED, settings.LOG_SAMPLING)
 logger = logging.getLogger("aura_backend")
 
 logger.info(f"Log level set to: {log_level_processed}")
@@ -102,6 +168,6 @@ if settings.DATABASE_URL:
 else: logger.warning("DATABASE_URL is not set, database connection will not be established.")
 if settings.SECRET_KEY == "DEFAULT_SECRET_CHANGE_ME_IN_ENV": logger.warning("Security Warning: Using default SECRET_KEY.")
 logger.info(f"Default LLM Provider set to: {settings.DEFAULT_LLM_PROVIDER}")
-# if settings.DEFAULT_LLM_PROVIDER == "ollama":
-#     logger.info(f"Ollama Base URL: {settings.OLLAMA_BASE_URL}")
-#     logger.info(f"Ollama Default Model: {settings.OLLAMA_DEFAULT_MODEL}")
\ No newline at end of file
+if settings.OLLAMA_BASE_URL:
+    logger.info(f"Ollama Base URL: {settings.OLLAMA_BASE_URL}")
+    logger.info(f"Ollama Default Model: {settings.OLLAMA_DEFAULT_MODEL}")
\ No newline at end of file
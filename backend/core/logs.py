@@ -0,0 +1,200 @@
+# backend/core/logs.py
+# Logging pipeline. In the calling thread a record only gets its level check, per-logger sampling,
+# the request ID and a cheap msg % args merge; a QueueListener thread then does the formatting
+# (text or JSON) and the stream write, so request handlers never block on log I/O.
+import atexit
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import uuid
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from backend.core import metrics
+
+_request_id: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+QUEUE_SIZE = 10000 # Records beyond this are dropped (and counted) rather than blocking the caller
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 128
+# LogRecord attributes that aren't `extra=` fields
+RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+# Credentials that can appear in URLs (e.g. /events?ticket=), masked in access log lines
+SECRET_QUERY_PARAMS = re.compile(r"([?&](?:ticket|access_token|token)=)[^&\s\"]*", re.IGNORECASE)
+
+DROPPED_RECORDS = metrics.counter("log_records_dropped_total", "Log records dropped because the log queue was full.")
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class RequestContextFilter(logging.Filter):
+    """ Tags each record with the current request ID ("-" outside a request). """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """ Keeps a fraction of sub-WARNING records per logger prefix; warnings and errors always pass. """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True) # Most specific prefix wins
+        self._resolved: Dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = next((r for prefix, r in self.rates if name == prefix or name.startswith(prefix + ".")), 1.0)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING: return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class RedactQueryFilter(logging.Filter):
+    """ Masks SECRET_QUERY_PARAMS values in a record's message and string args (uvicorn.access logs the full path). """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(SECRET_QUERY_PARAMS.sub(r"\1[redacted]", arg) if isinstance(arg, str) else arg for arg in record.args)
+        if isinstance(record.msg, str): record.msg = SECRET_QUERY_PARAMS.sub(r"\1[redacted]", record.msg)
+        return True
+
+
+def parse_sampling(spec: Optional[str]) -> Dict[str, float]:
+    """ "aura_backend.nlu=0.1, backend.services.llm=0.25" -> {prefix: rate}. Bad entries are skipped. """
+    rates = {}
+    for entry in (spec or "").split(","):
+        name, _, value = entry.partition("=")
+        try: rates[name.strip()] = min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            if entry.strip(): print(f"Ignoring invalid LOG_SAMPLING entry: '{entry.strip()}'", file=sys.stderr)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line; `extra=` fields (e.g. request_timing, slow_query) are kept as keys. """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", "-")
+        if request_id != "-": payload["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS: payload[key] = value
+        if record.exc_info and not record.exc_text: record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text: payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread. The stock prepare() runs the full
+    formatter in the caller; here only args are merged (they may be mutated after the call returns)
+    and tracebacks rendered (frames can't outlive the caller safely).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try: self.queue.put_nowait(record)
+        except queue.Full: DROPPED_RECORDS.inc()
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text", use_queue: bool = True, sampling: Optional[str] = None):
+    """ Replaces the root handlers with the pipeline above. Safe to call again (e.g. in tests). """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    output = logging.StreamHandler()
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    if use_queue:
+        handler = DeferredQueueHandler(queue.Queue(maxsize=QUEUE_SIZE))
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=False)
+        _listener.start()
+    else:
+        handler = output
+    rates = parse_sampling(sampling)
+    if rates: handler.addFilter(SamplingFilter(rates))
+    handler.addFilter(RequestContextFilter())
+
+    access = logging.getLogger("uvicorn.access") # Has its own handlers; a logger filter covers them all
+    if not any(isinstance(f, RedactQueryFilter) for f in access.filters): access.addFilter(RedactQueryFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers): root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def shutdown_logging():
+    """ Flushes queued records (registered with atexit; also called on app shutdown). """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(shutdown_logging)
+
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware: takes X-Request-ID from the client/proxy (or generates one), exposes it to
+    log records via a ContextVar and echoes it on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                candidate = value.decode("latin-1").strip()
+                if 0 < len(candidate) <= MAX_REQUEST_ID_LENGTH and candidate.isprintable(): request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
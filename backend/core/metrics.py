@@ -0,0 +1,152 @@
+# backend/core/metrics.py
+# In-process metrics with Prometheus text exposition (served at /metrics, no external collector needed).
+# Instruments (Counter/Gauge/Histogram) are updated on the hot path; modules that already keep their own
+# state (rate limiters, breakers, caches, pools) register a collector that is read at scrape time.
+import bisect
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-ms rule parsing up to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# A collector returns (name, type, help, [(labels, value), ...]) families
+Sample = Tuple[Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+
+_instruments: Dict[str, "_Instrument"] = {}
+_collectors: List[Callable[[], Iterable[Family]]] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels: return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"): return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Instrument:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock() # Sync endpoints/dependencies record from threadpool threads
+        self._values: Dict[Tuple, object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: Tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Instrument):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock: items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self._labels(k))} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = value
+
+
+class Histogram(_Instrument):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None: state = self._values[key] = [[0] * len(self.buckets), 0.0, 0] # bucket counts, sum, count
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets): state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock: items = [(k, (list(s[0]), s[1], s[2])) for k, s in self._values.items()]
+        lines = []
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+def _register(cls, name: str, help: str, labelnames: Tuple[str, ...] = (), **kwargs):
+    instrument = _instruments.get(name)
+    if instrument is None: instrument = _instruments[name] = cls(name, help, labelnames, **kwargs)
+    return instrument
+
+def counter(name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    return _register(Counter, name, help, labelnames)
+
+def gauge(name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    return _register(Gauge, name, help, labelnames)
+
+def histogram(name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram, name, help, labelnames, buckets=buckets)
+
+
+def register_collector(collector: Callable[[], Iterable[Family]]):
+    """ Adds a scrape-time callback returning metric families built from a module's own state. """
+    if collector not in _collectors: _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """ All instruments and collector families in Prometheus text format (version 0.0.4). """
+    lines = []
+    for instrument in list(_instruments.values()):
+        lines.append(f"# HELP {instrument.name} {instrument.help}")
+        lines.append(f"# TYPE {instrument.name} {instrument.type}")
+        lines.extend(instrument.render())
+    merged: Dict[str, Family] = {} # Collectors may share a family (e.g. cache_hit_ratio{cache=...})
+    for collector in list(_collectors):
+        try: families = list(collector())
+        except Exception as e:
+            logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}", exc_info=True)
+            continue
+        for name, metric_type, help, samples in families:
+            if name in merged: merged[name][3].extend(samples)
+            else: merged[name] = (name, metric_type, help, list(samples))
+    for name, metric_type, help, samples in merged.values():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+def ratio(hits: float, misses: float) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
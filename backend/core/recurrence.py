@@ -0,0 +1,147 @@
+# backend/core/recurrence.py
+# RRULE (RFC 5545) support for recurring reminders. A recurring reminder is stored once: its rule,
+# its first occurrence (DTSTART) and, for COUNT/UNTIL rules, its end. Occurrences are generated on
+# read, lazily and only for the window being listed. dateutil iterates a rule from its DTSTART, so
+# an endless series expanded from the original DTSTART gets slower every day it runs; instead each
+# expansion restarts the rule at the first period (year, month, week, day or hour, respecting
+# INTERVAL) that can hold the window, with the DTSTART-derived defaults (BYDAY for weekly, BYHOUR
+# for daily, ...) written into the rule so they don't move with it. COUNT series can't be rebased
+# (the count runs from DTSTART) and are walked from the start, bounded by MAX_COUNT.
+import datetime
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Tuple
+
+from dateutil import parser as date_parser, rrule
+from dateutil.relativedelta import relativedelta
+
+from backend.core import metrics
+
+RULE_CACHE_SIZE = 1024
+MAX_COUNT = 10000 # Longest finite series accepted (COUNT=)
+FREQS = {"YEARLY": rrule.YEARLY, "MONTHLY": rrule.MONTHLY, "WEEKLY": rrule.WEEKLY, "DAILY": rrule.DAILY, "HOURLY": rrule.HOURLY}
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+def normalize_rule(rule: str) -> str:
+    """ 'rrule:freq=weekly; byday=MO' -> 'FREQ=WEEKLY;BYDAY=MO'. DTSTART comes from the reminder, not the rule. """
+    text = rule.strip()
+    if text.upper().startswith("RRULE:"): text = text[len("RRULE:"):]
+    return ";".join(part.strip().upper() for part in text.split(";") if part.strip())
+
+
+def _fields(rule: str) -> Dict[str, str]:
+    """ 'FREQ=DAILY;COUNT=3' -> {'FREQ': 'DAILY', 'COUNT': '3'} for a normalized rule. """
+    fields = {}
+    for part in rule.split(";"):
+        name, sep, value = part.partition("=")
+        if not sep or not value: raise ValueError(f"Invalid recurrence rule part '{part}'")
+        fields[name] = value
+    return fields
+
+
+def _explicit(rule: str, start: datetime.datetime) -> str:
+    """ The rule with the values dateutil would otherwise take from DTSTART spelled out, so DTSTART can move. """
+    fields = _fields(rule)
+    freq = FREQS[fields["FREQ"]]
+    if not any(name in fields for name in ("BYWEEKNO", "BYYEARDAY", "BYMONTHDAY", "BYDAY", "BYEASTER")):
+        if freq == rrule.YEARLY:
+            fields.setdefault("BYMONTH", str(start.month)); fields["BYMONTHDAY"] = str(start.day)
+        elif freq == rrule.MONTHLY: fields["BYMONTHDAY"] = str(start.day)
+        elif freq == rrule.WEEKLY: fields["BYDAY"] = WEEKDAYS[start.weekday()]
+    if freq < rrule.HOURLY: fields.setdefault("BYHOUR", str(start.hour))
+    fields.setdefault("BYMINUTE", str(start.minute))
+    fields.setdefault("BYSECOND", str(start.second))
+    return ";".join(f"{name}={value}" for name, value in fields.items())
+
+
+def _period_start(value: datetime.datetime, freq: int, wkst: int) -> datetime.datetime:
+    """ Start of the FREQ period (year, month, week from WKST, day, hour) containing `value`. """
+    if freq == rrule.HOURLY: return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if freq == rrule.DAILY: return day
+    if freq == rrule.WEEKLY: return day - datetime.timedelta(days=(day.weekday() - wkst) % 7)
+    if freq == rrule.MONTHLY: return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+def _periods_between(first: datetime.datetime, second: datetime.datetime, freq: int) -> int:
+    """ Whole FREQ periods from period start `first` to period start `second`. """
+    if freq == rrule.YEARLY: return second.year - first.year
+    if freq == rrule.MONTHLY: return (second.year - first.year) * 12 + second.month - first.month
+    if freq == rrule.HOURLY: return int((second - first).total_seconds() // 3600)
+    days = (second - first).days
+    return days // 7 if freq == rrule.WEEKLY else days
+
+
+def _shift(value: datetime.datetime, freq: int, periods: int) -> datetime.datetime:
+    if freq == rrule.YEARLY: return value + relativedelta(years=periods)
+    if freq == rrule.MONTHLY: return value + relativedelta(months=periods)
+    if freq == rrule.WEEKLY: return value + datetime.timedelta(weeks=periods)
+    if freq == rrule.DAILY: return value + datetime.timedelta(days=periods)
+    return value + datetime.timedelta(hours=periods)
+
+
+@lru_cache(maxsize=RULE_CACHE_SIZE)
+def _compiled(rule: str, start: datetime.datetime) -> rrule.rrule:
+    # No cache=True: a cached rrule keeps every occurrence it has generated for the life of the process
+    return rrule.rrulestr(rule, dtstart=start)
+
+
+def _rebased(rule: str, start: datetime.datetime, after: datetime.datetime) -> rrule.rrule:
+    """ The series restarted at the first INTERVAL-aligned period that can hold occurrences >= `after`. """
+    fields = _fields(rule)
+    if "COUNT" in fields: return _compiled(rule, start)
+    freq, interval = FREQS[fields["FREQ"]], int(fields.get("INTERVAL", 1))
+    wkst = WEEKDAYS.index(fields.get("WKST", "MO"))
+    first = _period_start(start, freq, wkst)
+    periods = _periods_between(first, _period_start(after.astimezone(start.tzinfo), freq, wkst), freq)
+    if periods < interval: return _compiled(rule, start)
+    anchor = _shift(first, freq, periods // interval * interval)
+    return _compiled(_explicit(rule, start), anchor)
+
+
+def validate_rule(rule: str, start: datetime.datetime) -> Tuple[datetime.datetime, Optional[datetime.datetime]]:
+    """
+    Checks a normalized rule with DTSTART `start` and returns the series' first occurrence and its
+    end: the last occurrence for COUNT, UNTIL for UNTIL, None for an endless series. Raises
+    ValueError for rules that can't be stored.
+    """
+    if "DTSTART" in rule or "\n" in rule: raise ValueError("Recurrence rule must be a single RRULE without DTSTART")
+    fields = _fields(rule)
+    if fields.get("FREQ") in ("MINUTELY", "SECONDLY"): raise ValueError("Reminders can repeat at most hourly")
+    if fields.get("FREQ") not in FREQS: raise ValueError("Recurrence rule needs FREQ=YEARLY, MONTHLY, WEEKLY, DAILY or HOURLY")
+    if fields.get("WKST", "MO") not in WEEKDAYS: raise ValueError("Invalid WKST in recurrence rule")
+    try:
+        compiled = _compiled(rule, start)
+        count = int(fields["COUNT"]) if "COUNT" in fields else None
+        until = date_parser.parse(fields["UNTIL"]) if "UNTIL" in fields else None
+    except (ValueError, TypeError, OverflowError) as e: raise ValueError(f"Invalid recurrence rule: {e}") from e
+    if count is not None and count > MAX_COUNT: raise ValueError(f"COUNT may be at most {MAX_COUNT}")
+    first = compiled.after(start, inc=True)
+    if first is None: raise ValueError("Recurrence rule has no occurrences")
+    if count is not None: return first, compiled.before(datetime.datetime.max.replace(tzinfo=start.tzinfo), inc=True)
+    if until is not None: return first, until.astimezone(start.tzinfo) if until.tzinfo else until.replace(tzinfo=start.tzinfo)
+    return first, None
+
+
+def occurrences(
+    rule: str, start: datetime.datetime, *, after: datetime.datetime, before: Optional[datetime.datetime] = None, inc: bool = True
+) -> Iterator[datetime.datetime]:
+    """ Occurrences from `after` (inclusive unless inc=False) up to, not including, `before`; generated as consumed. """
+    if after < start: after, inc = start, True
+    for occurrence in _rebased(rule, start, after).xafter(after, inc=inc):
+        if before is not None and occurrence >= before: return
+        yield occurrence
+
+
+def next_occurrence(rule: str, start: datetime.datetime, after: datetime.datetime) -> Optional[datetime.datetime]:
+    """ First occurrence strictly after `after`; None once the series has ended. """
+    return next(occurrences(rule, start, after=after, inc=False), None)
+
+
+def _recurrence_metrics():
+    info = _compiled.cache_info()
+    yield ("cache_hit_ratio", "gauge", "Hit ratio per in-process cache.", [({"cache": "reminder_rules"}, metrics.ratio(info.hits, info.misses))])
+    yield ("cache_entries", "gauge", "Entries per in-process cache.", [({"cache": "reminder_rules"}, info.currsize)])
+
+metrics.register_collector(_recurrence_metrics)
@@ -11,6 +11,7 @@ from backend.core.config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = settings.ALGORITHM
+STREAM_TICKET_SCOPE = "events" # Tickets only open GET /events; they are not access tokens
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed password."""
@@ -38,6 +39,18 @@ def decode_access_token(token: str) -> Optional[dict]:
     """Decodes a JWT access token."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("scope"): return None # A stream ticket, not an access token
         return payload
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError): # Catch specific errors
-        return None
\ No newline at end of file
+        return None
+
+def create_stream_ticket(subject: str | Any) -> str:
+    """Creates a short-lived JWT that can only open the event stream (EventSource can't send headers)."""
+    expire = datetime.now(timezone.utc) + timedelta(seconds=settings.EVENTS_TICKET_SECONDS)
+    return jwt.encode({"exp": expire, "sub": str(subject), "scope": STREAM_TICKET_SCOPE}, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+def decode_stream_ticket(ticket: str) -> Optional[dict]:
+    """Decodes a stream ticket; None if invalid, expired or not a ticket."""
+    try: payload = jwt.decode(ticket, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError): return None
+    return payload if payload.get("scope") == STREAM_TICKET_SCOPE else None
@@ -0,0 +1,154 @@
+# backend/core/timing.py
+# Per-request stage timing. The middleware opens a RequestTimings for each HTTP request; code paths
+# record into it with `stage_timer("nlu")` / `@timed_stage("auth")`. Stages can nest or overlap
+# (e.g. "db" inside "auth"). Results go out as a Server-Timing header and a structured log line.
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from backend.core.config import settings
+from backend.core import metrics
+
+logger = logging.getLogger("aura_backend.timing")
+
+_current_timings: contextvars.ContextVar = contextvars.ContextVar("request_timings", default=None)
+
+REQUEST_DURATION = metrics.histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"))
+INTENT_DURATION = metrics.histogram("process_intent_duration_seconds", "/process latency by resolved NLU intent.", ("intent",))
+STAGE_DURATION = metrics.histogram("request_stage_duration_seconds", "Per-request time spent in each stage.", ("stage",))
+QUERIES_PER_REQUEST = metrics.histogram("db_queries_per_request", "SQL statements executed per HTTP request.", ("route",), buckets=metrics.COUNT_BUCKETS)
+
+
+class RequestTimings:
+    """ Accumulated duration and call count per stage for one request. """
+    __slots__ = ("started", "stages", "intent", "query_shapes")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, list] = {} # stage -> [seconds, count]
+        self.intent: Optional[str] = None # Set by /process once NLU has resolved it
+        self.query_shapes: Optional[Dict[str, int]] = None # Statement shape -> executions (N+1 detection only)
+
+    def add(self, stage: str, seconds: float):
+        entry = self.stages.get(stage)
+        if entry is None: self.stages[stage] = [seconds, 1]
+        else: entry[0] += seconds; entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {stage: {"ms": round(seconds * 1000, 2), "count": count} for stage, (seconds, count) in self.stages.items()}
+
+    def header_value(self) -> str:
+        """ Server-Timing value, e.g. `auth;dur=1.2, db;dur=4.1;desc="3 calls", total;dur=12.0`. """
+        parts = []
+        for stage, (seconds, count) in self.stages.items():
+            part = f"{stage};dur={seconds * 1000:.1f}"
+            if count > 1: part += f';desc="{count} calls"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def start_request_timings() -> RequestTimings:
+    """ Starts timing for the current context (done by the middleware; benchmarks call it directly). """
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def get_request_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+def set_request_intent(intent: str):
+    timings = _current_timings.get()
+    if timings is not None: timings.intent = intent
+
+
+def record_stage(stage: str, seconds: float):
+    timings = _current_timings.get()
+    if timings is not None: timings.add(stage, seconds)
+
+
+class stage_timer:
+    """ Context manager recording the enclosed block under `stage` (no-op outside a request). """
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_stage(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+def timed_stage(stage: str) -> Callable:
+    """ Decorator form of stage_timer for sync and async functions (keeps the signature for FastAPI Depends). """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage): return await func(*args, **kwargs)
+            return async_wrapper
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage): return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop): opens a RequestTimings per HTTP request,
+    adds the Server-Timing header when the response starts, logs the per-stage breakdown and
+    feeds the request latency / stage / query-count metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.header_value())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            total_ms = timings.elapsed() * 1000
+            route = getattr(scope.get("route"), "path", None) or "unmatched" # Template, not raw path, to bound cardinality
+            REQUEST_DURATION.observe(total_ms / 1000, method=scope["method"], route=route, status=status_code)
+            if timings.intent: INTENT_DURATION.observe(total_ms / 1000, intent=timings.intent)
+            for stage, (seconds, _) in timings.stages.items(): STAGE_DURATION.observe(seconds, stage=stage)
+            QUERIES_PER_REQUEST.observe(timings.stages.get("db", (0, 0))[1], route=route)
+            if logger.isEnabledFor(logging.INFO):
+                stages = timings.as_dict()
+                logger.info(
+                    f"{scope['method']} {scope['path']} -> {status_code} in {total_ms:.1f}ms "
+                    + " ".join(f"{stage}={v['ms']}ms" for stage, v in stages.items()),
+                    extra={"request_timing": {"method": scope["method"], "path": scope["path"], "status": status_code,
+                                              "total_ms": round(total_ms, 2), "stages": stages}},
+                )
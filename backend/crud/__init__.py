@@ -3,8 +3,12 @@ from .crud_user import user # Use an instance or import functions directly
 from .crud_note import note
 from .crud_reminder import reminder
 from .crud_spending_log import spending_log
+from .crud_spending_rollup import spending_rollup
 from .crud_investment_note import investment_note
 from .crud_medical_log import medical_log
+from .crud_timeline import timeline
+from .crud_job import job
+from . import events # noqa: F401 - publishes data-change events on flush
 
 # This pattern uses instances of CRUD classes (see below)
 # Alternatively, import functions directly:
@@ -1,5 +1,6 @@
 # backend/crud/base.py
 # Optional: Define a base class for CRUD operations for reuse
+import datetime
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
@@ -12,6 +13,11 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def utc_day_start(date: datetime.date) -> datetime.datetime:
+    """ Midnight UTC of `date`. Filter timestamps with `>= utc_day_start(start)` / `< utc_day_start(end + 1 day)`
+    rather than cast(timestamp, Date) so the (user_id, timestamp) indexes apply. """
+    return datetime.datetime.combine(date, datetime.time.min, tzinfo=datetime.timezone.utc)
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
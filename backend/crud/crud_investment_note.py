@@ -1,14 +1,16 @@
 # backend/crud/crud_investment_note.py
 from typing import List,Optional  
 from sqlalchemy.orm import Session
-from sqlalchemy import cast, Date as SQLDate  # Import cast and SQLDate
 
-from backend.crud.base import CRUDBase
+from backend.crud.base import CRUDBase, utc_day_start
+from backend.crud.pagination import keyset_paginate
 from backend.db.models.investment_note import InvestmentNoteDB
 from backend.schemas.investment_note import InvestmentNoteCreate, InvestmentNoteUpdate
 import datetime
 
 class CRUDInvestmentNote(CRUDBase[InvestmentNoteDB, InvestmentNoteCreate, InvestmentNoteUpdate]):
+    page_key = (InvestmentNoteDB.timestamp, InvestmentNoteDB.id) # Keyset order for list endpoints (newest first)
+
     def create_with_owner(
         self, db: Session, *, obj_in: InvestmentNoteCreate, user_id: int
     ) -> InvestmentNoteDB:
@@ -27,20 +29,16 @@ class CRUDInvestmentNote(CRUDBase[InvestmentNoteDB, InvestmentNoteCreate, Invest
         start_date: Optional[datetime.date] = None,  # Added date filters
         end_date: Optional[datetime.date] = None,    # Added date filters
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None, # Keyset cursor from the previous page; takes precedence over skip
     ) -> List[InvestmentNoteDB]:
         """Gets multiple investment notes for a user, optionally filtered by creation date range."""
         query = db.query(self.model).filter(InvestmentNoteDB.user_id == user_id)
-        # Apply date filters based on timestamp (casting to date)
+        # Apply date filters as half-open UTC timestamp ranges (index-friendly, unlike casting to date)
         if start_date:
-            query = query.filter(cast(InvestmentNoteDB.timestamp, SQLDate) >= start_date)
+            query = query.filter(InvestmentNoteDB.timestamp >= utc_day_start(start_date))
         if end_date:
-            query = query.filter(cast(InvestmentNoteDB.timestamp, SQLDate) <= end_date)
-        return (
-            query.order_by(InvestmentNoteDB.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+            query = query.filter(InvestmentNoteDB.timestamp < utc_day_start(end_date + datetime.timedelta(days=1)))
+        return keyset_paginate(query, self.page_key, cursor=cursor, skip=skip, limit=limit).all()
 
 investment_note = CRUDInvestmentNote(InvestmentNoteDB)
\ No newline at end of file
@@ -0,0 +1,164 @@
+# backend/crud/crud_job.py
+# Postgres job queue storage. Jobs are rows in `jobs`; workers claim ready rows with
+# SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers (in-app or separate processes) can
+# poll the same table without claiming a job twice or blocking on each other. A claim is a lease
+# (JOB_LEASE_SECONDS, longer than any job should take): a worker that dies mid-job leaves it
+# `running` until the lease runs out and the sweep requeues it.
+import datetime
+import random
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import case, delete, event, func, update
+from sqlalchemy.orm import Session
+
+from backend.db.models.job import JobDB
+from backend.crud.events import notify_user
+from backend.core.config import logger
+
+PRIORITY_HIGH = 0 # A user is waiting on the result
+PRIORITY_DEFAULT = 5
+PRIORITY_LOW = 10
+
+# Called (from whatever thread committed) after a transaction that enqueued jobs commits, so
+# in-process workers can wake immediately instead of at their next poll
+_wake_listeners: List[Callable[[], None]] = []
+
+
+class ClaimedJob(NamedTuple):
+    """ Detached snapshot of a claimed job (the claiming session is closed before handlers run). """
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    user_id: Optional[int]
+    attempts: int # Including this one
+    max_attempts: int
+    run_at: datetime.datetime
+
+
+def add_wake_listener(listener: Callable[[], None]) -> None:
+    _wake_listeners.append(listener)
+
+
+def remove_wake_listener(listener: Callable[[], None]) -> None:
+    if listener in _wake_listeners: _wake_listeners.remove(listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session):
+    if session.info.pop("jobs_enqueued", False):
+        for listener in list(_wake_listeners):
+            try: listener()
+            except Exception as e: logger.warning(f"Job wake listener failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session):
+    # The enqueued rows are gone; a stale flag would wake the workers on the session's next, unrelated commit
+    session.info.pop("jobs_enqueued", None)
+
+
+def retry_delay(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """ Exponential backoff with jitter: base * 2^(attempts-1), capped, scaled by 0.5-1.0. """
+    return min(max_seconds, base_seconds * 2 ** max(attempts - 1, 0)) * (0.5 + random.random() / 2)
+
+
+class CRUDJob:
+    model = JobDB
+
+    def get(self, db: Session, id: int) -> Optional[JobDB]:
+        return db.get(JobDB, id)
+
+    def enqueue(
+        self, db: Session, *, kind: str, payload: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None,
+        priority: int = PRIORITY_DEFAULT, max_attempts: int = 5, run_at: Optional[datetime.datetime] = None,
+        commit: bool = True,
+    ) -> JobDB:
+        """
+        Adds a job. With `commit=False` it joins the caller's transaction, so the job exists only if
+        the caller's own writes commit (e.g. a note and the job that embeds it).
+        """
+        db_obj = JobDB(kind=kind, payload=payload or {}, user_id=user_id, priority=priority, max_attempts=max_attempts)
+        if run_at is not None: db_obj.run_at = run_at
+        db.add(db_obj)
+        db.info["jobs_enqueued"] = True
+        if commit: db.commit(); db.refresh(db_obj)
+        else: db.flush()
+        return db_obj
+
+    def claim_batch(self, db: Session, *, worker_id: str, kinds: Sequence[str], batch_sizes: Dict[str, int]) -> List[ClaimedJob]:
+        """
+        Claims the most urgent ready job of any of `kinds`, plus up to batch_sizes[kind] - 1 more ready
+        jobs of the same kind, and commits the claim. Empty list when nothing is ready.
+        """
+        if not kinds: return []
+        ready = (JobDB.status == "queued", JobDB.run_at <= func.now())
+        order = (JobDB.priority, JobDB.run_at, JobDB.id)
+        head = (db.query(JobDB).filter(*ready, JobDB.kind.in_(kinds)).order_by(*order)
+                .limit(1).with_for_update(skip_locked=True).first())
+        if head is None: db.rollback(); return []
+        jobs = [head]
+        extra = batch_sizes.get(head.kind, 1) - 1
+        if extra > 0:
+            jobs += (db.query(JobDB).filter(*ready, JobDB.kind == head.kind, JobDB.id != head.id).order_by(*order)
+                     .limit(extra).with_for_update(skip_locked=True).all())
+        now = datetime.datetime.now(datetime.timezone.utc)
+        claimed = []
+        for job in jobs:
+            job.status, job.locked_at, job.locked_by, job.attempts = "running", now, worker_id, job.attempts + 1
+            claimed.append(ClaimedJob(job.id, job.kind, dict(job.payload or {}), job.user_id, job.attempts, job.max_attempts, job.run_at))
+        db.commit()
+        return claimed
+
+    def complete(self, db: Session, *, results: Dict[int, Any]) -> None:
+        """ Marks jobs done; `results` maps job id -> JSON result (None for none). Owners get a "job" event. """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for job_id, result in results.items():
+            row = db.execute(update(JobDB).where(JobDB.id == job_id, JobDB.status == "running")
+                             .values(status="done", result=result, finished_at=now, locked_at=None, locked_by=None, last_error=None)
+                             .returning(JobDB.user_id, JobDB.kind)).first()
+            if row is not None and row.user_id is not None: notify_user(db, row.user_id, "job", {"id": job_id, "kind": row.kind, "status": "done"})
+        db.commit()
+
+    def fail(self, db: Session, *, jobs: Sequence[ClaimedJob], error: str, base_seconds: float, max_seconds: float) -> Dict[int, str]:
+        """ Reschedules each job with backoff, or marks it failed once out of attempts. Returns id -> new status. """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        outcomes = {}
+        for job in jobs:
+            if job.attempts >= job.max_attempts:
+                values = dict(status="failed", finished_at=now)
+            else:
+                values = dict(status="queued", run_at=now + datetime.timedelta(seconds=retry_delay(job.attempts, base_seconds, max_seconds)))
+            db.execute(update(JobDB).where(JobDB.id == job.id, JobDB.status == "running")
+                       .values(locked_at=None, locked_by=None, last_error=error[:2000], **values))
+            outcomes[job.id] = values["status"]
+            if values["status"] == "failed" and job.user_id is not None: notify_user(db, job.user_id, "job", {"id": job.id, "kind": job.kind, "status": "failed"})
+        db.commit()
+        return outcomes
+
+    def requeue_expired(self, db: Session, *, lease_seconds: float) -> int:
+        """ Releases jobs claimed longer than the lease ago (worker crashed or was killed); out of attempts -> failed. """
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=lease_seconds)
+        result = db.execute(
+            update(JobDB).where(JobDB.status == "running", JobDB.locked_at < cutoff).values(
+                status=case((JobDB.attempts >= JobDB.max_attempts, "failed"), else_="queued"),
+                finished_at=case((JobDB.attempts >= JobDB.max_attempts, func.now()), else_=None),
+                locked_at=None, locked_by=None, last_error="Lease expired (worker stopped)",
+            )
+        )
+        db.commit()
+        if result.rowcount: logger.warning(f"Jobs: released {result.rowcount} jobs with expired leases")
+        return result.rowcount
+
+    def purge_finished(self, db: Session, *, older_than_seconds: float) -> int:
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=older_than_seconds)
+        result = db.execute(delete(JobDB).where(JobDB.status.in_(("done", "failed")), JobDB.finished_at < cutoff))
+        db.commit()
+        return result.rowcount
+
+    def counts_by_status(self, db: Session) -> List[tuple]:
+        """ (kind, status, count) for unfinished jobs (queue depth / in flight). """
+        return (db.query(JobDB.kind, JobDB.status, func.count()).filter(JobDB.status.in_(("queued", "running")))
+                .group_by(JobDB.kind, JobDB.status).all())
+
+
+job = CRUDJob()
@@ -4,10 +4,13 @@ from sqlalchemy.orm import Session
 import datetime
 
 from backend.crud.base import CRUDBase
+from backend.crud.pagination import keyset_paginate
 from backend.db.models.medical_log import MedicalLogDB
 from backend.schemas.medical_log import MedicalLogCreate, MedicalLogUpdate
 
 class CRUDMedicalLog(CRUDBase[MedicalLogDB, MedicalLogCreate, MedicalLogUpdate]):
+    page_key = (MedicalLogDB.date, MedicalLogDB.timestamp, MedicalLogDB.id) # Keyset order for list endpoints (newest first)
+
     def create_with_owner(
         self, db: Session, *, obj_in: MedicalLogCreate, user_id: int
     ) -> MedicalLogDB:
@@ -33,7 +36,8 @@ class CRUDMedicalLog(CRUDBase[MedicalLogDB, MedicalLogCreate, MedicalLogUpdate])
         start_date: Optional[datetime.date] = None,  # Added date filters
         end_date: Optional[datetime.date] = None,    # Added date filters
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None, # Keyset cursor from the previous page; takes precedence over skip
     ) -> List[MedicalLogDB]:
         """Gets multiple medical logs for a user, optionally filtered by type and date range."""
         query = db.query(self.model).filter(MedicalLogDB.user_id == user_id)
@@ -44,12 +48,7 @@ class CRUDMedicalLog(CRUDBase[MedicalLogDB, MedicalLogCreate, MedicalLogUpdate])
             query = query.filter(MedicalLogDB.date >= start_date)
         if end_date:
             query = query.filter(MedicalLogDB.date <= end_date)
-        return (
-            query.order_by(MedicalLogDB.date.desc(), MedicalLogDB.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return keyset_paginate(query, self.page_key, cursor=cursor, skip=skip, limit=limit).all()
         
     def get_by_date(self, db: Session, *, user_id: int, date: datetime.date) -> List[MedicalLogDB]:
         # This can still be useful for fetching a single day's logs
@@ -1,15 +1,20 @@
 # backend/crud/crud_note.py
 from typing import List, Any, Dict, Optional, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, cast, Date as SQLDate, func
+from sqlalchemy import or_, and_, func
 import datetime
+import time
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
-from backend.crud.base import CRUDBase
+from backend.crud.base import CRUDBase, utc_day_start
+from backend.crud.pagination import keyset_paginate
+from backend.crud.crud_job import job as job_queue
 from backend.db.models.note import NoteDB
 from backend.schemas.note import NoteCreate, NoteUpdate
-from backend.core.config import logger
+from backend.core.config import settings, logger
+from backend.core.timing import stage_timer
+from backend.core import metrics
 
 # Embedding Model Init
 try:
@@ -24,7 +29,11 @@ except Exception as e:
     logger.error(f"Failed to load sentence-transformer model: {e}", exc_info=True)
     embedding_model = None
 
+EMBEDDING_SECONDS = metrics.histogram("embedding_inference_seconds", "Sentence-transformer encode() time per call.")
+EMBEDDING_BATCH_SIZE = metrics.histogram("embedding_batch_size", "Texts encoded per embedding call.", buckets=metrics.COUNT_BUCKETS)
+
 class CRUDNote(CRUDBase[NoteDB, NoteCreate, NoteUpdate]):
+    page_key = (NoteDB.timestamp, NoteDB.id) # Keyset order for list endpoints (newest first)
 
     def generate_embedding(self, text: str) -> Optional[np.ndarray]:
         if embedding_model is None:
@@ -34,11 +43,29 @@ class CRUDNote(CRUDBase[NoteDB, NoteCreate, NoteUpdate]):
             logger.warning("Invalid text for embedding.")
             return None
         try:
-            return embedding_model.encode(text)
+            with stage_timer("embedding") as timer: embedding = embedding_model.encode(text)
+            EMBEDDING_SECONDS.observe(time.perf_counter() - timer.started)
+            EMBEDDING_BATCH_SIZE.observe(1)
+            return embedding
         except Exception as e:
             logger.error(f"Error generating embedding: {e}", exc_info=True)
             return None
 
+    def generate_embeddings(self, texts: List[str]) -> Optional[np.ndarray]:
+        """ One encode() call for many texts (background embedding jobs); rows align with `texts`. """
+        if embedding_model is None:
+            logger.error("Embedding model not loaded.")
+            return None
+        with stage_timer("embedding") as timer: embeddings = embedding_model.encode(texts, batch_size=len(texts))
+        EMBEDDING_SECONDS.observe(time.perf_counter() - timer.started)
+        EMBEDDING_BATCH_SIZE.observe(len(texts))
+        return embeddings
+
+    def _embed_later(self, db: Session, db_obj: NoteDB) -> None:
+        """ Queues an embed_notes job in the caller's transaction (see services/job_handlers.py). """
+        db.flush() # Assigns db_obj.id
+        job_queue.enqueue(db, kind="embed_notes", payload={"note_id": db_obj.id}, user_id=db_obj.user_id, commit=False)
+
     def create_with_owner(self, db: Session, *, obj_in: NoteCreate, user_id: int) -> NoteDB:
         db_obj = NoteDB(
             content=obj_in.content,
@@ -47,7 +74,9 @@ class CRUDNote(CRUDBase[NoteDB, NoteCreate, NoteUpdate]):
             date_associated=obj_in.date_associated,
             user_id=user_id
         )
-        if obj_in.content:
+        if obj_in.content and settings.EMBEDDINGS_IN_BACKGROUND:
+            db.add(db_obj); self._embed_later(db, db_obj)
+        elif obj_in.content:
             embedding = self.generate_embedding(obj_in.content)
             if embedding is not None:
                 db_obj.embedding = embedding.tolist()
@@ -68,7 +97,9 @@ class CRUDNote(CRUDBase[NoteDB, NoteCreate, NoteUpdate]):
                  setattr(db_obj, field, value)
 
         # Regenerate embedding if content changed
-        if regenerate_embedding and db_obj.content:
+        if regenerate_embedding and db_obj.content and settings.EMBEDDINGS_IN_BACKGROUND:
+             self._embed_later(db, db_obj)
+        elif regenerate_embedding and db_obj.content:
              new_embedding = self.generate_embedding(db_obj.content)
              if new_embedding is not None:
                  db_obj.embedding = new_embedding.tolist()
@@ -90,21 +121,17 @@ class CRUDNote(CRUDBase[NoteDB, NoteCreate, NoteUpdate]):
         start_date: Optional[datetime.date] = None,  # Added date filters
         end_date: Optional[datetime.date] = None,    # Added date filters
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None, # Keyset cursor from the previous page; takes precedence over skip
     ) -> List[NoteDB]:
         """Gets multiple notes for a user, optionally filtered by creation date range."""
         query = db.query(self.model).filter(NoteDB.user_id == user_id)
-        # Apply date filters based on timestamp (casting to date)
+        # Apply date filters as half-open UTC timestamp ranges (index-friendly, unlike casting to date)
         if start_date:
-            query = query.filter(cast(NoteDB.timestamp, SQLDate) >= start_date)
+            query = query.filter(NoteDB.timestamp >= utc_day_start(start_date))
         if end_date:
-            query = query.filter(cast(NoteDB.timestamp, SQLDate) <= end_date)
-        return (
-            query.order_by(NoteDB.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+            query = query.filter(NoteDB.timestamp < utc_day_start(end_date + datetime.timedelta(days=1)))
+        return keyset_paginate(query, self.page_key, cursor=cursor, skip=skip, limit=limit).all()
 
     def get_by_date(self, db: Session, *, user_id: int, date: datetime.date) -> List[NoteDB]:
         logger.debug(f"CRUD: Getting notes for user {user_id} relevant to date {date}")
@@ -114,7 +141,8 @@ class CRUDNote(CRUDBase[NoteDB, NoteCreate, NoteUpdate]):
                 NoteDB.date_associated == date,
                 and_(
                     NoteDB.is_global == True,
-                    cast(NoteDB.timestamp, SQLDate) == date
+                    NoteDB.timestamp >= utc_day_start(date),
+                    NoteDB.timestamp < utc_day_start(date + datetime.timedelta(days=1))
                 )
             )
         )
@@ -128,39 +156,25 @@ class CRUDNote(CRUDBase[NoteDB, NoteCreate, NoteUpdate]):
         start_date: Optional[datetime.date] = None,  # Added date filters
         end_date: Optional[datetime.date] = None,    # Added date filters
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None, # Keyset cursor from the previous page; takes precedence over skip
     ) -> List[NoteDB]:
         """Gets global notes for a user, optionally filtered by creation date range."""
         query = db.query(self.model).filter(
             NoteDB.user_id == user_id,
             NoteDB.is_global == True
         )
-        # Apply date filters based on timestamp (casting to date)
+        # Apply date filters as half-open UTC timestamp ranges (index-friendly, unlike casting to date)
         if start_date:
-            query = query.filter(cast(NoteDB.timestamp, SQLDate) >= start_date)
+            query = query.filter(NoteDB.timestamp >= utc_day_start(start_date))
         if end_date:
-            query = query.filter(cast(NoteDB.timestamp, SQLDate) <= end_date)
-        return (
-            query.order_by(NoteDB.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+            query = query.filter(NoteDB.timestamp < utc_day_start(end_date + datetime.timedelta(days=1)))
+        return keyset_paginate(query, self.page_key, cursor=cursor, skip=skip, limit=limit).all()
 
     def get_logs_for_date(self, db: Session, *, user_id: int, date: datetime.date) -> List[Dict[str, Any]]:
-        combined_logs = []
-        notes = self.get_by_date(db=db, user_id=user_id, date=date)
-        for note in notes:
-            combined_logs.append({"type": "note", "content": note.content, "timestamp": note.timestamp})
-        from backend import crud # Import here to avoid circular dependency issues at module level
-        spending_logs = crud.spending_log.get_by_date(db=db, user_id=user_id, date=date)
-        for log in spending_logs:
-            combined_logs.append({"type": "spending", "content": f"{log.description}: ${log.amount:.2f}", "timestamp": log.timestamp})
-        medical_logs = crud.medical_log.get_by_date(db=db, user_id=user_id, date=date)
-        for log in medical_logs:
-             combined_logs.append({"type": "medical", "content": f"{log.log_type}: {log.content}", "timestamp": log.timestamp})
-        combined_logs.sort(key=lambda x: x.get("timestamp"), reverse=True)
-        return combined_logs
+        """ Notes, spending and medical logs for the day, newest first (one UNION ALL, see crud_timeline). """
+        from backend.crud.crud_timeline import timeline # Import here to avoid circular dependency issues at module level
+        return [row.as_log() for row in timeline.get_for_date(db=db, user_id=user_id, date=date)]
 
     def get_notes_by_tags_keywords(self, db: Session, *, user_id: int, tags: Optional[List[str]] = None, keywords: Optional[List[str]] = None, skip: int = 0, limit: int = 100) -> List[NoteDB]:
         query = db.query(self.model).filter(NoteDB.user_id == user_id)
@@ -1,15 +1,76 @@
 # backend/crud/crud_reminder.py
-from typing import List, Optional, Union, Dict, Any
+import heapq
+from itertools import islice
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import between, and_
+from sqlalchemy import between, and_, or_, func, select
 import datetime
 from datetime import timezone
 
 from backend.crud.base import CRUDBase
+from backend.crud.pagination import decode_cursor, keyset_paginate
 from backend.db.models.reminder import ReminderDB
 from backend.schemas.reminder import ReminderCreate, ReminderUpdate
+from backend.crud.events import notify_user
+from backend.core import recurrence
+
+REMINDER_CHANNEL = "reminders" # NOTIFY channel the reminder dispatchers LISTEN on
+
+def _announce(db: Session, reminder: ReminderDB) -> None:
+    """
+    Queues NOTIFY "<id>:<remind_at epoch>" (or "<id>:" when it should no longer fire) in the current
+    transaction; Postgres delivers it to the dispatchers on commit, so rollbacks announce nothing.
+    """
+    if db.get_bind().dialect.name != "postgresql": return
+    pending = reminder.is_active is not False and reminder.triggered_at is None
+    payload = f"{reminder.id}:{reminder.remind_at.timestamp()}" if pending else f"{reminder.id}:"
+    db.execute(select(func.pg_notify(REMINDER_CHANNEL, payload)))
+
+def _set_recurrence(reminder: ReminderDB, rule: Optional[str], start: datetime.datetime) -> None:
+    """
+    Makes `reminder` a series of `rule` from DTSTART `start` (or a one-off again when rule is None).
+    remind_at becomes the next occurrence from now, so the dispatcher doesn't replay past ones.
+    """
+    if not rule:
+        reminder.recurrence_rule = reminder.recurrence_start = reminder.recurrence_end = None
+        return
+    rule, start = recurrence.normalize_rule(rule), start.replace(microsecond=0) # rrule drops sub-second precision
+    first, last = recurrence.validate_rule(rule, start)
+    now = datetime.datetime.now(timezone.utc)
+    upcoming = first if first >= now else recurrence.next_occurrence(rule, start, now)
+    reminder.recurrence_rule, reminder.recurrence_start, reminder.recurrence_end = rule, start, last
+    reminder.remind_at = upcoming or last
+    reminder.triggered_at = None if upcoming else now # Every occurrence is already past
+
+def _aware(value: datetime.datetime) -> datetime.datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class ReminderOccurrence(NamedTuple):
+    """ One generated occurrence of a recurring reminder, listed like a row (`id` is the series'). """
+    id: int
+    user_id: int
+    content: str
+    remind_at: datetime.datetime
+    created_at: datetime.datetime
+    is_active: bool
+    triggered_at: Optional[datetime.datetime]
+    recurrence_rule: str
+
+
+def _expand(series: ReminderDB, start: datetime.datetime, end: datetime.datetime,
+            after_key: Optional[Tuple[datetime.datetime, int]] = None) -> Iterable[ReminderOccurrence]:
+    """ Lazily generates the series' occurrences in [start, end), after `after_key` (a keyset cursor) if given. """
+    lower = max(start, after_key[0]) if after_key else start
+    for at in recurrence.occurrences(series.recurrence_rule, series.recurrence_start, after=lower, before=end):
+        if after_key and (at, series.id) <= after_key: continue
+        yield ReminderOccurrence(series.id, series.user_id, series.content, at, series.created_at,
+                                 series.is_active, None, series.recurrence_rule)
+
 
 class CRUDReminder(CRUDBase[ReminderDB, ReminderCreate, ReminderUpdate]):
+    page_key = (ReminderDB.remind_at, ReminderDB.id) # Keyset order for list endpoints (soonest first)
+
     def create_with_owner(
         self, db: Session, *, obj_in: ReminderCreate, user_id: int
     ) -> ReminderDB:
@@ -17,12 +78,62 @@ class CRUDReminder(CRUDBase[ReminderDB, ReminderCreate, ReminderUpdate]):
         if obj_in.remind_at.tzinfo is None:
             obj_in.remind_at = obj_in.remind_at.replace(tzinfo=timezone.utc)
 
-        db_obj = ReminderDB(**obj_in.dict(), user_id=user_id)
+        db_obj = ReminderDB(**obj_in.dict(exclude={"recurrence_rule"}), user_id=user_id)
+        _set_recurrence(db_obj, obj_in.recurrence_rule, obj_in.remind_at) # ValueError for an unusable rule
         db.add(db_obj)
+        db.flush()
+        _announce(db, db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def update(
+        self, db: Session, *, db_obj: ReminderDB, obj_in: Union[ReminderUpdate, Dict[str, Any]]
+    ) -> ReminderDB:
+        """
+        CRUDBase.update; a new remind_at re-arms a fired reminder (and restarts a series there), and
+        dispatchers are told of the change.
+        """
+        update_data = dict(obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True))
+        remind_at = update_data.get("remind_at")
+        if remind_at is not None: update_data["remind_at"] = remind_at = _aware(remind_at)
+        if remind_at is not None and remind_at != db_obj.remind_at: db_obj.triggered_at = None
+        rule_changed = "recurrence_rule" in update_data
+        rule = update_data.pop("recurrence_rule", db_obj.recurrence_rule)
+        for field, value in update_data.items():
+            if hasattr(db_obj, field): setattr(db_obj, field, value)
+        if rule_changed or (rule and remind_at is not None):
+            _set_recurrence(db_obj, rule, remind_at or db_obj.recurrence_start or db_obj.remind_at)
+        db.add(db_obj); db.flush()
+        _announce(db, db_obj)
+        db.commit(); db.refresh(db_obj); return db_obj
+
+    @staticmethod
+    def _window(time_filter: str, now: datetime.datetime) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+        """ [start, end) listed for a time filter; None for 'all'. """
+        if time_filter == "all": return None
+        if time_filter == "today":
+            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            return start, start + datetime.timedelta(days=1)
+        if time_filter == "month": return now, now + datetime.timedelta(days=30) # Only future for month
+        return now, now + datetime.timedelta(days=7) # 'week', and the default for an invalid filter
+
+    def _series_in_window(
+        self, db: Session, *, user_id: int, is_active: bool, start: datetime.datetime, end: datetime.datetime
+    ) -> List[ReminderDB]:
+        """ Recurring reminders with possible occurrences in [start, end) (ix_reminders_recurring_user_id_start). """
+        return (
+            db.query(self.model)
+            .filter(
+                ReminderDB.user_id == user_id,
+                ReminderDB.recurrence_rule.isnot(None),
+                ReminderDB.recurrence_start < end,
+                or_(ReminderDB.recurrence_end.is_(None), ReminderDB.recurrence_end >= start),
+                ReminderDB.is_active == is_active,
+            )
+            .all()
+        )
+
     def get_filtered_reminders(
         self,
         db: Session,
@@ -31,9 +142,14 @@ class CRUDReminder(CRUDBase[ReminderDB, ReminderCreate, ReminderUpdate]):
         time_filter: str = "week", # Default to upcoming week
         is_active: bool = True,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[ReminderDB]:
-        """ Gets reminders with advanced filtering """
+        limit: int = 100,
+        cursor: Optional[str] = None, # Keyset cursor from the previous page; takes precedence over skip
+    ) -> List[Union[ReminderDB, ReminderOccurrence]]:
+        """
+        Gets reminders with advanced filtering. For a time window, recurring reminders are listed once
+        per occurrence in it, merged in (remind_at, id) order with one-off rows; 'all' lists rows
+        (a series once, at its next occurrence).
+        """
         now = datetime.datetime.now(timezone.utc)
         query = db.query(self.model).filter(
             ReminderDB.user_id == user_id,
@@ -41,41 +157,47 @@ class CRUDReminder(CRUDBase[ReminderDB, ReminderCreate, ReminderUpdate]):
         )
 
         # Time filter logic
-        if time_filter == "today":
-            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end = start + datetime.timedelta(days=1)
-            query = query.filter(ReminderDB.remind_at >= start, ReminderDB.remind_at < end) # Use >= and < for full day
-        elif time_filter == "week":
-            end = now + datetime.timedelta(days=7)
-            query = query.filter(ReminderDB.remind_at >= now, ReminderDB.remind_at <= end) # Only future for week
-        elif time_filter == "month":
-            end = now + datetime.timedelta(days=30)
-            query = query.filter(ReminderDB.remind_at >= now, ReminderDB.remind_at <= end) # Only future for month
-        elif time_filter == "all":
-            pass # No time filter applied for 'all'
-        else: # Default to week if invalid filter or not 'all'
-             end = now + datetime.timedelta(days=7)
-             query = query.filter(ReminderDB.remind_at >= now, ReminderDB.remind_at <= end)
-
-        return query.order_by(ReminderDB.remind_at.asc()).offset(skip).limit(limit).all()
+        window = self._window(time_filter, now)
+        if window is None: # No time filter applied for 'all'
+            return keyset_paginate(query, self.page_key, cursor=cursor, descending=False, skip=skip, limit=limit).all()
+        start, end = window
+        one_offs = query.filter(ReminderDB.recurrence_rule.is_(None), ReminderDB.remind_at >= start, ReminderDB.remind_at < end)
+        series = self._series_in_window(db, user_id=user_id, is_active=is_active, start=start, end=end)
+        if not series:
+            return keyset_paginate(one_offs, self.page_key, cursor=cursor, descending=False, skip=skip, limit=limit).all()
+
+        # Merge the first skip+limit one-off rows with occurrences generated only as far as the page needs
+        after_key = decode_cursor(cursor, self.page_key) if cursor else None
+        offset = 0 if cursor else skip
+        rows = keyset_paginate(one_offs, self.page_key, cursor=cursor, descending=False, limit=offset + limit).all()
+        merged = heapq.merge(rows, *(_expand(s, start, end, after_key) for s in series), key=lambda r: (r.remind_at, r.id))
+        return list(islice(merged, offset, offset + limit))
 
     def get_upcoming_reminders(
-        self, db: Session, *, user_id: int, within_minutes: int = 60*24*7 # Default 7 days
-    ) -> List[ReminderDB]:
-        """ Get active reminders within time window from now """
+        self, db: Session, *, user_id: int, within_minutes: int = 60*24*7, # Default 7 days
+        limit: int = 1000, # Caps occurrences of recurring reminders over long windows
+    ) -> List[Union[ReminderDB, ReminderOccurrence]]:
+        """ Get active reminders (and occurrences of recurring ones) within time window from now """
         now = datetime.datetime.now(timezone.utc)
         future_time = now + datetime.timedelta(minutes=within_minutes)
-        return (
+        rows = (
             db.query(self.model)
             .filter(
                 ReminderDB.user_id == user_id,
                 ReminderDB.is_active == True,
+                ReminderDB.recurrence_rule.is_(None),
                 ReminderDB.remind_at >= now, # Should be >= now
                 ReminderDB.remind_at <= future_time
             )
-            .order_by(ReminderDB.remind_at.asc())
+            .order_by(ReminderDB.remind_at.asc(), ReminderDB.id.asc())
+            .limit(limit)
             .all()
         )
+        end = future_time + datetime.timedelta(microseconds=1) # Inclusive, like the row filter
+        series = self._series_in_window(db, user_id=user_id, is_active=True, start=now, end=end)
+        if not series: return rows
+        merged = heapq.merge(rows, *(_expand(s, now, end) for s in series), key=lambda r: (r.remind_at, r.id))
+        return list(islice(merged, limit))
 
     def get_multi_by_owner(
         self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100, only_active: bool = False
@@ -96,8 +218,57 @@ class CRUDReminder(CRUDBase[ReminderDB, ReminderCreate, ReminderUpdate]):
 
         if reminder:
             reminder.is_active = False
+            _announce(db, reminder)
             db.commit()
             db.refresh(reminder)
         return reminder
 
-reminder = CRUDReminder(ReminderDB)
\ No newline at end of file
+    # --- Dispatcher (services/reminder_dispatcher.py) ---
+    def get_due_window(
+        self, db: Session, *, until: datetime.datetime, limit: int
+    ) -> List[tuple]:
+        """ (id, remind_at) of active, unfired reminders due by `until` (overdue included), soonest first. """
+        return (
+            db.query(ReminderDB.id, ReminderDB.remind_at)
+            .filter(ReminderDB.is_active == True, ReminderDB.triggered_at.is_(None), ReminderDB.remind_at <= until)
+            .order_by(ReminderDB.remind_at.asc(), ReminderDB.id.asc())
+            .limit(limit)
+            .all()
+        )
+
+    def claim_due(
+        self, db: Session, *, ids: List[int], due_by: datetime.datetime
+    ) -> List[tuple]:
+        """
+        Fires the given reminders and returns (id, user_id, content, remind_at) for those this call
+        claimed. Rows are locked with FOR UPDATE SKIP LOCKED and re-checked (active, unfired, due), so
+        when several dispatchers race for a reminder exactly one gets it; cancelled or rescheduled ones
+        are skipped. A one-off is marked fired; a series moves on to its next occurrence after now
+        (missed ones are not replayed) and is marked fired after its last. Each fired reminder is
+        pushed to its owner's event streams.
+        """
+        if not ids: return []
+        due = (
+            db.query(self.model)
+            .filter(ReminderDB.id.in_(ids), ReminderDB.is_active == True, ReminderDB.triggered_at.is_(None),
+                    ReminderDB.remind_at <= due_by)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        now = datetime.datetime.now(timezone.utc)
+        fired = []
+        for row in due:
+            fired.append((row.id, row.user_id, row.content, row.remind_at))
+            notify_user(db, row.user_id, "reminder", {"id": row.id, "content": row.content[:500], "remind_at": row.remind_at.isoformat()})
+            following = None
+            if row.recurrence_rule:
+                following = recurrence.next_occurrence(row.recurrence_rule, row.recurrence_start, max(now, row.remind_at))
+            if following is None:
+                row.triggered_at = now
+            else:
+                row.remind_at = following
+                _announce(db, row) # Every dispatcher schedules the next occurrence
+        db.commit()
+        return fired
+
+reminder = CRUDReminder(ReminderDB)
@@ -1,20 +1,54 @@
 # backend/crud/crud_spending_log.py
 from typing import List, Optional, Union, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select, and_
+from sqlalchemy import func, select, and_, cast, Date, literal_column
 import datetime
 
 from backend.crud.base import CRUDBase
+from backend.crud.pagination import keyset_paginate
+from backend.crud.crud_spending_rollup import spending_rollup, rollup_key
 from backend.db.models.spending_log import SpendingLogDB
+from backend.db.models.spending_rollup import SpendingDailyRollupDB
 from backend.schemas.spending_log import SpendingLogCreate, SpendingLogUpdate
 from backend.core.config import logger
 
+AGGREGATE_PERIODS = ("day", "week", "month", "year")
+
 class CRUDSpendingLog(CRUDBase[SpendingLogDB, SpendingLogCreate, SpendingLogUpdate]):
+    page_key = (SpendingLogDB.date, SpendingLogDB.timestamp, SpendingLogDB.id) # Keyset order for list endpoints (newest first)
+
     def create_with_owner(self, db: Session, *, obj_in: SpendingLogCreate, user_id: int) -> SpendingLogDB:
         db_obj = SpendingLogDB(**obj_in.dict(exclude_unset=True), user_id=user_id)
         if db_obj.date is None: db_obj.date = datetime.date.today()
         if db_obj.currency is None: db_obj.currency = 'USD'
-        db.add(db_obj); db.commit(); db.refresh(db_obj); return db_obj
+        db.add(db_obj); db.flush()
+        spending_rollup.apply(db, key=rollup_key(db_obj), amount=db_obj.amount, count=1) # Same transaction as the log
+        db.commit(); db.refresh(db_obj); return db_obj
+
+    def update(
+        self, db: Session, *, db_obj: SpendingLogDB, obj_in: Union[SpendingLogUpdate, Dict[str, Any]]
+    ) -> SpendingLogDB:
+        """ CRUDBase.update, moving the log's amount between rollup rows in the same transaction. """
+        old_key, old_amount = rollup_key(db_obj), db_obj.amount
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            if hasattr(db_obj, field): setattr(db_obj, field, value)
+        if db_obj.currency is None: db_obj.currency = 'USD'
+        db.add(db_obj); db.flush()
+        new_key = rollup_key(db_obj)
+        if new_key == old_key:
+            spending_rollup.apply(db, key=new_key, amount=db_obj.amount - old_amount, count=0)
+        else:
+            spending_rollup.apply(db, key=old_key, amount=-old_amount, count=-1)
+            spending_rollup.apply(db, key=new_key, amount=db_obj.amount, count=1)
+        db.commit(); db.refresh(db_obj); return db_obj
+
+    def remove(self, db: Session, *, id: int) -> Optional[SpendingLogDB]:
+        obj = db.get(self.model, id)
+        if obj:
+            spending_rollup.apply(db, key=rollup_key(obj), amount=-obj.amount, count=-1)
+            db.delete(obj); db.commit()
+        return obj
 
     def get_multi_by_owner(
         self,
@@ -25,7 +59,8 @@ class CRUDSpendingLog(CRUDBase[SpendingLogDB, SpendingLogCreate, SpendingLogUpda
         end_date: Optional[datetime.date] = None,    # Added date filters
         category: Optional[str] = None,              # Keep category filter
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None, # Keyset cursor from the previous page; takes precedence over skip
     ) -> List[SpendingLogDB]:
         """Gets multiple spending logs for a user, optionally filtered by date range and category."""
         query = db.query(self.model).filter(SpendingLogDB.user_id == user_id)
@@ -35,12 +70,7 @@ class CRUDSpendingLog(CRUDBase[SpendingLogDB, SpendingLogCreate, SpendingLogUpda
             query = query.filter(SpendingLogDB.date <= end_date)
         if category:
             query = query.filter(SpendingLogDB.category.ilike(f"%{category}%"))
-        return (
-            query.order_by(SpendingLogDB.date.desc(), SpendingLogDB.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return keyset_paginate(query, self.page_key, cursor=cursor, skip=skip, limit=limit).all()
 
     def get_by_date(self, db: Session, *, user_id: int, date: datetime.date) -> List[SpendingLogDB]:
             # This can still be useful for fetching a single day's logs
@@ -85,6 +115,51 @@ class CRUDSpendingLog(CRUDBase[SpendingLogDB, SpendingLogCreate, SpendingLogUpda
         return query.order_by(SpendingLogDB.date.desc(), SpendingLogDB.timestamp.desc()).limit(limit).all()
     # --- End Placeholder ---
 
+    def get_series(
+        self, db: Session, *, user_id: int, start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None, category: Optional[str] = None,
+    ) -> List[tuple]:
+        """ (date, amount, category, currency, description) tuples, oldest first; plain rows for analytics (no ORM objects). """
+        query = db.query(SpendingLogDB.date, SpendingLogDB.amount, SpendingLogDB.category, SpendingLogDB.currency,
+                         SpendingLogDB.description).filter(SpendingLogDB.user_id == user_id, SpendingLogDB.date.is_not(None))
+        if start_date: query = query.filter(SpendingLogDB.date >= start_date)
+        if end_date: query = query.filter(SpendingLogDB.date <= end_date)
+        if category: query = query.filter(SpendingLogDB.category.ilike(f"%{category}%"))
+        return [tuple(row) for row in query.order_by(SpendingLogDB.date).all()]
+
+    def aggregate(
+        self, db: Session, *, user_id: int, period: Optional[str] = "month", by_category: bool = True,
+        start_date: Optional[datetime.date] = None, end_date: Optional[datetime.date] = None,
+        category: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sums and counts grouped by currency plus an optional date_trunc bucket (`period`: day, week, month,
+        year; None for the whole range) and category. Reads the daily rollup table, so the cost grows with
+        days x categories in range, not with the number of logs; returns compact rows ordered by bucket,
+        currency, total desc:
+        {"bucket": date | None, "category": str | None, "currency": str, "total": float, "count": int}
+        """
+        if period is not None and period not in AGGREGATE_PERIODS: raise ValueError(f"Unsupported period '{period}'")
+        rollup = SpendingDailyRollupDB
+        # Inline the period literal (it's whitelisted) so SELECT and GROUP BY expressions match even with server-side binds
+        keys = []
+        if period == "day": keys.append(rollup.day.label("bucket"))
+        elif period: keys.append(cast(func.date_trunc(literal_column(f"'{period}'"), rollup.day), Date).label("bucket"))
+        keys.append(rollup.currency.label("currency"))
+        if by_category: keys.append(rollup.category.label("category"))
+        total = func.sum(rollup.total).label("total")
+
+        query = db.query(*keys, total, func.sum(rollup.count).label("count")).filter(rollup.user_id == user_id)
+        if start_date: query = query.filter(rollup.day >= start_date)
+        if end_date: query = query.filter(rollup.day <= end_date)
+        if category: query = query.filter(rollup.category.ilike(f"%{category}%"))
+        query = query.group_by(*keys).order_by(*(k for k in keys if k.name in ("bucket", "currency")), total.desc())
+        return [
+            {"bucket": getattr(row, "bucket", None), "category": getattr(row, "category", None) or None, # '' = uncategorized
+             "currency": row.currency, "total": float(row.total or 0.0), "count": int(row.count or 0)}
+            for row in query.all()
+        ]
+
     def get_spending_summary_by_date(self, db: Session, *, user_id: int, date: datetime.date) -> Optional[float]:
         total = db.query(func.sum(SpendingLogDB.amount)).filter(SpendingLogDB.user_id == user_id, SpendingLogDB.date == date).scalar()
         return total or 0.0
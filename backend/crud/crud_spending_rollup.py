@@ -0,0 +1,108 @@
+# backend/crud/crud_spending_rollup.py
+# spending_daily_rollups holds one row per (user, day, category, currency) with the total and count of
+# the matching spending_logs. CRUDSpendingLog applies +/- deltas in the same transaction as every
+# write, so aggregate reads scan O(days x categories) rollup rows instead of every log. `rebuild`
+# recomputes rows from spending_logs (backfill, repair); `find_drift` reports rows that disagree.
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, literal_column, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from backend.db.models.spending_log import SpendingLogDB
+from backend.db.models.spending_rollup import SpendingDailyRollupDB
+from backend.core.config import logger
+
+# (user_id, day, category, currency) with NULLs normalised the way the rollup stores them
+RollupKey = Tuple[int, datetime.date, str, str]
+
+TOTAL_TOLERANCE = 0.005 # Float sums drift in the last digits; anything under half a cent is not drift
+
+
+def rollup_key(log: SpendingLogDB) -> Optional[RollupKey]:
+    """ The rollup row `log` counts towards; None for logs without a date (not rolled up). """
+    if log.user_id is None or log.date is None: return None
+    return log.user_id, log.date, log.category or '', log.currency or 'USD'
+
+
+def _logs_grouped(user_id: Optional[int] = None):
+    """ SELECT of spending_logs grouped into rollup rows, optionally for one user. """
+    category = func.coalesce(SpendingLogDB.category, literal_column("''"))
+    currency = func.coalesce(SpendingLogDB.currency, literal_column("'USD'"))
+    query = select(
+        SpendingLogDB.user_id, SpendingLogDB.date.label("day"), category.label("category"), currency.label("currency"),
+        func.sum(SpendingLogDB.amount).label("total"), func.count().label("count"),
+    ).where(SpendingLogDB.date.is_not(None))
+    if user_id is not None: query = query.where(SpendingLogDB.user_id == user_id)
+    return query.group_by(SpendingLogDB.user_id, SpendingLogDB.date, category, currency)
+
+
+class CRUDSpendingRollup:
+    model = SpendingDailyRollupDB
+
+    def apply(self, db: Session, *, key: Optional[RollupKey], amount: float, count: int) -> None:
+        """
+        Adds `amount`/`count` (negative to subtract) to the rollup row for `key`, creating it if needed and
+        deleting it once no logs are left. Doesn't commit: call inside the transaction that writes the log.
+        """
+        if key is None or (not amount and not count): return
+        user_id, day, category, currency = key
+        upsert = insert(SpendingDailyRollupDB).values(
+            user_id=user_id, day=day, category=category, currency=currency, total=amount, count=count,
+        )
+        upsert = upsert.on_conflict_do_update(
+            constraint="spending_daily_rollups_pkey",
+            set_={"total": SpendingDailyRollupDB.total + upsert.excluded.total,
+                  "count": SpendingDailyRollupDB.count + upsert.excluded.count},
+        )
+        db.execute(upsert)
+        if count < 0:
+            db.execute(delete(SpendingDailyRollupDB).where(
+                SpendingDailyRollupDB.user_id == user_id, SpendingDailyRollupDB.day == day,
+                SpendingDailyRollupDB.category == category, SpendingDailyRollupDB.currency == currency,
+                SpendingDailyRollupDB.count <= 0,
+            ))
+
+    def rebuild(self, db: Session, *, user_id: Optional[int] = None) -> int:
+        """ Recomputes rollups from spending_logs (all users, or one) and commits. Returns rows written. """
+        # SHARE mode lets reads through but holds back log writes (and so their deltas) until we commit
+        db.execute(text("LOCK TABLE spending_logs IN SHARE MODE"))
+        stale = delete(SpendingDailyRollupDB)
+        if user_id is not None: stale = stale.where(SpendingDailyRollupDB.user_id == user_id)
+        db.execute(stale)
+        grouped = _logs_grouped(user_id)
+        result = db.execute(insert(SpendingDailyRollupDB).from_select(
+            ["user_id", "day", "category", "currency", "total", "count"], grouped,
+        ))
+        db.commit()
+        logger.info(f"CRUD: Rebuilt spending rollups ({'all users' if user_id is None else f'user {user_id}'}): {result.rowcount} rows")
+        return result.rowcount
+
+    def find_drift(self, db: Session, *, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rollup rows that don't match spending_logs: missing, extra, or with a different count or total.
+        Each entry: {user_id, day, category, currency, expected_total, expected_count, total, count}.
+        """
+        expected = _logs_grouped(user_id).subquery("expected")
+        rollup = select(SpendingDailyRollupDB)
+        if user_id is not None: rollup = rollup.where(SpendingDailyRollupDB.user_id == user_id)
+        rollup = rollup.subquery("rollup")
+        on = and_(expected.c.user_id == rollup.c.user_id, expected.c.day == rollup.c.day,
+                  expected.c.category == rollup.c.category, expected.c.currency == rollup.c.currency)
+        query = select(
+            func.coalesce(expected.c.user_id, rollup.c.user_id).label("user_id"),
+            func.coalesce(expected.c.day, rollup.c.day).label("day"),
+            func.coalesce(expected.c.category, rollup.c.category).label("category"),
+            func.coalesce(expected.c.currency, rollup.c.currency).label("currency"),
+            expected.c.total.label("expected_total"), expected.c.count.label("expected_count"),
+            rollup.c.total, rollup.c.count,
+        ).select_from(expected.join(rollup, on, full=True)).where(or_(
+            expected.c.user_id.is_(None), rollup.c.user_id.is_(None),
+            expected.c.count != rollup.c.count,
+            func.abs(expected.c.total - rollup.c.total) > TOTAL_TOLERANCE,
+        )).order_by(literal_column("user_id"), literal_column("day"))
+        return [dict(row._mapping) for row in db.execute(query)]
+
+
+spending_rollup = CRUDSpendingRollup()
@@ -0,0 +1,93 @@
+# backend/crud/crud_timeline.py
+# Cross-table timeline for a user's day: one UNION ALL over notes, spending and medical logs, ordered
+# newest first in SQL. Every branch filters on user_id plus an indexable predicate (Date column
+# equality or a half-open UTC timestamp range, never cast(timestamp, Date)), and only the columns
+# the timeline needs are selected (no note embeddings).
+import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Float, String, cast, literal, null, or_, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from backend.db.models.note import NoteDB
+from backend.db.models.spending_log import SpendingLogDB
+from backend.db.models.medical_log import MedicalLogDB
+from backend.crud.base import utc_day_start
+from backend.core.config import logger
+
+# (timestamp, kind, id) of the last row of the previous page
+TimelineCursor = Tuple[datetime.datetime, str, int]
+
+
+class TimelineRow(NamedTuple):
+    kind: str # "note" | "spending" | "medical"
+    id: int
+    timestamp: Optional[datetime.datetime]
+    text: str # Note/medical content or spending description
+    amount: Optional[float] # Spending only
+    label: Optional[str] # Medical log_type only
+
+    @property
+    def cursor(self) -> TimelineCursor:
+        return self.timestamp, self.kind, self.id
+
+    def as_log(self) -> Dict[str, Any]:
+        """ The {"type", "content", "timestamp"} entry the summary service consumes. """
+        if self.kind == "spending": content = f"{self.text}: ${self.amount:.2f}"
+        elif self.kind == "medical": content = f"{self.label}: {self.text}"
+        else: content = self.text
+        return {"type": self.kind, "content": content, "timestamp": self.timestamp}
+
+
+def utc_day_bounds(date: datetime.date) -> Tuple[datetime.datetime, datetime.datetime]:
+    """ Half-open [start, end) range covering `date` in UTC. """
+    start = utc_day_start(date)
+    return start, start + datetime.timedelta(days=1)
+
+
+class CRUDTimeline:
+
+    def _branches(self, *, user_id: int, date: datetime.date) -> list:
+        start, end = utc_day_bounds(date)
+        no_amount, no_label = cast(null(), Float).label("amount"), cast(null(), String).label("label")
+        # Notes associated with the day, plus global notes written that day (not already matched above).
+        # Two branches instead of one OR so each can use its own index.
+        notes_associated = select(
+            literal("note").label("kind"), NoteDB.id, NoteDB.timestamp, NoteDB.content.label("text"), no_amount, no_label,
+        ).where(NoteDB.user_id == user_id, NoteDB.date_associated == date)
+        notes_global = select(
+            literal("note").label("kind"), NoteDB.id, NoteDB.timestamp, NoteDB.content.label("text"), no_amount, no_label,
+        ).where(
+            NoteDB.user_id == user_id, NoteDB.is_global == True,
+            NoteDB.timestamp >= start, NoteDB.timestamp < end,
+            or_(NoteDB.date_associated.is_(None), NoteDB.date_associated != date),
+        )
+        spending = select(
+            literal("spending").label("kind"), SpendingLogDB.id, SpendingLogDB.timestamp,
+            SpendingLogDB.description.label("text"), SpendingLogDB.amount.label("amount"), no_label,
+        ).where(SpendingLogDB.user_id == user_id, SpendingLogDB.date == date)
+        medical = select(
+            literal("medical").label("kind"), MedicalLogDB.id, MedicalLogDB.timestamp,
+            MedicalLogDB.content.label("text"), no_amount, MedicalLogDB.log_type.label("label"),
+        ).where(MedicalLogDB.user_id == user_id, MedicalLogDB.date == date)
+        return [notes_associated, notes_global, spending, medical]
+
+    def get_for_date(
+        self, db: Session, *, user_id: int, date: datetime.date,
+        limit: Optional[int] = None, before: Optional[TimelineCursor] = None,
+    ) -> List[TimelineRow]:
+        """
+        The user's timeline for `date`, newest first, in one round trip. Page with `limit` and
+        `before=<last row>.cursor`; ties on timestamp are broken by (kind, id) so pages never overlap.
+        """
+        timeline = union_all(*self._branches(user_id=user_id, date=date)).subquery("timeline")
+        query = select(timeline).order_by(timeline.c.timestamp.desc(), timeline.c.kind.desc(), timeline.c.id.desc())
+        if before is not None:
+            query = query.where(tuple_(timeline.c.timestamp, timeline.c.kind, timeline.c.id) < tuple_(*before))
+        if limit is not None: query = query.limit(limit)
+        rows = [TimelineRow(*row) for row in db.execute(query)]
+        logger.debug(f"CRUD: Timeline for user {user_id} on {date}: {len(rows)} rows")
+        return rows
+
+
+timeline = CRUDTimeline()
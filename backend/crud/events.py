@@ -0,0 +1,45 @@
+# backend/crud/events.py
+# Per-user push events. They are published with Postgres NOTIFY on USER_EVENTS_CHANNEL inside the
+# writing transaction, so every API process's event hub (services/event_hub.py) receives them on
+# commit and rolled-back writes publish nothing. Writes to the user-data tables publish "change"
+# events automatically (after_flush below); fired reminders and finished jobs publish their own from
+# crud_reminder / crud_job. NOTIFY payloads are capped at 8000 bytes, so events carry ids and
+# metadata and clients re-fetch what they show.
+import json
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings, logger
+
+USER_EVENTS_CHANNEL = "user_events"
+CHANGE_TABLES = frozenset({"notes", "reminders", "spending_logs", "medical_logs", "investment_notes"})
+MAX_IDS = 50 # Per operation in one change event; clients re-fetch the list anyway
+MAX_PAYLOAD_BYTES = 7900
+
+
+def notify_user(db: Session, user_id: int, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+    """ Queues event `event_type` for `user_id` in the session's transaction (sent on commit). """
+    if not settings.EVENTS_ENABLED: return
+    conn = db.connection()
+    if conn.dialect.name != "postgresql": return
+    payload = json.dumps({"user_id": user_id, "type": event_type, **(data or {})}, separators=(",", ":"), default=str)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        logger.warning(f"Dropping oversized '{event_type}' event for user {user_id} ({len(payload)} bytes)"); return
+    conn.execute(select(func.pg_notify(USER_EVENTS_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_flush")
+def _publish_changes(session: Session, flush_context):
+    if not settings.EVENTS_ENABLED: return
+    changes = defaultdict(lambda: defaultdict(list)) # (user_id, table) -> op -> ids
+    for op, objs in (("created", session.new), ("updated", session.dirty), ("deleted", session.deleted)):
+        for obj in objs:
+            table = getattr(obj, "__tablename__", None)
+            if table not in CHANGE_TABLES: continue
+            if op == "updated" and not session.is_modified(obj, include_collections=False): continue
+            changes[(obj.user_id, table)][op].append(obj.id)
+    for (user_id, table), ops in changes.items():
+        notify_user(session, user_id, "change", {"entity": table, **{op: ids[:MAX_IDS] for op, ids in ops.items()}})
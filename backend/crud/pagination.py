@@ -0,0 +1,63 @@
+# backend/crud/pagination.py
+# Keyset (cursor) pagination for the per-user list queries. A cursor is the sort key of the last row
+# of a page, e.g. (timestamp, id), as opaque URL-safe base64 JSON. The next page filters on
+# `(sort key) < cursor` (`>` for ascending lists), which stays an index range scan at any depth and
+# doesn't skip or repeat rows when new ones are inserted. `skip` still works when no cursor is given.
+import base64
+import datetime
+import json
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursorError(ValueError):
+    """ The cursor is malformed or doesn't match the list it was passed to. """
+
+
+def _encode_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else value
+
+
+def _decode_value(raw: Any, python_type: type) -> Any:
+    if raw is None: raise ValueError("null key value") # (key) < (NULL, ...) matches no row: page key columns are NOT NULL
+    if python_type is datetime.datetime: return datetime.datetime.fromisoformat(raw)
+    if python_type is datetime.date: return datetime.date.fromisoformat(raw)
+    if python_type is int and not isinstance(raw, int): raise TypeError(f"expected int, got {type(raw).__name__}")
+    return raw
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    """ Cursor string -> tuple of values typed like `columns`. """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(columns): raise ValueError("wrong number of key values")
+        return tuple(_decode_value(value, column.type.python_type) for value, column in zip(raw, columns))
+    except (ValueError, TypeError) as e: # binascii.Error and JSONDecodeError are ValueErrors
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+
+def keyset_paginate(query: Query, columns: Sequence, *, cursor: Optional[str] = None, descending: bool = True,
+                    skip: int = 0, limit: int = 100) -> Query:
+    """
+    Orders `query` by `columns` (last one unique, e.g. id) and starts after `cursor`, or at offset
+    `skip`. The columns must be NOT NULL: a row comparison against NULL matches nothing.
+    """
+    if cursor:
+        key, after = tuple_(*columns), tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < after if descending else key > after)
+    elif skip:
+        query = query.offset(skip)
+    return query.order_by(*(column.desc() if descending else column.asc() for column in columns)).limit(limit)
+
+
+def next_cursor(rows: List[Any], columns: Sequence, limit: int) -> Optional[str]:
+    """ Cursor for the page after `rows`; None once a page comes back short (no more rows). """
+    if not rows or len(rows) < limit: return None
+    return encode_cursor([getattr(rows[-1], column.key) for column in columns])
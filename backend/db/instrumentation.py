@@ -0,0 +1,114 @@
+# backend/db/instrumentation.py
+# SQLAlchemy engine events: per-request query count/time (the "db" stage in Server-Timing and the
+# request log line), a slow-query log with redacted parameters and optional EXPLAIN (ANALYZE, BUFFERS),
+# N+1 detection for development, and connection pool gauges for /metrics.
+import logging
+import re
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.core.config import settings
+from backend.core.timing import record_stage, get_request_timings
+from backend.core import metrics
+
+logger = logging.getLogger("aura_backend.db")
+
+SLOW_QUERIES = metrics.counter("db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS.")
+MAX_LOGGED_STATEMENT = 2000
+
+# Reduces a statement to its shape so "same query, different ids" counts as a repeat
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\([^)]+\)s|%s|\?|:\w+")
+IN_LIST_PATTERN = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.I)
+# Writes inside a WITH query (matched against the upper-cased statement); those are never explained
+DATA_MODIFYING = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b")
+
+
+def statement_shape(statement: str) -> str:
+    shape = LITERAL_PATTERN.sub("?", statement)
+    return " ".join(IN_LIST_PATTERN.sub("IN (?)", shape).split())
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """ Keeps parameter names/positions and types, drops values (they may hold note content or emails). """
+    if isinstance(parameters, dict): return {k: f"<{type(v).__name__}>" for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)): # executemany
+            return [redact_parameters(parameters[0]), f"... {len(parameters)} rows"]
+        return [f"<{type(v).__name__}>" for v in parameters]
+    return "<redacted>" if parameters else parameters
+
+
+def _is_read_only(statement: str) -> bool:
+    """
+    SELECTs, and WITH queries with no INSERT/UPDATE/DELETE/MERGE anywhere: a data-modifying CTE
+    starts with WITH too, and re-running it would advance sequences and fire triggers again.
+    """
+    head = statement.lstrip().upper()
+    if head.startswith("SELECT"): return True
+    return head.startswith("WITH") and not DATA_MODIFYING.search(head)
+
+
+def _explain(conn, statement: str, parameters: Any) -> str:
+    """ Re-runs a slow SELECT under EXPLAIN (ANALYZE, BUFFERS) inside a savepoint on the same connection. """
+    cursor = conn.connection.cursor() # Raw DBAPI cursor: doesn't re-enter these listeners
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        cursor.close()
+
+
+def _check_n_plus_one(statement: str):
+    timings = get_request_timings()
+    if timings is None: return
+    if timings.query_shapes is None: timings.query_shapes = {}
+    shape = statement_shape(statement)
+    count = timings.query_shapes[shape] = timings.query_shapes.get(shape, 0) + 1
+    if count == settings.DB_N_PLUS_ONE_THRESHOLD: # Warn once per shape per request
+        logger.warning(f"Possible N+1: same statement shape executed {count}+ times in one request: {shape[:MAX_LOGGED_STATEMENT]}")
+
+
+def instrument_engine(engine: Engine):
+    """ Registers cursor-execute listeners on `engine` and a pool metrics collector. """
+    slow_seconds = settings.DB_SLOW_QUERY_MS / 1000 if settings.DB_SLOW_QUERY_MS > 0 else None
+    can_explain = settings.DB_EXPLAIN_SLOW_QUERIES and engine.dialect.name == "postgresql"
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        record_stage("db", elapsed) # Count and total time per request
+        if settings.DB_N_PLUS_ONE_THRESHOLD > 0: _check_n_plus_one(statement)
+        if slow_seconds is None or elapsed < slow_seconds: return
+        SLOW_QUERIES.inc()
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f}ms): {statement[:MAX_LOGGED_STATEMENT]} params={redact_parameters(parameters)}",
+            extra={"slow_query": {"ms": round(elapsed * 1000, 2), "shape": statement_shape(statement)[:MAX_LOGGED_STATEMENT]}},
+        )
+        # ANALYZE executes the statement again, so only read-only statements are explained
+        if can_explain and not executemany and _is_read_only(statement):
+            logger.warning(f"Plan for slow query:\n{_explain(conn, statement, parameters)}")
+
+    def _pool_metrics():
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"): return # e.g. NullPool
+        yield ("db_pool_connections", "gauge", "Connections in the SQLAlchemy pool by state.", [
+            ({"state": "checked_out"}, pool.checkedout()),
+            ({"state": "checked_in"}, pool.checkedin()),
+            ({"state": "overflow"}, max(pool.overflow(), 0)),
+        ])
+        yield ("db_pool_size", "gauge", "Configured pool size.", [({}, pool.size())])
+
+    metrics.register_collector(_pool_metrics)
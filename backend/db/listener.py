@@ -0,0 +1,92 @@
+# backend/db/listener.py
+# Postgres LISTEN on the event loop. One dedicated autocommit connection per listener (outside the
+# pool, psycopg2 only), read with loop.add_reader, so notifications arrive without polling queries.
+# The connection is re-opened after errors; `on_reconnect` runs after every (re)connect so the owner
+# can catch up on anything NOTIFYed while it was disconnected.
+import asyncio
+from typing import Callable, Dict, Optional
+
+from backend.db import session as db_session
+from backend.core.config import logger
+
+RETRY_SECONDS = 5.0
+
+
+class PgListener:
+    """ Calls handlers[channel](payload) on the event loop for each NOTIFY on the given channels. """
+
+    def __init__(self, name: str, handlers: Dict[str, Callable[[str], None]], on_reconnect: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.handlers = handlers
+        self.on_reconnect = on_reconnect
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+    @staticmethod
+    def supported() -> bool:
+        return db_session.engine is not None and db_session.engine.dialect.driver == "psycopg2"
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None
+
+    async def start(self) -> bool:
+        """ Connects (retrying in the background on failure). False when the driver can't LISTEN. """
+        self._loop, self._stopping = asyncio.get_running_loop(), False
+        if not self.supported():
+            logger.warning(f"{self.name}: LISTEN needs the psycopg2 driver; NOTIFY-driven updates are disabled")
+            return False
+        await self._connect()
+        return True
+
+    def stop(self):
+        self._stopping = True
+        self._close()
+
+    def _open(self):
+        engine = db_session.engine
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        conn = engine.dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            for channel in self.handlers: cursor.execute(f"LISTEN {channel}")
+        return conn
+
+    def _retry_later(self):
+        self._loop.call_later(RETRY_SECONDS, lambda: asyncio.ensure_future(self._connect()))
+
+    async def _connect(self):
+        if self._stopping: return
+        try:
+            self._conn = await asyncio.to_thread(self._open)
+        except Exception as e:
+            logger.warning(f"{self.name}: LISTEN connection failed ({e}); retrying in {RETRY_SECONDS:.0f}s")
+            self._retry_later()
+            return
+        self._loop.add_reader(self._conn.fileno(), self._on_readable)
+        if self.on_reconnect is not None: self.on_reconnect()
+
+    def _close(self):
+        conn, self._conn = self._conn, None
+        if conn is None: return
+        try: self._loop.remove_reader(conn.fileno())
+        except Exception: pass
+        try: conn.close()
+        except Exception: pass
+
+    def _on_readable(self):
+        conn = self._conn
+        try:
+            conn.poll()
+        except Exception as e:
+            logger.warning(f"{self.name}: LISTEN connection lost ({e}); reconnecting")
+            self._close()
+            self._retry_later()
+            return
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            handler = self.handlers.get(notify.channel)
+            if handler is None: continue
+            try: handler(notify.payload)
+            except Exception as e: logger.warning(f"{self.name}: notification handler failed: {e}", exc_info=True)
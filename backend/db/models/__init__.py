@@ -4,8 +4,10 @@ from .user import UserDB
 from .note import NoteDB
 from .reminder import ReminderDB
 from .spending_log import SpendingLogDB
+from .spending_rollup import SpendingDailyRollupDB
 from .investment_note import InvestmentNoteDB
 from .medical_log import MedicalLogDB
+from .job import JobDB
 
 # You might not need to import all here if Base is imported correctly in each model file
 # and Base.metadata is used elsewhere (e.g., in Alembic env.py or main.py startup)
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/db/models/investment_note.py
 import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, ARRAY
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, ARRAY, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -16,4 +16,6 @@ class InvestmentNoteDB(Base):
     tags = Column(ARRAY(String), nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
-    owner = relationship("UserDB", back_populates="investment_notes")
\ No newline at end of file
+    owner = relationship("UserDB", back_populates="investment_notes")
+
+    __table_args__ = (Index("ix_investment_notes_user_id_timestamp", user_id, timestamp.desc()),)
\ No newline at end of file
@@ -0,0 +1,33 @@
+# backend/db/models/job.py
+from sqlalchemy import Column, BigInteger, Integer, SmallInteger, String, Text, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from backend.db.base_class import Base
+
+class JobDB(Base):
+    """ Background job (see crud/crud_job.py and services/job_queue.py). """
+    __tablename__ = "jobs"
+
+    id = Column(BigInteger, primary_key=True)
+    kind = Column(String(64), nullable=False) # Handler name, e.g. "embed_notes"
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True) # Owner, for user-visible jobs
+    priority = Column(SmallInteger, nullable=False, server_default="5") # Lower runs first
+    status = Column(String(16), nullable=False, server_default="queued") # queued | running | done | failed
+    attempts = Column(Integer, nullable=False, server_default="0")
+    max_attempts = Column(Integer, nullable=False, server_default="5")
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now()) # Not before (retry backoff)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String(64), nullable=True) # Worker id holding the lease
+    last_error = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Partial indexes: the claim query only scans ready rows, the lease sweep only running ones
+    __table_args__ = (
+        Index("ix_jobs_queued_priority_run_at", priority, run_at, postgresql_where=(status == "queued")),
+        Index("ix_jobs_running_locked_at", locked_at, postgresql_where=(status == "running")),
+        Index("ix_jobs_finished_at", finished_at, postgresql_where=(status.in_(("done", "failed")))),
+    )
@@ -1,6 +1,6 @@
 # backend/db/models/medical_log.py
 import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,7 +13,10 @@ class MedicalLogDB(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     log_type = Column(String, nullable=False, index=True) # e.g., 'symptom', 'medication', 'appointment'
     content = Column(Text, nullable=False)
-    date = Column(Date, default=datetime.date.today, index=True) # Index date
+    date = Column(Date, default=datetime.date.today, nullable=False, index=True) # NOT NULL: part of the keyset page key
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
-    owner = relationship("UserDB", back_populates="medical_logs")
\ No newline at end of file
+    owner = relationship("UserDB", back_populates="medical_logs")
+
+    # Matches the list order (crud page_key) and serves per-user date ranges
+    __table_args__ = (Index("ix_medical_logs_user_id_date_page", user_id, date.desc(), timestamp.desc(), id.desc()),)
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/db/models/note.py
 import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text, ARRAY
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text, ARRAY, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -32,3 +32,9 @@ class NoteDB(Base):
     # --- End New Column ---
 
     owner = relationship("UserDB", back_populates="notes")
+
+    # Per-user listings newest first, and the timeline's date_associated lookup
+    __table_args__ = (
+        Index("ix_notes_user_id_timestamp", user_id, timestamp.desc()),
+        Index("ix_notes_user_id_date_associated", user_id, date_associated),
+    )
@@ -1,6 +1,6 @@
 # backend/db/models/reminder.py
 import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, and_
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -12,12 +12,22 @@ class ReminderDB(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(String, nullable=False)
-    remind_at = Column(DateTime(timezone=True), nullable=False, index=True) # Index for querying
+    remind_at = Column(DateTime(timezone=True), nullable=False, index=True) # Index for querying; for a recurring reminder, its next pending occurrence
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True, index=True) # Index for querying active ones
-    # Optional: Add fields for recurrence rule (e.g., RRULE string)
-    # recurrence_rule = Column(String, nullable=True)
-    # Optional: Track if triggered/dismissed
-    # triggered_at = Column(DateTime(timezone=True), nullable=True)
+    # Recurring reminders: one row per series, occurrences are expanded on read (core/recurrence.py)
+    recurrence_rule = Column(String, nullable=True) # RRULE body, e.g. "FREQ=WEEKLY;BYDAY=MO"
+    recurrence_start = Column(DateTime(timezone=True), nullable=True) # DTSTART of the series
+    recurrence_end = Column(DateTime(timezone=True), nullable=True) # Last occurrence (COUNT/UNTIL rules); NULL = endless
+    triggered_at = Column(DateTime(timezone=True), nullable=True) # Set when the dispatcher fires it (a series: its last occurrence); reset on reschedule
 
-    owner = relationship("UserDB", back_populates="reminders")
\ No newline at end of file
+    owner = relationship("UserDB", back_populates="reminders")
+
+    # Active reminders per user by due time (partial: inactive rows are never listed by time)
+    # Pending reminders by due time, for the dispatcher's window loads (stays small: fired rows drop out)
+    # Recurring series per user, for expanding occurrences into a listed window
+    __table_args__ = (
+        Index("ix_reminders_active_user_id_remind_at", user_id, remind_at, postgresql_where=(is_active == True)),
+        Index("ix_reminders_pending_remind_at", remind_at, postgresql_where=and_(is_active == True, triggered_at.is_(None))),
+        Index("ix_reminders_recurring_user_id_start", user_id, recurrence_start, postgresql_where=recurrence_rule.isnot(None)),
+    )
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/db/models/spending_log.py
 import datetime
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -15,7 +15,10 @@ class SpendingLogDB(Base):
     amount = Column(Float, nullable=False)
     category = Column(String, index=True, nullable=True)
     currency = Column(String(3), nullable=True, default='USD') # 3-letter code
-    date = Column(Date, default=datetime.date.today, index=True)
+    date = Column(Date, default=datetime.date.today, nullable=False, index=True) # NOT NULL: part of the keyset page key
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
-    owner = relationship("UserDB", back_populates="spending_logs")
\ No newline at end of file
+    owner = relationship("UserDB", back_populates="spending_logs")
+
+    # Matches the list order (crud page_key) and serves per-user date ranges
+    __table_args__ = (Index("ix_spending_logs_user_id_date_page", user_id, date.desc(), timestamp.desc(), id.desc()),)
\ No newline at end of file
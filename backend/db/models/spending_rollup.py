@@ -0,0 +1,18 @@
+# backend/db/models/spending_rollup.py
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, PrimaryKeyConstraint
+
+from backend.db.base_class import Base
+
+class SpendingDailyRollupDB(Base):
+    """ Per user/day/category/currency totals of spending_logs, kept in step by CRUDSpendingLog. """
+    __tablename__ = "spending_daily_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    category = Column(String, nullable=False, default='') # '' for uncategorized logs (primary key columns can't be NULL)
+    currency = Column(String(3), nullable=False, default='USD')
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+
+    # Leading (user_id, day) serves per-user date-range reads
+    __table_args__ = (PrimaryKeyConstraint(user_id, day, category, currency, name="spending_daily_rollups_pkey"),)
@@ -14,6 +14,8 @@ if not settings.DATABASE_URL:
 else:
     engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True) # Ensure URL is string
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    from backend.db.instrumentation import instrument_engine
+    instrument_engine(engine) # Query timing for the per-request "db" stage
 
 # Dependency to get DB session
 from typing import Generator
@@ -34,4 +36,4 @@ def get_db() -> Generator[Session, None, None]:
         raise
     finally:
         db.close()
-        logger.info("Database session closed.")
\ No newline at end of file
+        logger.debug("Database session closed.")
\ No newline at end of file
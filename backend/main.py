@@ -1,14 +1,23 @@
 # backend/main.py
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.core.config import settings, logger
+from backend.core.timing import ServerTimingMiddleware
+from backend.core.logs import RequestIdMiddleware, shutdown_logging
+from backend.core.metrics import render_metrics
 from backend.api.v1.api import api_router
 from backend.db import session
-from backend.services.llm import get_llm_service # Import factory
-from backend.services.llm.ollama_service import OllamaLLMService # Import specific type for check
+from backend.services.llm import get_llm_service, close_llm_services # Import factory
+from backend.services.job_queue import JobWorkerPool
+from backend.services import job_handlers # noqa: F401 - registers background job kinds
+from backend.services.reminder_dispatcher import ReminderDispatcher
+from backend.services.event_hub import hub as event_hub
 
 app = FastAPI(title=settings.PROJECT_NAME)
+job_workers = JobWorkerPool(settings.JOB_WORKERS) if settings.JOB_WORKERS > 0 else None
+reminder_dispatcher = ReminderDispatcher() if settings.REMINDER_DISPATCH_ENABLED else None
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,11 +27,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request stage timings -> Server-Timing header + structured log line
+app.add_middleware(ServerTimingMiddleware)
+# Outermost: request ID is set before anything below logs
+app.add_middleware(RequestIdMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 async def root(): return {"message": f"Welcome to {settings.PROJECT_NAME}! API available at {settings.API_V1_STR}"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+    def metrics_endpoint(): # Prometheus text format; sync so scrapes run in the threadpool
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.on_event("startup")
 async def on_startup():
      logger.info("Application startup...")
@@ -36,19 +55,22 @@ async def on_startup():
          try: logger.info("Database tables check/creation skipped (use Alembic).")
          except Exception as e: logger.error(f"Error during startup DB check: {e}", exc_info=True)
      else: logger.error("Database engine not initialized.")
+     if job_workers and session.engine: await job_workers.start()
+     if reminder_dispatcher and session.engine: await reminder_dispatcher.start()
+     if settings.EVENTS_ENABLED and session.engine: await event_hub.start()
 
 @app.on_event("shutdown")
 async def on_shutdown():
     logger.info("Application shutdown...")
-    # Gracefully close Ollama client if it was initialized
+    event_hub.stop() # Ends open event streams; clients reconnect to another worker
+    if reminder_dispatcher: await reminder_dispatcher.stop()
+    if job_workers: await job_workers.stop() # Let in-flight jobs finish before clients close
+    # Gracefully close provider clients (e.g. Ollama's httpx client) that were initialized
     try:
-        # Access the cached instance if possible (this is a bit hacky, DI is better)
-        llm_instance = get_llm_service() # Get potentially cached instance
-        if isinstance(llm_instance, OllamaLLMService):
-            await llm_instance.close_client()
+        await close_llm_services()
     except Exception as e:
-        # Log error if service wasn't initialized or closing failed
-        logger.warning(f"Could not close Ollama client during shutdown: {e}", exc_info=True)
+        logger.warning(f"Could not close LLM clients during shutdown: {e}", exc_info=True)
+    shutdown_logging() # Flush the log queue
 
 
 # --- How to Run (Reminder) ---
@@ -1,9 +1,10 @@
 # backend/schemas/__init__.py
 from .user import User, UserCreate, UserBase, UserUpdate, ProfileUpdate
-from .token import Token, TokenData
+from .token import Token, TokenData, StreamTicket
 from .note import Note, NoteCreate, NoteBase, NotesOutput, NoteUpdate, NoteSummaryOutput
 from .reminder import Reminder, ReminderCreate, ReminderBase, RemindersOutput, ReminderUpdate
-from .spending_log import SpendingLog, SpendingLogCreate, SpendingLogBase, SpendingLogsOutput, SpendingLogUpdate
+from .spending_log import SpendingLog, SpendingLogCreate, SpendingLogBase, SpendingLogsOutput, SpendingLogUpdate, SpendingAggregateOutput
 from .investment_note import InvestmentNote, InvestmentNoteCreate, InvestmentNoteBase, InvestmentNotesOutput, InvestmentNoteUpdate
 from .medical_log import MedicalLog, MedicalLogCreate, MedicalLogBase, MedicalLogsOutput, MedicalLogUpdate
-from .api_models import ProcessInput, ProcessOutput, SummaryOutput, Message
\ No newline at end of file
+from .api_models import ProcessInput, ProcessOutput, SummaryOutput, Message
+from .job import Job
\ No newline at end of file
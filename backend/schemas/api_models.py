@@ -5,6 +5,7 @@ import datetime
 
 class ProcessInput(BaseModel):
     text: str
+    explain: bool = False # Have the LLM analyse the data instead of the templated answer (spending queries)
     # audio_data: Optional[bytes] = None # If handling audio upload
 
 class ProcessOutput(BaseModel):
@@ -26,3 +26,4 @@ class InvestmentNote(InvestmentNoteBase):
 
 class InvestmentNotesOutput(BaseModel):
     investment_notes: List[InvestmentNote]
+    next_cursor: Optional[str] = None # Pass as `cursor` to get the next page
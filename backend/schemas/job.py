@@ -0,0 +1,17 @@
+# backend/schemas/job.py
+from pydantic import BaseModel
+from typing import Any, Optional
+import datetime
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    status: str # queued | running | done | failed
+    attempts: int
+    created_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+    result: Optional[Any] = None
+    last_error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 # backend/schemas/medical_log.py
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from typing import List, Optional
 import datetime
 
@@ -16,6 +16,11 @@ class MedicalLogUpdate(BaseModel):
     content: Optional[str] = None
     date: Optional[datetime.date] = None
 
+    @validator('date')
+    def date_not_null(cls, v):
+        if v is None: raise ValueError("date can be changed but not cleared") # Logs are listed by date
+        return v
+
 class MedicalLog(MedicalLogBase):
     id: int
     user_id: int
@@ -27,3 +32,4 @@ class MedicalLog(MedicalLogBase):
 
 class MedicalLogsOutput(BaseModel):
     medical_logs: List[MedicalLog]
+    next_cursor: Optional[str] = None # Pass as `cursor` to get the next page
@@ -28,6 +28,7 @@ class Note(NoteBase):
 
 class NotesOutput(BaseModel):
     notes: List[Note]
+    next_cursor: Optional[str] = None # Pass as `cursor` to get the next page
 
 class NoteSummaryOutput(BaseModel):
     summary: str
@@ -1,25 +1,44 @@
 # backend/schemas/reminder.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from typing import List, Optional
 import datetime
 
+from backend.core import recurrence
+
+def _check_rule(rule: Optional[str], start: Optional[datetime.datetime]) -> Optional[str]:
+    """ Normalizes an RRULE and rejects ones that can't be stored (422 instead of a failed insert). """
+    if not rule: return None
+    rule = recurrence.normalize_rule(rule)
+    start = start or datetime.datetime.now(datetime.timezone.utc)
+    recurrence.validate_rule(rule, start if start.tzinfo else start.replace(tzinfo=datetime.timezone.utc))
+    return rule
+
 class ReminderBase(BaseModel):
     content: str
-    remind_at: datetime.datetime
+    remind_at: datetime.datetime # First occurrence for a recurring reminder
     is_active: bool = True
+    recurrence_rule: Optional[str] = None # RFC 5545 RRULE, e.g. "FREQ=WEEKLY;BYDAY=MO,WE" (at most hourly)
 
 class ReminderCreate(ReminderBase):
-    pass
+    @validator('recurrence_rule')
+    def check_recurrence_rule(cls, v, values):
+        return _check_rule(v, values.get('remind_at'))
 
 class ReminderUpdate(BaseModel):
     content: Optional[str] = None
     remind_at: Optional[datetime.datetime] = None
     is_active: Optional[bool] = None
+    recurrence_rule: Optional[str] = None # null makes a recurring reminder a one-off
+
+    @validator('recurrence_rule')
+    def check_recurrence_rule_update(cls, v, values):
+        return _check_rule(v, values.get('remind_at'))
 
 class Reminder(ReminderBase):
     id: int
     user_id: int
     created_at: datetime.datetime
+    triggered_at: Optional[datetime.datetime] = None # When the dispatcher fired it
 
     class Config:
         from_attributes = True # Pydantic V2 update
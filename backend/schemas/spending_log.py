@@ -29,6 +29,11 @@ class SpendingLogUpdate(BaseModel):
     def uppercase_currency_update(cls, v):
          return v.upper() if v else None
 
+    @validator('date')
+    def date_not_null(cls, v):
+        if v is None: raise ValueError("date can be changed but not cleared") # Logs are listed and rolled up by date
+        return v
+
 class SpendingLog(SpendingLogBase):
     id: int
     user_id: int
@@ -41,8 +46,28 @@ class SpendingLog(SpendingLogBase):
 
 class SpendingLogsOutput(BaseModel):
     spending_logs: List[SpendingLog]
-    total_amount: Optional[float] = None
+    total_amount: Optional[float] = None # Across all matching logs (not just this page); None if they mix currencies
     currency: Optional[str] = None
+    next_cursor: Optional[str] = None # Pass as `cursor` to get the next page
+
+class SpendingBucket(BaseModel):
+    bucket: Optional[datetime.date] = None # Start of the day/week/month/year; None when not grouped by period
+    category: Optional[str] = None
+    currency: str
+    total: float
+    count: int
+
+class SpendingCurrencyTotal(BaseModel):
+    currency: str
+    total: float
+    count: int
+
+class SpendingAggregateOutput(BaseModel):
+    period: Optional[str] = None
+    start_date: Optional[datetime.date] = None
+    end_date: Optional[datetime.date] = None
+    series: List[SpendingBucket]
+    totals: List[SpendingCurrencyTotal] # One per currency; amounts in different currencies are never added
 
 # class SpendingLogCreate(BaseModel):
 #     amount: float
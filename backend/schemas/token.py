@@ -7,4 +7,8 @@ class Token(BaseModel):
     token_type: str
 
 class TokenData(BaseModel):
-    email: Optional[EmailStr] = None
\ No newline at end of file
+    email: Optional[EmailStr] = None
+
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int # Seconds
@@ -0,0 +1,201 @@
+# backend/services/analytics_service.py
+# Deterministic answers for the data-lookup intents (query_spending, get_reminders). Spending stats
+# are computed with NumPy over the rows CRUD already fetched (amounts, dates, categories): totals,
+# per-category breakdown, the change against the previous period and outliers, rendered into a
+# templated reply. No LLM call, so these intents answer in milliseconds; /process only escalates
+# to summary_service when the user asks for an explanation.
+import calendar
+import datetime
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+PERIOD_NAMES = {"day": ("today", "yesterday"), "week": ("this week", "last week"),
+                "month": ("this month", "last month"), "year": ("this year", "last year")}
+
+TOP_CATEGORIES = 3
+TOP_ITEMS = 5 # Largest purchases kept per currency (for the LLM prompt)
+OUTLIER_MIN_ROWS = 5 # Too few logs for a meaningful "typical" amount below this
+OUTLIER_Z = 3.5 # Modified z-score cut-off (Iglewicz & Hoaglin)
+MAX_OUTLIERS = 3
+
+# Phrases asking for analysis rather than numbers; those go to the LLM (as does ProcessInput.explain)
+EXPLAIN_PATTERN = re.compile(r"\b(explain|why|analy[sz]e|analysis|insights?|advice|advise|suggest(?:ions?)?|recommend\w*)\b", re.I)
+
+# (date, amount, category, currency, description), as returned by crud.spending_log.get_series
+SpendingRow = Tuple[datetime.date, float, Optional[str], Optional[str], Optional[str]]
+
+
+class PeriodBounds(NamedTuple):
+    start: Optional[datetime.date] # None = unbounded ("all")
+    end: datetime.date
+    previous_start: Optional[datetime.date] # None = no comparison period
+    previous_end: Optional[datetime.date]
+
+
+def wants_explanation(text: str) -> bool:
+    return bool(EXPLAIN_PATTERN.search(text or ""))
+
+
+def _shift_months(day: datetime.date, months: int) -> datetime.date:
+    """ `day` moved by `months`, clamped to the end of shorter months. """
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    return datetime.date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def period_bounds(time_range: str, today: datetime.date, start_date: Optional[datetime.date] = None,
+                  end_date: Optional[datetime.date] = None) -> PeriodBounds:
+    """
+    Period-to-date ranges matching crud.spending_log.get_by_time_range, plus the same stretch of the
+    previous period (e.g. March 1-14 against February 1-14). Explicit dates compare with the
+    equally long range just before them.
+    """
+    if start_date and end_date:
+        length = end_date - start_date + datetime.timedelta(days=1)
+        return PeriodBounds(start_date, end_date, start_date - length, start_date - datetime.timedelta(days=1))
+    if time_range == "day":
+        yesterday = today - datetime.timedelta(days=1)
+        return PeriodBounds(today, today, yesterday, yesterday)
+    if time_range == "week":
+        start, week = today - datetime.timedelta(days=today.weekday()), datetime.timedelta(days=7)
+        return PeriodBounds(start, today, start - week, today - week)
+    if time_range == "month":
+        previous_end = _shift_months(today, -1)
+        return PeriodBounds(today.replace(day=1), today, previous_end.replace(day=1), previous_end)
+    if time_range == "year":
+        previous_end = _shift_months(today, -12)
+        return PeriodBounds(today.replace(month=1, day=1), today, previous_end.replace(month=1, day=1), previous_end)
+    return PeriodBounds(None, today, None, None) # "all"
+
+
+def _format_money(currency: str, amount: float) -> str:
+    return f"{currency} {amount:,.2f}"
+
+
+def _format_day(day: datetime.date) -> str:
+    return f"{day:%b} {day.day}"
+
+
+def _modified_z_scores(amounts: np.ndarray) -> np.ndarray:
+    """ |x - median| in units of the median absolute deviation (robust to the outliers themselves). """
+    median = np.median(amounts)
+    mad = np.median(np.abs(amounts - median))
+    if mad == 0: return np.zeros_like(amounts)
+    return 0.6745 * (amounts - median) / mad
+
+
+def spending_stats(rows: Sequence[SpendingRow], bounds: PeriodBounds) -> List[Dict[str, Any]]:
+    """
+    Per-currency stats for the rows inside `bounds` (rows in the previous period only feed the
+    comparison). Each entry: currency, total, count, previous_total (None without a comparison
+    period), change_pct, median, categories [(name, total, share, previous_total)] (largest first),
+    largest, top_items and outliers [(amount, category, description, date)]. Currencies are never
+    added together.
+    """
+    if not rows: return []
+    count = len(rows)
+    days = np.fromiter((row[0].toordinal() for row in rows), dtype=np.int64, count=count) # Ordinals: no datetime objects in the arrays
+    amounts = np.fromiter((row[1] for row in rows), dtype=np.float64, count=count)
+    category_names: Dict[str, int] = {}; currency_names: Dict[str, int] = {} # name -> code, in first-seen order
+    categories = np.fromiter((category_names.setdefault(row[2] or "Uncategorized", len(category_names)) for row in rows), dtype=np.int64, count=count)
+    currencies = np.fromiter((currency_names.setdefault(row[3] or "USD", len(currency_names)) for row in rows), dtype=np.int64, count=count)
+    category_labels = np.array(list(category_names), dtype=object)
+
+    current = days <= bounds.end.toordinal()
+    if bounds.start is not None: current &= days >= bounds.start.toordinal()
+    previous = np.zeros_like(current)
+    if bounds.previous_start is not None:
+        previous = (days >= bounds.previous_start.toordinal()) & (days <= bounds.previous_end.toordinal())
+
+    def describe(i: int) -> Tuple[float, str, str, datetime.date]:
+        return float(amounts[i]), str(category_labels[categories[i]]), rows[i][4] or "", rows[i][0]
+
+    stats = []
+    for currency, code in currency_names.items():
+        in_currency = currencies == code
+        now_mask, before_mask = current & in_currency, previous & in_currency
+        if not (now_mask.any() or before_mask.any()): continue
+        now_amounts = amounts[now_mask]
+        total = float(now_amounts.sum())
+        previous_total = float(amounts[before_mask].sum()) if bounds.previous_start is not None else None
+        change_pct = (total - previous_total) / previous_total * 100 if previous_total else None
+
+        category_totals = np.bincount(categories[now_mask], weights=now_amounts, minlength=len(category_names))
+        previous_category_totals = np.bincount(categories[before_mask], weights=amounts[before_mask], minlength=len(category_names))
+        order = [i for i in np.argsort(-category_totals, kind="stable") if category_totals[i] > 0]
+        breakdown = [(str(category_labels[i]), float(category_totals[i]), float(category_totals[i] / total),
+                      float(previous_category_totals[i]) if previous_total is not None else None) for i in order]
+
+        indices = np.flatnonzero(now_mask)
+        top = indices[np.argsort(-now_amounts, kind="stable")[:TOP_ITEMS]]
+        top_items = [describe(int(i)) for i in top]
+        outliers = []
+        if len(indices) >= OUTLIER_MIN_ROWS:
+            scores = _modified_z_scores(now_amounts)
+            flagged = indices[scores > OUTLIER_Z] # High side only: unusually large purchases
+            flagged = flagged[np.argsort(-amounts[flagged], kind="stable")][:MAX_OUTLIERS]
+            outliers = [describe(int(i)) for i in flagged]
+
+        stats.append({
+            "currency": currency, "total": total, "count": len(indices),
+            "previous_total": previous_total, "change_pct": change_pct,
+            "median": float(np.median(now_amounts)) if len(now_amounts) else 0.0,
+            "categories": breakdown, "largest": top_items[0] if top_items else None, "top_items": top_items, "outliers": outliers,
+        })
+    stats.sort(key=lambda entry: -entry["total"])
+    return stats
+
+
+def render_spending_reply(stats: List[Dict[str, Any]], time_range: str, category: Optional[str] = None,
+                          explicit_range: Optional[Tuple[datetime.date, datetime.date]] = None) -> str:
+    """ Templated answer for query_spending from `spending_stats`. """
+    if explicit_range: period, previous_period = f"from {_format_day(explicit_range[0])} to {_format_day(explicit_range[1])}", "the period before"
+    else: period, previous_period = PERIOD_NAMES.get(time_range, ("in total", None))
+    subject = f" on {category}" if category else ""
+    if not any(entry["count"] for entry in stats):
+        return f"You haven't logged any spending{subject} {period}."
+
+    lines = []
+    for entry in stats:
+        currency, total, count = entry["currency"], entry["total"], entry["count"]
+        if not count:
+            lines.append(f"No {currency} spending{subject} {period} ({_format_money(currency, entry['previous_total'])} {previous_period}).")
+            continue
+        line = f"You spent {_format_money(currency, total)}{subject} {period} across {count} {'purchase' if count == 1 else 'purchases'}"
+        if entry["change_pct"] is not None:
+            direction = "up" if entry["change_pct"] >= 0 else "down"
+            line += f", {direction} {abs(entry['change_pct']):.0f}% from {_format_money(currency, entry['previous_total'])} {previous_period}"
+        elif entry["previous_total"] == 0 and previous_period:
+            line += f" (nothing {previous_period})"
+        lines.append(line + ".")
+        if not category and len(entry["categories"]) > 1:
+            top = ", ".join(f"{name} {_format_money(currency, amount)} ({share:.0%})" for name, amount, share, _ in entry["categories"][:TOP_CATEGORIES])
+            lines.append(f"Top categories: {top}.")
+        if entry["outliers"]:
+            unusual = "; ".join(f"{_format_money(currency, amount)} on {description or name} ({_format_day(day)})"
+                                for amount, name, description, day in entry["outliers"])
+            lines.append(f"Unusually large (typical purchase {_format_money(currency, entry['median'])}): {unusual}.")
+        elif entry["largest"] and count > 1:
+            amount, name, description, day = entry["largest"]
+            lines.append(f"Largest: {_format_money(currency, amount)} on {description or name} ({_format_day(day)}).")
+    return "\n".join(lines)
+
+
+def render_reminders_reply(reminders: Sequence[Any], time_filter: str, now: Optional[datetime.datetime] = None) -> str:
+    """ Templated answer for get_reminders: count, how soon the next one is due, then the list. """
+    if not reminders:
+        return f"You have no reminders scheduled for '{time_filter}'." if time_filter != "all" else "You have no active reminders."
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    upcoming = [rem.remind_at for rem in reminders if rem.remind_at and rem.remind_at >= now]
+    header = f"You have {len(reminders)} {'reminder' if len(reminders) == 1 else 'reminders'} for '{time_filter}'"
+    if upcoming:
+        minutes = int((min(upcoming) - now).total_seconds() // 60)
+        due = f"{minutes} min" if minutes < 60 else f"{minutes // 60} h" if minutes < 48 * 60 else f"{minutes // (24 * 60)} days"
+        header += f"; the next is due in {due}"
+    lines = [header + ":"]
+    for rem in reminders:
+        try: time_str = rem.remind_at.astimezone().strftime('%a, %b %d %I:%M %p %Z')
+        except Exception: time_str = rem.remind_at.strftime('%Y-%m-%d %H:%M UTC')
+        lines.append(f"- {rem.content} (at {time_str})")
+    return "\n".join(lines)
@@ -0,0 +1,121 @@
+# backend/services/event_hub.py
+# In-process fan-out of per-user push events to the /events streams open on this worker. Events are
+# published with NOTIFY (crud/events.py) and arrive here over one LISTEN connection per process,
+# whichever process or instance wrote them. Each stream has a bounded queue: a client that stops
+# reading can't make the worker buffer without limit; when its queue is full the backlog is dropped
+# and replaced by a single "resync" event, and the client re-fetches its lists. Streams per worker
+# are capped at EVENTS_MAX_CONNECTIONS.
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from backend.db.listener import PgListener
+from backend.crud.events import USER_EVENTS_CHANNEL
+from backend.core.config import settings, logger
+from backend.core import metrics
+
+EVENTS_DELIVERED = metrics.counter("events_delivered_total", "Push events queued to event streams, by type.", ("type",))
+EVENTS_RESYNCS = metrics.counter("events_resync_total", "Event streams reset with a resync event, by reason (overflow, reconnect).", ("reason",))
+EVENTS_REJECTED = metrics.counter("events_rejected_total", "Event stream connections refused at EVENTS_MAX_CONNECTIONS.")
+
+RESYNC = {"type": "resync"} # Events may have been lost: re-fetch instead of applying deltas
+
+
+class Subscription:
+    """ One open event stream. `queue` yields event dicts, then None when the hub shuts down. """
+    __slots__ = ("user_id", "queue")
+
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+
+class EventHub:
+    def __init__(self, max_connections: Optional[int] = None, queue_size: Optional[int] = None):
+        self.max_connections = max_connections or settings.EVENTS_MAX_CONNECTIONS
+        self.queue_size = queue_size or settings.EVENTS_QUEUE_SIZE
+        self._subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._listener = PgListener("Event hub", {USER_EVENTS_CHANNEL: self._on_notify}, on_reconnect=self._on_reconnect)
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def accepting(self) -> bool:
+        return self._running and self._count < self.max_connections
+
+    @property
+    def connections(self) -> int:
+        return self._count
+
+    async def start(self):
+        self._running = await self._listener.start()
+        if self._running: logger.info(f"Event hub started (max {self.max_connections} streams per worker)")
+
+    def stop(self):
+        """ Stops listening and ends every open stream. """
+        self._running = False
+        self._listener.stop()
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions: self._put(subscription, None)
+
+    def subscribe(self, user_id: int) -> Optional[Subscription]:
+        """ Opens a stream for `user_id`; None when the hub is down or the worker is at its connection cap. """
+        if not self._running: return None
+        if self._count >= self.max_connections:
+            EVENTS_REJECTED.inc(); return None
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscriptions[user_id].add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if not subscriptions or subscription not in subscriptions: return
+        subscriptions.discard(subscription)
+        if not subscriptions: del self._subscriptions[subscription.user_id]
+        self._count -= 1
+
+    def publish(self, user_id: int, event: Dict[str, Any]):
+        """ Queues `event` on every stream of `user_id` open on this worker. Must run on the loop. """
+        subscriptions = self._subscriptions.get(user_id)
+        if not subscriptions: return
+        for subscription in subscriptions:
+            if self._put(subscription, event): EVENTS_DELIVERED.inc(type=event.get("type", "unknown"))
+
+    def _put(self, subscription: Subscription, event: Optional[Dict[str, Any]]) -> bool:
+        try:
+            subscription.queue.put_nowait(event); return True
+        except asyncio.QueueFull: # Slow reader: drop its backlog rather than buffer without bound
+            while not subscription.queue.empty(): subscription.queue.get_nowait()
+            subscription.queue.put_nowait(RESYNC if event is not None else None)
+            EVENTS_RESYNCS.inc(reason="overflow")
+            return False
+
+    def _on_notify(self, payload: str):
+        try:
+            event = json.loads(payload)
+            user_id = event.pop("user_id")
+        except (ValueError, KeyError, AttributeError):
+            logger.debug("Ignoring malformed user event: %s", payload[:200]); return
+        self.publish(user_id, event)
+
+    def _on_reconnect(self):
+        # Notifications sent while the LISTEN connection was down are gone
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                self._put(subscription, RESYNC)
+                EVENTS_RESYNCS.inc(reason="reconnect")
+
+
+hub = EventHub()
+
+
+def _hub_metrics():
+    yield ("events_connections", "gauge", "Open event streams on this worker.", [({}, hub.connections)])
+
+metrics.register_collector(_hub_metrics)
@@ -0,0 +1,45 @@
+# backend/services/job_handlers.py
+# Background job kinds (see services/job_queue.py). Imported at app startup and by the worker
+# entry point, which registers them.
+import asyncio
+import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from backend import crud
+from backend.crud.crud_job import ClaimedJob
+from backend.db.models.note import NoteDB
+from backend.services.job_queue import job_handler
+from backend.services import summary_service
+from backend.core.config import logger
+
+EMBED_NOTES = "embed_notes"
+DAILY_SUMMARY = "daily_summary"
+
+
+@job_handler(EMBED_NOTES, batch_size=32)
+def embed_notes(db: Session, jobs: List[ClaimedJob]) -> None:
+    """ Embeds the current content of each note in one encode() call (payload: {"note_id"}). """
+    note_ids = {job.payload["note_id"] for job in jobs}
+    notes = db.query(NoteDB).filter(NoteDB.id.in_(note_ids)).all() # Deleted notes simply drop out
+    if not notes: return
+    embeddings = crud.note.generate_embeddings([note.content for note in notes])
+    if embeddings is None: raise RuntimeError("Embedding model unavailable")
+    for note, embedding in zip(notes, embeddings): note.embedding = embedding.tolist()
+    db.commit()
+    logger.debug("Embedded %d notes", len(notes))
+
+
+@job_handler(DAILY_SUMMARY)
+async def daily_summary(db: Session, jobs: List[ClaimedJob]) -> Dict[int, Any]:
+    """
+    Daily summary for the job's user (payload: {"date": "YYYY-MM-DD"}); the text is the job result.
+    The log query runs in a thread: this handler is on the API's event loop, only the LLM call awaits there.
+    """
+    results = {}
+    for job in jobs:
+        date = datetime.date.fromisoformat(job.payload["date"])
+        relevant_data = await asyncio.to_thread(crud.note.get_logs_for_date, db=db, user_id=job.user_id, date=date)
+        results[job.id] = {"date": date.isoformat(), "summary": await summary_service.generate_daily_summary(relevant_data, {})}
+    return results
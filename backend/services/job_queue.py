@@ -0,0 +1,205 @@
+# backend/services/job_queue.py
+# Background job runner over the Postgres `jobs` table (storage and claiming: crud/crud_job.py).
+# Handlers register by kind with @job_handler; a JobWorkerPool runs N asyncio workers that claim
+# batches of same-kind jobs, run the handler (sync handlers in a thread, async ones on the loop),
+# and mark the jobs done or reschedule them with exponential backoff. The app starts a pool of
+# JOB_WORKERS workers; more can run as separate processes:
+#
+#   python -m backend.services.job_queue --concurrency 4
+#
+# No broker: Postgres is the queue, enqueueing inside a request transaction is atomic with that
+# request's writes, and in-process enqueues wake idle workers immediately (other processes pick
+# jobs up within JOB_POLL_INTERVAL_SECONDS).
+import argparse
+import asyncio
+import inspect
+import os
+import socket
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.db import session as db_session
+from backend.crud.crud_job import ClaimedJob, add_wake_listener, remove_wake_listener
+from backend import crud
+from backend.core.config import settings, logger
+from backend.core import metrics
+
+JOBS_PROCESSED = metrics.counter("jobs_processed_total", "Background jobs finished, by outcome (done, retry, failed).", ("kind", "outcome"))
+JOB_DURATION = metrics.histogram("job_batch_duration_seconds", "Handler run time per claimed batch.", ("kind",))
+JOB_BATCH_SIZE = metrics.histogram("job_batch_size", "Jobs per claimed batch.", ("kind",), buckets=metrics.COUNT_BUCKETS)
+JOB_QUEUE_WAIT = metrics.histogram("job_queue_wait_seconds", "Time from a job becoming ready to being claimed.", ("kind",))
+
+# A handler gets a session and its claimed jobs and may return {job_id: JSON result}. Raising
+# reschedules the whole batch (jobs should be idempotent: a retry may repeat work).
+JobHandlerFn = Callable[[Session, List[ClaimedJob]], Any]
+
+
+class JobHandler(NamedTuple):
+    fn: JobHandlerFn
+    batch_size: int
+    is_async: bool
+
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str, *, batch_size: int = 1) -> Callable[[JobHandlerFn], JobHandlerFn]:
+    """ Registers `fn` for jobs of `kind`, claimed up to `batch_size` at a time. """
+    def register(fn: JobHandlerFn) -> JobHandlerFn:
+        _handlers[kind] = JobHandler(fn, max(1, batch_size), inspect.iscoroutinefunction(fn))
+        return fn
+    return register
+
+
+def registered_kinds() -> List[str]:
+    return list(_handlers)
+
+
+class JobWorkerPool:
+    """ `concurrency` asyncio workers claiming jobs for every registered kind. """
+
+    def __init__(self, concurrency: int, name: Optional[str] = None):
+        self.concurrency = concurrency
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+        self._last_sweep = 0.0
+
+    def _wake_threadsafe(self):
+        if self._loop is not None and not self._loop.is_closed(): self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def start(self):
+        self._loop, self._wake, self._stopping = asyncio.get_running_loop(), asyncio.Event(), False
+        add_wake_listener(self._wake_threadsafe)
+        self._tasks = [asyncio.create_task(self._run(f"{self.name}/{i}")) for i in range(self.concurrency)]
+        for task in self._tasks: task.add_done_callback(self._on_worker_exit)
+        logger.info(f"Job workers started: {self.concurrency} x {self.name} for {', '.join(registered_kinds()) or 'no kinds'}")
+
+    async def stop(self, timeout: float = 10.0):
+        """ Lets in-flight batches finish (up to `timeout`), then cancels. Unfinished jobs are retried after their lease. """
+        self._stopping = True
+        remove_wake_listener(self._wake_threadsafe)
+        if self._wake is not None: self._wake.set()
+        if not self._tasks: return
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending: task.cancel()
+        self._tasks = []
+        logger.info("Job workers stopped.")
+
+    async def _run(self, worker_id: str):
+        while not self._stopping:
+            try:
+                claimed = await asyncio.to_thread(self._claim, worker_id)
+            except Exception as e:
+                logger.error(f"Job claim failed: {e}", exc_info=True); claimed = []
+            if claimed:
+                try: await self._execute(claimed)
+                except Exception: # e.g. the done/failed update lost its connection: the lease requeues the batch
+                    logger.exception(f"Job batch {claimed[0].kind} x{len(claimed)} could not be finished (ids {[job.id for job in claimed]})")
+                continue
+            self._wake.clear()
+            try: await asyncio.wait_for(self._wake.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError: pass
+
+    def _on_worker_exit(self, task: asyncio.Task):
+        if task.cancelled() or self._stopping: return
+        error = task.exception()
+        logger.error(f"Job worker exited unexpectedly ({len(self._tasks)} started): {error!r}", exc_info=error)
+
+    def _claim(self, worker_id: str) -> List[ClaimedJob]:
+        db = db_session.SessionLocal()
+        try:
+            now = time.monotonic()
+            if now - self._last_sweep > settings.JOB_LEASE_SECONDS / 4: # Housekeeping, shared by this pool's workers
+                self._last_sweep = now
+                crud.job.requeue_expired(db, lease_seconds=settings.JOB_LEASE_SECONDS)
+                crud.job.purge_finished(db, older_than_seconds=settings.JOB_RETENTION_HOURS * 3600)
+            return crud.job.claim_batch(db, worker_id=worker_id, kinds=registered_kinds(),
+                                        batch_sizes={kind: handler.batch_size for kind, handler in _handlers.items()})
+        finally:
+            db.close()
+
+    def _run_sync(self, handler: JobHandler, jobs: List[ClaimedJob]) -> Any:
+        db = db_session.SessionLocal()
+        try: return handler.fn(db, jobs)
+        finally: db.close()
+
+    async def _run_async(self, handler: JobHandler, jobs: List[ClaimedJob]) -> Any:
+        db = db_session.SessionLocal()
+        try: return await handler.fn(db, jobs)
+        finally: db.close()
+
+    async def _execute(self, jobs: List[ClaimedJob]):
+        kind = jobs[0].kind
+        handler = _handlers[kind]
+        claimed_at = time.time()
+        for job in jobs: JOB_QUEUE_WAIT.observe(max(0.0, claimed_at - job.run_at.timestamp()), kind=kind)
+        JOB_BATCH_SIZE.observe(len(jobs), kind=kind)
+        started = time.perf_counter()
+        try:
+            results = await (self._run_async(handler, jobs) if handler.is_async else asyncio.to_thread(self._run_sync, handler, jobs))
+        except Exception as e:
+            JOB_DURATION.observe(time.perf_counter() - started, kind=kind)
+            logger.warning(f"Job batch failed: {kind} x{len(jobs)} (ids {[job.id for job in jobs]}): {e}", exc_info=True)
+            outcomes = await asyncio.to_thread(self._finish_failed, jobs, f"{type(e).__name__}: {e}")
+            for status in outcomes.values(): JOBS_PROCESSED.inc(kind=kind, outcome="failed" if status == "failed" else "retry")
+            return
+        JOB_DURATION.observe(time.perf_counter() - started, kind=kind)
+        results = results or {}
+        await asyncio.to_thread(self._finish_done, {job.id: results.get(job.id) for job in jobs})
+        JOBS_PROCESSED.inc(len(jobs), kind=kind, outcome="done")
+        logger.debug("Job batch done: %s x%d", kind, len(jobs))
+
+    def _finish_done(self, results: Dict[int, Any]):
+        db = db_session.SessionLocal()
+        try: crud.job.complete(db, results=results)
+        finally: db.close()
+
+    def _finish_failed(self, jobs: List[ClaimedJob], error: str) -> Dict[int, str]:
+        db = db_session.SessionLocal()
+        try: return crud.job.fail(db, jobs=jobs, error=error, base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+                                  max_seconds=settings.JOB_RETRY_MAX_SECONDS)
+        finally: db.close()
+
+
+def _queue_depth_metrics():
+    if db_session.SessionLocal is None: return
+    db = db_session.SessionLocal()
+    try: rows = crud.job.counts_by_status(db)
+    except Exception as e: logger.debug("Job queue depth unavailable: %s", e); return
+    finally: db.close()
+    yield ("jobs_in_queue", "gauge", "Unfinished background jobs by kind and status (queued, running).",
+           [({"kind": kind, "status": status}, count) for kind, status, count in rows])
+
+metrics.register_collector(_queue_depth_metrics)
+
+
+async def _serve(concurrency: int):
+    pool = JobWorkerPool(concurrency)
+    await pool.start()
+    try:
+        while True: await asyncio.sleep(3600)
+    finally:
+        await pool.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run background job workers (separately from the API process).")
+    parser.add_argument("--concurrency", type=int, default=max(settings.JOB_WORKERS, 1), help="Async workers in this process.")
+    args = parser.parse_args(argv)
+    if db_session.SessionLocal is None:
+        print("DATABASE_URL is not configured."); return 2
+    from backend.services import job_handlers # noqa: F401 - registers the handlers
+    try: asyncio.run(_serve(args.concurrency))
+    except KeyboardInterrupt: pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
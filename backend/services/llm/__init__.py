@@ -1,49 +1,151 @@
 # backend/services/llm/__init__.py
+from typing import Dict, List, Optional
+
 from backend.core.config import settings, logger
-from .base import LLMService
+from backend.core import metrics
+from .base import LLMService, GenerationOptions, is_error_reply
 from .openai_service import OpenAILLMService
 from .gemini_service import GeminiLLMService
 from .ollama_service import OllamaLLMService
+from .rate_limiter import RateLimitedLLMService, get_rate_limiter_metrics, PRIORITY_INTERACTIVE, PRIORITY_DEFAULT, PRIORITY_BACKGROUND
+from .tasks import TASK_NLU, TASK_CHAT, TASK_SUMMARY, TASK_RAG_ANSWER
+from .router import LLMRouter
+from .circuit_breaker import CircuitBreakerLLMService, CircuitOpenError, get_circuit_breaker_metrics
+from .fake_service import FakeLLMService, ReplayLLMService, create_fake_service
+from .single_flight import SingleFlightLLMService
 
 # --- LLM Service Factory ---
 
-# Cache the instance to avoid re-initialization on every call
-_llm_service_instance = None
-
-def get_llm_service(provider: str = None) -> LLMService:
-    """
-    Factory function to get the configured LLM service instance.
-    Uses the DEFAULT_LLM_PROVIDER from settings if provider is not specified.
-    """
-    global _llm_service_instance
-    # TODO: Add more robust caching or dependency injection if needed
+# Cache one instance per provider so alternating providers don't re-initialize clients
+_provider_services: Dict[str, LLMService] = {}
+_router_instance: Optional[LLMRouter] = None
+# Services handed to callers, wrapped for single-flight coalescing (keyed by provider or "router")
+_public_services: Dict[str, SingleFlightLLMService] = {}
 
-    selected_provider = provider or settings.DEFAULT_LLM_PROVIDER
+def get_configured_providers() -> List[str]:
+    """ Providers that have the credentials/URL they need, default provider first. """
+    if settings.DEFAULT_LLM_PROVIDER in ("fake", "replay"): # Offline load testing: never mix in real providers
+        return [settings.DEFAULT_LLM_PROVIDER]
+    configured = []
+    if settings.OPENAI_API_KEY: configured.append("openai")
+    if settings.GOOGLE_API_KEY: configured.append("gemini")
+    if settings.OLLAMA_BASE_URL: configured.append("ollama")
+    if settings.DEFAULT_LLM_PROVIDER in configured:
+        configured.remove(settings.DEFAULT_LLM_PROVIDER)
+        configured.insert(0, settings.DEFAULT_LLM_PROVIDER)
+    return configured
 
-    # If instance exists and provider hasn't changed, return cached instance
-    # Note: This simple cache doesn't handle config changes after startup well.
-    if _llm_service_instance and _llm_service_instance.provider == selected_provider:
-        return _llm_service_instance
-
-    logger.info(f"Initializing LLM service for provider: {selected_provider}")
-
-    if selected_provider == "openai":
+def _create_provider_service(provider: str) -> LLMService:
+    logger.info(f"Initializing LLM service for provider: {provider}")
+    if provider == "openai":
         if not settings.OPENAI_API_KEY:
             raise ValueError("OpenAI API key is not configured in settings.")
-        _llm_service_instance = OpenAILLMService(api_key=settings.OPENAI_API_KEY)
-    elif selected_provider == "gemini":
+        service = OpenAILLMService(api_key=settings.OPENAI_API_KEY)
+    elif provider == "gemini":
         if not settings.GOOGLE_API_KEY:
             raise ValueError("Google API key is not configured in settings.")
-        _llm_service_instance = GeminiLLMService(api_key=settings.GOOGLE_API_KEY)
-    elif selected_provider == "ollama":
+        service = GeminiLLMService(api_key=settings.GOOGLE_API_KEY)
+    elif provider == "ollama":
         if not settings.OLLAMA_BASE_URL:
              raise ValueError("Ollama Base URL is not configured in settings.")
-        _llm_service_instance = OllamaLLMService(
+        service = OllamaLLMService(
             base_url=str(settings.OLLAMA_BASE_URL), # Ensure str
             default_model=settings.OLLAMA_DEFAULT_MODEL
         )
+    elif provider == "fake":
+        service = create_fake_service()
+    elif provider == "replay":
+        recorder = _create_provider_service(settings.LLM_RECORD_PROVIDER) if settings.LLM_REPLAY_MODE == "record" else None
+        service = ReplayLLMService(settings.LLM_REPLAY_FILE, mode=settings.LLM_REPLAY_MODE,
+                                   inner=recorder, fallback=create_fake_service())
     else:
-        raise ValueError(f"Unsupported LLM provider configured: {selected_provider}")
+        raise ValueError(f"Unsupported LLM provider configured: {provider}")
+
+    # Route every call through the provider's shared rate limiter / admission queue,
+    # behind a circuit breaker so a down provider fails fast without queueing
+    return CircuitBreakerLLMService(RateLimitedLLMService(service))
+
+def get_provider_service(provider: str) -> LLMService:
+    """ Returns the cached service for one specific provider. """
+    if provider not in _provider_services:
+        _provider_services[provider] = _create_provider_service(provider)
+    return _provider_services[provider]
+
+def get_llm_router() -> Optional[LLMRouter]:
+    """ Returns the multi-provider router, or None if fewer than two providers can be built. """
+    global _router_instance
+    if _router_instance is None:
+        services = {}
+        for provider in get_configured_providers():
+            try: services[provider] = get_provider_service(provider)
+            except Exception as e: logger.error(f"Skipping LLM provider '{provider}' for router: {e}", exc_info=True)
+        if len(services) < 2: return None
+        _router_instance = LLMRouter(services, default_provider=settings.DEFAULT_LLM_PROVIDER,
+                                     hedge_after=settings.LLM_HEDGE_AFTER_SECONDS)
+    return _router_instance
+
+def get_llm_service(provider: str = None) -> LLMService:
+    """
+    Factory function to get the configured LLM service instance.
+    With an explicit provider, returns that provider's service.
+    Otherwise returns the multi-provider router when routing is enabled and more than
+    one provider is configured, falling back to DEFAULT_LLM_PROVIDER.
+    Identical concurrent calls through the returned service are coalesced.
+    """
+    if provider:
+        return _single_flight(provider, get_provider_service(provider))
+    if settings.LLM_ROUTING_ENABLED:
+        router = get_llm_router()
+        if router: return _single_flight("router", router)
+    return _single_flight(settings.DEFAULT_LLM_PROVIDER, get_provider_service(settings.DEFAULT_LLM_PROVIDER))
+
+def _single_flight(name: str, service: LLMService) -> LLMService:
+    """ Wraps a service so identical concurrent calls share one upstream request. """
+    if name not in _public_services:
+        _public_services[name] = SingleFlightLLMService(service)
+    return _public_services[name]
+
+def get_single_flight_metrics() -> List[Dict]:
+    return [service.snapshot() for service in _public_services.values()]
+
+def is_llm_available() -> bool:
+    """ False when no LLM is configured or every provider's circuit is open; callers should use local fallbacks. """
+    try: return get_llm_service().is_available()
+    except Exception as e:
+        logger.warning(f"LLM service unavailable: {e}")
+        return False
+
+async def close_llm_services():
+    """ Closes any provider clients that hold connections (e.g. Ollama's httpx client). """
+    for provider, service in _provider_services.items():
+        if hasattr(service, "close_client"):
+            try: await service.close_client()
+            except Exception as e: logger.warning(f"Could not close {provider} LLM client: {e}", exc_info=True)
+
+# --- Scrape-time metrics from the limiter / breaker / single-flight / router state ---
+BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+def _llm_metrics():
+    limiters = get_rate_limiter_metrics()
+    yield ("llm_queue_depth", "gauge", "LLM calls waiting for rate limit capacity.",
+           [({"provider": m["provider"]}, m["queue_depth"]) for m in limiters])
+    yield ("llm_queue_timeouts_total", "counter", "LLM calls rejected after waiting too long in the queue.",
+           [({"provider": m["provider"]}, m["timeouts"]) for m in limiters])
+    breakers = get_circuit_breaker_metrics()
+    yield ("llm_circuit_state", "gauge", "Circuit breaker state (0 closed, 1 half-open, 2 open).",
+           [({"provider": m["provider"]}, BREAKER_STATE_VALUES.get(m["state"], 0)) for m in breakers])
+    yield ("llm_circuit_rejected_total", "counter", "Calls rejected while the circuit was open.",
+           [({"provider": m["provider"]}, m["rejected"]) for m in breakers])
+    flights = get_single_flight_metrics()
+    yield ("llm_single_flight_calls_total", "counter", "Public LLM calls by whether they went upstream or joined an in-flight call.",
+           [({"service": m["provider"], "result": result}, m[result]) for m in flights for result in ("leaders", "coalesced")])
+    yield ("llm_single_flight_coalesced_ratio", "gauge", "Share of LLM calls served by an identical in-flight request.",
+           [({"service": m["provider"]}, metrics.ratio(m["coalesced"], m["leaders"])) for m in flights])
+    if _router_instance is not None:
+        providers = _router_instance.snapshot()["providers"]
+        yield ("llm_router_p95_seconds", "gauge", "Router's rolling p95 latency per provider.",
+               [({"provider": name}, stats["p95_seconds"]) for name, stats in providers.items()])
+        yield ("llm_router_error_rate", "gauge", "Router's rolling error rate per provider.",
+               [({"provider": name}, stats["error_rate"]) for name, stats in providers.items()])
 
-    _llm_service_instance.provider = selected_provider # Store provider in instance for caching check
-    return _llm_service_instance
\ No newline at end of file
+metrics.register_collector(_llm_metrics)
@@ -1,6 +1,42 @@
 # backend/services/llm/base.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from dataclasses import dataclass, fields, replace
+from typing import List, Dict, Any, Optional
+
+# Provider services report failures as bracketed error strings, e.g. "[Error: OpenAI rate limit exceeded.]"
+ERROR_REPLY_PREFIX = "[Error"
+
+def is_error_reply(reply: Any) -> bool:
+    """Returns True if a service reply is one of the provider error strings."""
+    return not isinstance(reply, str) or reply.startswith(ERROR_REPLY_PREFIX)
+
+@dataclass
+class GenerationOptions:
+    """
+    Provider-neutral generation parameters. Each service maps these to its native fields
+    (OpenAI max_tokens/stop, Gemini max_output_tokens/stop_sequences, Ollama num_predict/stop + keep_alive).
+    None means "use the service/provider default".
+    """
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    top_p: Optional[float] = None
+    stop: Optional[List[str]] = None
+    keep_alive: Optional[str] = None # Ollama only: how long to keep the model loaded, e.g. "10m"
+
+    @classmethod
+    def from_kwargs(cls, kwargs: Dict[str, Any], **defaults) -> "GenerationOptions":
+        """
+        Builds options from call kwargs (popping the fields it consumes), falling back to `defaults`.
+        Callers may pass either the individual fields or a ready-made `options=GenerationOptions(...)`.
+        """
+        base = kwargs.pop("options", None) or cls()
+        values = {name: value for name, value in defaults.items() if getattr(base, name) is None}
+        for field in fields(cls):
+            if kwargs.get(field.name) is not None: values[field.name] = kwargs.pop(field.name)
+            else: kwargs.pop(field.name, None)
+        if isinstance(values.get("stop"), str): values["stop"] = [values["stop"]]
+        return replace(base, **values)
+
 
 class LLMService(ABC):
     """Abstract Base Class for LLM Services."""
@@ -17,6 +53,10 @@ class LLMService(ABC):
         """Generates a summary from a list of documents."""
         pass
 
+    def is_available(self) -> bool:
+        """Whether a call is expected to reach the provider right now (see circuit_breaker)."""
+        return True
+
     # Add other common LLM tasks as needed (e.g., chat, classification)
     # @abstractmethod
     # def chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> str:
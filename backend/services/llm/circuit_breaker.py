@@ -0,0 +1,140 @@
+# backend/services/llm/circuit_breaker.py
+# Per-provider circuit breaker so a down provider fails fast instead of timing out on every call.
+import asyncio
+import logging
+import time
+from typing import Dict, List, Any, Optional
+
+from .base import LLMService, is_error_reply
+from .rate_limiter import RateLimitQueueTimeout
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """ Raised immediately when a call is attempted while the provider's circuit is open. """
+    pass
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. After `reset_timeout` seconds
+    one probe call is let through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        # Counters
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _maybe_half_open(self):
+        if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = STATE_HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"Circuit for '{self.name}' half-open, allowing a probe call.")
+
+    def is_available(self) -> bool:
+        """ True if a call would be let through right now (does not reserve the probe slot). """
+        self._maybe_half_open()
+        if self.state == STATE_OPEN: return False
+        if self.state == STATE_HALF_OPEN: return not self._probe_in_flight
+        return True
+
+    def before_call(self):
+        """ Reserves permission to call, or raises CircuitOpenError. """
+        if not self.is_available():
+            self.rejected += 1
+            raise CircuitOpenError(f"LLM provider '{self.name}' is unavailable (circuit open).")
+        if self.state == STATE_HALF_OPEN: self._probe_in_flight = True
+
+    def release_probe(self):
+        """ Frees the half-open probe slot when the probe was cancelled without an outcome. """
+        self._probe_in_flight = False
+
+    def record_success(self):
+        if self.state != STATE_CLOSED: logger.info(f"Circuit for '{self.name}' closed after successful probe.")
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != STATE_OPEN: self.times_opened += 1
+            self.state = STATE_OPEN
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+            logger.warning(f"Circuit for '{self.name}' opened after {self.consecutive_failures} consecutive failures; "
+                           f"retrying in {self.reset_timeout}s.")
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._maybe_half_open()
+        return {"provider": self.name, "state": self.state, "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened, "rejected": self.rejected}
+
+
+# --- Breaker Registry (one per provider) ---
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    if provider not in _circuit_breakers:
+        _circuit_breakers[provider] = CircuitBreaker(
+            provider,
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+        )
+    return _circuit_breakers[provider]
+
+def get_circuit_breaker_metrics() -> List[Dict[str, Any]]:
+    return [breaker.snapshot() for breaker in _circuit_breakers.values()]
+
+
+class CircuitBreakerLLMService(LLMService):
+    """
+    Wraps a provider service with a CircuitBreaker. Error replies and exceptions count as failures,
+    except RateLimitQueueTimeout (our own queue is full, the provider is fine); while open, calls
+    raise CircuitOpenError without touching the provider.
+    """
+
+    def __init__(self, inner: LLMService, breaker: Optional[CircuitBreaker] = None):
+        self.inner = inner
+        self.provider = inner.provider
+        self.breaker = breaker or get_circuit_breaker(inner.provider)
+
+    def is_available(self) -> bool:
+        return self.breaker.is_available() and self.inner.is_available()
+
+    async def _call(self, method: str, *args, **kwargs) -> str:
+        self.breaker.before_call()
+        try:
+            reply = await getattr(self.inner, method)(*args, **kwargs)
+        except (asyncio.CancelledError, RateLimitQueueTimeout):
+            self.breaker.release_probe() # e.g. a losing hedge or local saturation; no verdict on provider health
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        if is_error_reply(reply): self.breaker.record_failure()
+        else: self.breaker.record_success()
+        return reply
+
+    async def generate_text(self, prompt: str, **kwargs) -> str:
+        return await self._call("generate_text", prompt, **kwargs)
+
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
+        return await self._call("generate_summary", documents, **kwargs)
+
+    async def close_client(self):
+        if hasattr(self.inner, "close_client"): await self.inner.close_client()
@@ -0,0 +1,202 @@
+# backend/services/llm/fake_service.py
+# Offline stand-in providers for load tests and benchmarks: a synthetic "fake" LLM and a record/replay LLM.
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+from collections import Counter
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional
+
+from .base import LLMService, GenerationOptions, is_error_reply
+from .tasks import resolve_task_profile, TASK_NLU
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NLU_INPUT_PATTERN = re.compile(r'Analyze input: "(.*?)"\n', re.S)
+# Keyword -> (intent, entities builder) used to give NLU prompts a plausible, valid answer
+FAKE_NLU_RULES = (
+    (("how much", "spent this", "spending"), lambda text: ("query_spending", {"time_range": "month"})),
+    (("reminder", "schedule", "meetings"), lambda text: ("get_reminders", {"filter": "week"})),
+    (("summary", "summarize", "recap"), lambda text: ("get_summary", {})),
+    (("?", "what ", "who ", "where ", "why "), lambda text: ("search_information", {"query": text})),
+)
+
+
+# Kwargs that affect scheduling only, not the reply
+SCHEDULING_KWARGS = ("priority",)
+
+
+def call_params(kwargs: Dict[str, Any]) -> str:
+    """ Canonical JSON of the kwargs that shape a reply (task, max_tokens, stop, ...; `options` expanded). """
+    params = {k: v for k, v in kwargs.items() if k not in SCHEDULING_KWARGS and k != "options" and v is not None}
+    options = kwargs.get("options")
+    if isinstance(options, GenerationOptions):
+        params = {**{name: value for name, value in asdict(options).items() if value is not None}, **params}
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str) if params else ""
+
+
+def prompt_hash(method: str, text: str, params: str = "") -> str:
+    """ Stable key for a prompt and its call_params(), used by the replay store. """
+    key = f"{method}\n{text}" + (f"\n{params}" if params else "") # No params: same key as before params were keyed
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class FakeLLMService(LLMService):
+    """
+    Deterministic synthetic LLM. Each call sleeps for a sampled first-token latency plus
+    output_tokens / tokens_per_second, and fails with probability `error_rate`.
+    Replies are derived from the prompt hash; NLU prompts get a well-formed JSON reply. Latency and
+    error draws come from a generator seeded with (seed, prompt hash, n-th call with that prompt),
+    not a shared one, so a concurrent run gets the same draws whatever order calls are scheduled in.
+    """
+    provider = "fake"
+
+    def __init__(self, latency_distribution: str = "lognormal", latency_ms: float = 300.0,
+                 latency_jitter: float = 0.5, tokens_per_second: float = 50.0,
+                 error_rate: float = 0.0, seed: Optional[int] = 42):
+        self.latency_distribution = latency_distribution
+        self.latency_ms = latency_ms
+        self.latency_jitter = latency_jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.model = f"fake-{latency_distribution}"
+        self.seed = seed # None: draws are not reproducible
+        self._seen: Counter = Counter() # Calls per prompt hash, so retries of a prompt get fresh draws
+        self.calls = 0
+        self.errors = 0
+        logger.info(f"Fake LLM configured: {latency_distribution} latency ~{latency_ms}ms, "
+                    f"{tokens_per_second} tok/s, error rate {error_rate}")
+
+    def _draws(self, digest: str) -> random.Random:
+        """ Generator for one call's latency and error draws. """
+        if self.seed is None: return random.Random()
+        n = self._seen[digest]; self._seen[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{n}")
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """ First-token latency in seconds. """
+        if self.latency_distribution == "fixed":
+            ms = self.latency_ms
+        elif self.latency_distribution == "uniform": # latency_ms +/- jitter fraction
+            ms = rng.uniform(self.latency_ms * (1 - self.latency_jitter), self.latency_ms * (1 + self.latency_jitter))
+        else: # lognormal: latency_ms is the median, jitter is sigma (heavy right tail like real APIs)
+            ms = rng.lognormvariate(math.log(max(self.latency_ms, 1e-3)), self.latency_jitter)
+        return max(ms, 0.0) / 1000.0
+
+    def _fake_nlu(self, prompt: str) -> str:
+        match = NLU_INPUT_PATTERN.search(prompt)
+        text = match.group(1) if match else prompt
+        lowered = text.lower()
+        for keywords, build in FAKE_NLU_RULES:
+            if any(keyword in lowered for keyword in keywords):
+                intent, entities = build(text)
+                return json.dumps({"intent": intent, "entities": entities})
+        return json.dumps({"intent": "save_note", "entities": {"content": text}})
+
+    def _reply_for(self, prompt: str, task: Optional[str], max_tokens: int) -> str:
+        digest = prompt_hash("generate_text", prompt)
+        if task == TASK_NLU or prompt.rstrip().endswith("JSON Response:"):
+            return self._fake_nlu(prompt)
+        words = [f"w{digest[i % len(digest)]}{i}" for i in range(max(1, min(max_tokens, 60)))]
+        return f"[fake:{digest[:8]}] " + " ".join(words)
+
+    async def _generate(self, text: str, kwargs: Dict[str, Any]) -> str:
+        self.calls += 1
+        task = kwargs.pop("task", None)
+        _, task_defaults = resolve_task_profile(self.provider, task)
+        options = GenerationOptions.from_kwargs(kwargs, **{"max_tokens": 150, **task_defaults})
+        reply = self._reply_for(text, task, options.max_tokens)
+        rng = self._draws(prompt_hash("generate_text", text))
+        delay = self.sample_latency(rng)
+        failed = self.error_rate > 0 and rng.random() < self.error_rate # Drawn now, not after the sleep
+        if self.tokens_per_second > 0: delay += (len(reply) // 4 + 1) / self.tokens_per_second
+        await asyncio.sleep(delay)
+        if failed:
+            self.errors += 1
+            return "[Error: Fake LLM injected failure]"
+        return reply
+
+    async def generate_text(self, prompt: str, **kwargs) -> str:
+        return await self._generate(prompt, kwargs)
+
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
+        if not documents: return "No documents provided for summarization."
+        return await self._generate("\n\n---\n\n".join(documents), kwargs)
+
+
+class ReplayLLMService(LLMService):
+    """
+    Record/replay provider. In "record" mode calls go to `inner` (a real provider) and successful
+    replies are appended to a JSONL file keyed by the hash of prompt and call_params() (task,
+    max_tokens, stop, temperature, ...). In "replay" mode replies are served
+    from that file; misses fall back to `fallback` (usually a FakeLLMService) or an error reply.
+    """
+    provider = "replay"
+
+    def __init__(self, path: str, mode: str = "replay", inner: Optional[LLMService] = None,
+                 fallback: Optional[LLMService] = None):
+        if mode == "record" and inner is None: raise ValueError("Record mode needs a real provider to record from.")
+        self.path = path
+        self.mode = mode
+        self.inner = inner
+        self.fallback = fallback
+        self.model = f"replay:{os.path.basename(path)}"
+        self.responses: Dict[str, str] = self._load()
+        self.hits = 0
+        self.misses = 0
+        logger.info(f"Replay LLM in '{mode}' mode with {len(self.responses)} stored responses from {path}")
+
+    def _load(self) -> Dict[str, str]:
+        responses = {}
+        if not os.path.exists(self.path): return responses
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip(): continue
+                try: record = json.loads(line); responses[record["key"]] = record["response"]
+                except (json.JSONDecodeError, KeyError): logger.warning(f"Skipping malformed replay record in {self.path}")
+        return responses
+
+    def _store(self, key: str, method: str, text: str, params: str, response: str):
+        self.responses[key] = response
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "method": method, "prompt": text[:200], "params": params, "response": response}) + "\n")
+
+    async def _call(self, method: str, text: str, args, kwargs: Dict[str, Any]) -> str:
+        params = call_params(kwargs)
+        key = prompt_hash(method, text, params)
+        if self.mode == "record":
+            reply = await getattr(self.inner, method)(*args, **kwargs)
+            if reply and not is_error_reply(reply): self._store(key, method, text, params, reply)
+            return reply
+        if key in self.responses:
+            self.hits += 1
+            return self.responses[key]
+        self.misses += 1
+        if self.fallback: return await getattr(self.fallback, method)(*args, **kwargs)
+        return "[Error: No recorded response for this prompt]"
+
+    async def generate_text(self, prompt: str, **kwargs) -> str:
+        return await self._call("generate_text", prompt, (prompt,), kwargs)
+
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
+        return await self._call("generate_summary", "\n\n---\n\n".join(documents or []), (documents,), kwargs)
+
+    async def close_client(self):
+        if self.inner is not None and hasattr(self.inner, "close_client"): await self.inner.close_client()
+
+
+def create_fake_service() -> FakeLLMService:
+    return FakeLLMService(
+        latency_distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+        latency_ms=settings.FAKE_LLM_LATENCY_MS,
+        latency_jitter=settings.FAKE_LLM_LATENCY_JITTER,
+        tokens_per_second=settings.FAKE_LLM_TOKENS_PER_SECOND,
+        error_rate=settings.FAKE_LLM_ERROR_RATE,
+        seed=settings.FAKE_LLM_SEED,
+    )
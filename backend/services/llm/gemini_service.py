@@ -4,7 +4,8 @@ from typing import List, Dict, Any
 import google.generativeai as genai
 import asyncio # For running sync code in async context if needed
 
-from .base import LLMService
+from .base import LLMService, GenerationOptions
+from .tasks import resolve_task_profile
 from backend.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -15,13 +16,31 @@ class GeminiLLMService(LLMService):
     def __init__(self, api_key: str):
         try:
             genai.configure(api_key=api_key)
-            # TODO: Potentially configure model name from settings
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            self.model = genai.GenerativeModel(settings.GOOGLE_MODEL_NAME)
+            self._models = {settings.GOOGLE_MODEL_NAME: self.model} # Per-task models, created on first use
             logger.info(f"Google Generative AI client configured for model: {self.model.model_name}")
         except Exception as e:
             logger.error(f"Failed to configure Google Generative AI: {e}", exc_info=True)
             self.model = None
 
+    def _select_model(self, kwargs: Dict[str, Any]):
+        """ Pops task/model kwargs and returns (GenerativeModel, task generation defaults). """
+        task_model, task_defaults = resolve_task_profile(self.provider, kwargs.pop("task", None))
+        model_name = kwargs.pop("model", None) or task_model
+        if not model_name: return self.model, task_defaults
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(model_name)
+        return self._models[model_name], task_defaults
+
+    def _generation_config(self, options: GenerationOptions) -> Dict[str, Any]:
+        """ Maps GenerationOptions onto Gemini's GenerationConfig fields. """
+        config = {}
+        if options.max_tokens is not None: config["max_output_tokens"] = options.max_tokens
+        if options.temperature is not None: config["temperature"] = options.temperature
+        if options.top_p is not None: config["top_p"] = options.top_p
+        if options.stop: config["stop_sequences"] = options.stop[:5] # API accepts up to 5 sequences
+        return config
+
     def _handle_api_error(self, error: Exception, context: str) -> str:
         logger.error(f"Google Gemini API Error ({context}): {error}", exc_info=True)
         return f"[Error: Google Gemini API request failed. {error}]"
@@ -29,10 +48,12 @@ class GeminiLLMService(LLMService):
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """Generates simple text completion using Gemini (async wrapper)."""
         if not self.model: return "[Error: Google Gemini client not initialized]"
-        logger.info(f"Generating text with Google Gemini model: {self.model.model_name}")
+        model, task_defaults = self._select_model(kwargs)
+        options = GenerationOptions.from_kwargs(kwargs, **{"max_tokens": 150, **task_defaults})
+        logger.debug("Generating text with Google Gemini model: %s", model.model_name)
         try:
             # The core generate_content might be sync, run in threadpool
-            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            response = await asyncio.to_thread(model.generate_content, prompt, generation_config=self._generation_config(options))
             # response = self.model.generate_content(prompt) # If library becomes async native
             if response.parts: return response.text
             elif response.prompt_feedback.block_reason:
@@ -47,10 +68,12 @@ class GeminiLLMService(LLMService):
         if not documents: return "No documents provided for summarization."
         full_text = "\n\n---\n\n".join(documents)
         prompt = f"Summarize the following document(s):\n\n{full_text}\n\nSummary:"
-        logger.info(f"Generating summary with Google Gemini model: {self.model.model_name}")
+        model, task_defaults = self._select_model(kwargs)
+        options = GenerationOptions.from_kwargs(kwargs, **{"max_tokens": 300, **task_defaults})
+        logger.debug("Generating summary with Google Gemini model: %s", model.model_name)
         try:
             # Run sync call in threadpool
-            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            response = await asyncio.to_thread(model.generate_content, prompt, generation_config=self._generation_config(options))
             # response = self.model.generate_content(prompt) # If library becomes async native
             if response.parts: return response.text
             elif response.prompt_feedback.block_reason:
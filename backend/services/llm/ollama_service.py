@@ -3,7 +3,8 @@ import logging
 from typing import List, Dict, Any
 import httpx # Use httpx for async requests
 
-from .base import LLMService
+from .base import LLMService, GenerationOptions
+from .tasks import resolve_task_profile
 from backend.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -40,20 +41,30 @@ class OllamaLLMService(LLMService):
              logger.error(f"Unexpected error during Ollama request: {e}", exc_info=True)
              raise
 
-    # NOTE: Ollama service methods need to be async if using httpx.AsyncClient
-    async def generate_text(self, prompt: str, model: str = None, **kwargs) -> str:
-        """Generates simple text completion using Ollama."""
-        selected_model = model or self.model
-        logger.info(f"Generating text with Ollama model: {selected_model}")
+    def _build_payload(self, prompt: str, model: str, options: GenerationOptions) -> Dict:
+        """ Maps GenerationOptions onto Ollama's /api/generate fields. """
+        native_options = {"temperature": options.temperature}
+        if options.max_tokens is not None: native_options["num_predict"] = options.max_tokens
+        if options.top_p is not None: native_options["top_p"] = options.top_p
+        if options.stop: native_options["stop"] = options.stop
         payload = {
-            "model": selected_model,
+            "model": model,
             "prompt": prompt,
             "stream": False, # Get full response at once
-            "options": { # Optional parameters
-                "temperature": 0.7,
-                # "num_predict": 150 # Equivalent to max_tokens, adjust as needed
-            }
+            "options": native_options,
         }
+        keep_alive = options.keep_alive or settings.OLLAMA_KEEP_ALIVE
+        if keep_alive: payload["keep_alive"] = keep_alive # Keep model loaded between calls
+        return payload
+
+    # NOTE: Ollama service methods need to be async if using httpx.AsyncClient
+    async def generate_text(self, prompt: str, model: str = None, **kwargs) -> str:
+        """Generates simple text completion using Ollama."""
+        task_model, task_defaults = resolve_task_profile(self.provider, kwargs.pop("task", None))
+        selected_model = model or task_model or self.model
+        options = GenerationOptions.from_kwargs(kwargs, **{"max_tokens": 150, "temperature": 0.7, **task_defaults})
+        logger.debug("Generating text with Ollama model: %s", selected_model)
+        payload = self._build_payload(prompt, selected_model, options)
         try:
             response_data = await self._make_request("/api/generate", payload)
             return response_data.get("response", "").strip()
@@ -68,21 +79,15 @@ class OllamaLLMService(LLMService):
         """Generates a summary from documents using Ollama."""
         if not documents: return "No documents provided for summarization."
 
-        selected_model = model or self.model
+        task_model, task_defaults = resolve_task_profile(self.provider, kwargs.pop("task", None))
+        selected_model = model or task_model or self.model
         full_text = "\n\n---\n\n".join(documents)
         # Simple summary prompt
         prompt = f"Please provide a concise summary of the following document(s):\n\n{full_text}\n\nSummary:"
 
-        logger.info(f"Generating summary with Ollama model: {selected_model}")
-        payload = {
-            "model": selected_model,
-            "prompt": prompt,
-            "stream": False,
-             "options": {
-                "temperature": 0.5,
-                # "num_predict": 300 # Limit summary length
-            }
-        }
+        options = GenerationOptions.from_kwargs(kwargs, **{"max_tokens": 300, "temperature": 0.5, **task_defaults})
+        logger.debug("Generating summary with Ollama model: %s", selected_model)
+        payload = self._build_payload(prompt, selected_model, options)
         try:
             response_data = await self._make_request("/api/generate", payload)
             return response_data.get("response", "").strip()
@@ -4,7 +4,8 @@ from typing import List, Dict, Any
 from openai import OpenAI, APIError, RateLimitError, AsyncOpenAI # Import Async client
 import asyncio # For potential sync calls in async context
 
-from .base import LLMService
+from .base import LLMService, GenerationOptions
+from .tasks import resolve_task_profile
 from backend.core.config import settings # Import settings to get model name
 
 logger = logging.getLogger(__name__)
@@ -22,24 +23,32 @@ class OpenAILLMService(LLMService):
             logger.error(f"Failed to initialize OpenAI client: {e}", exc_info=True)
             self.async_client = None
 
+    def _native_options(self, options: GenerationOptions) -> Dict[str, Any]:
+        """ Maps GenerationOptions onto chat.completions.create arguments. """
+        native = {"max_tokens": options.max_tokens}
+        if options.temperature is not None: native["temperature"] = options.temperature
+        if options.top_p is not None: native["top_p"] = options.top_p
+        if options.stop: native["stop"] = options.stop[:4] # API accepts up to 4 sequences
+        return native
+
     def _handle_api_error(self, error: APIError, context: str) -> str:
         logger.error(f"OpenAI API Error ({context}): Status={error.status_code} Message={error.message}", exc_info=True)
         if isinstance(error, RateLimitError): return f"[Error: OpenAI rate limit exceeded.]"
         return f"[Error: OpenAI API request failed. {error.message}]"
 
-    async def generate_text(self, prompt: str, max_tokens: int = 150, **kwargs) -> str:
+    async def generate_text(self, prompt: str, **kwargs) -> str:
         """Generates simple text completion using OpenAI (async)."""
         if not self.async_client: return "[Error: OpenAI client not initialized]"
-        # Use configured model name
-        model_name = settings.OPENAI_MODEL_NAME
-        logger.info(f"Generating text with OpenAI model: {model_name}")
+        # Explicit model > task profile model > configured default
+        task_model, task_defaults = resolve_task_profile(self.provider, kwargs.pop("task", None))
+        model_name = kwargs.pop("model", None) or task_model or settings.OPENAI_MODEL_NAME
+        options = GenerationOptions.from_kwargs(kwargs, **{"max_tokens": 150, **task_defaults})
+        logger.debug("Generating text with OpenAI model: %s", model_name)
         try:
             response = await self.async_client.chat.completions.create(
                 model=model_name,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                #temperature=0.7,
-                **kwargs
+                **self._native_options(options)
             )
             if response.choices and response.choices[0].message:
                  return response.choices[0].message.content.strip()
@@ -51,24 +60,24 @@ class OpenAILLMService(LLMService):
             logger.error(f"Unexpected error during OpenAI text generation: {e}", exc_info=True)
             return "[Error: An unexpected error occurred during text generation]"
 
-    async def generate_summary(self, documents: List[str], max_tokens: int = 300, **kwargs) -> str:
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
         """Generates a summary from documents using OpenAI (async)."""
         if not self.async_client: return "[Error: OpenAI client not initialized]"
         if not documents: return "No documents provided for summarization."
+        task_model, task_defaults = resolve_task_profile(self.provider, kwargs.pop("task", None))
+        options = GenerationOptions.from_kwargs(kwargs, **{"max_tokens": 300, **task_defaults})
 
         # Use configured model name (preferring models good at summaries like gpt-4o)
-        model_name = settings.OPENAI_MODEL_NAME
+        model_name = kwargs.pop("model", None) or task_model or settings.OPENAI_MODEL_NAME
         full_text = "\n\n---\n\n".join(documents)
         # TODO: Add check for token length and potentially chunk text if needed
         prompt = f"Please summarize the key points from the following document(s):\n\n{full_text}\n\nSummary:"
-        logger.info(f"Generating summary with OpenAI model: {model_name}")
+        logger.debug("Generating summary with OpenAI model: %s", model_name)
         try:
             response = await self.async_client.chat.completions.create(
                 model=model_name,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-               # temperature=0.5,
-                **kwargs
+                **self._native_options(options)
             )
             if response.choices and response.choices[0].message:
                  return response.choices[0].message.content.strip()
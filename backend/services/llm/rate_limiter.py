@@ -0,0 +1,266 @@
+# backend/services/llm/rate_limiter.py
+# Per-provider token-bucket rate limiting with a priority admission queue. Each provider gets one
+# shared limiter with a requests/minute and a tokens/minute bucket (tokens estimated at ~4 chars
+# plus the completion budget), so bursts queue here instead of coming back as provider 429s.
+# Interactive calls (NLU, chat, RAG answers) are admitted before background work such as summaries.
+# A call that waits longer than LLM_QUEUE_MAX_WAIT_SECONDS raises RateLimitQueueTimeout rather than
+# waiting on, which bounds user-facing latency under overload.
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Any
+
+from .base import LLMService, is_error_reply
+from .tasks import resolve_task_profile
+from backend.core.config import settings
+from backend.core import metrics
+
+logger = logging.getLogger(__name__)
+
+LLM_LATENCY = metrics.histogram("llm_request_duration_seconds", "Upstream LLM call latency after admission.", ("provider", "task", "outcome"))
+LLM_TOKENS = metrics.counter("llm_tokens_total", "Estimated LLM tokens (~4 chars per token).", ("provider", "task", "kind"))
+LLM_QUEUE_WAIT = metrics.histogram("llm_queue_wait_seconds", "Time LLM calls waited for rate limit capacity.", ("provider",))
+
+# --- Priorities (lower value = served first) ---
+PRIORITY_INTERACTIVE = 0 # User is waiting on the reply (NLU, chat, QA)
+PRIORITY_DEFAULT = 5
+PRIORITY_BACKGROUND = 10 # Summaries and other deferrable work
+
+
+def estimate_tokens(text: str, max_tokens: Optional[int] = None) -> int:
+    """ Rough token estimate (~4 chars per token) plus the requested completion budget. """
+    prompt_tokens = len(text or "") // 4 + 1
+    return prompt_tokens + (max_tokens or 0)
+
+
+class RateLimitQueueTimeout(Exception):
+    """
+    Raised when a request waits in the admission queue longer than allowed. Local saturation, not a
+    provider failure: the circuit breaker and router don't count it, and the public (single-flight)
+    service turns it into BUSY_REPLY.
+    """
+    pass
+
+BUSY_REPLY = "[Error: {provider} is busy, please try again shortly.]"
+
+
+class TokenBucket:
+    """ Classic token bucket refilled continuously at `rate_per_minute`. """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_second)
+            self.updated_at = now
+
+    def time_until_available(self, amount: float, now: Optional[float] = None) -> float:
+        """ Seconds until `amount` tokens can be taken (0.0 if available now). """
+        now = now if now is not None else time.monotonic()
+        self._refill(now)
+        amount = min(amount, self.capacity) # Oversized requests only need a full bucket
+        if self.tokens >= amount: return 0.0
+        return (amount - self.tokens) / self.rate_per_second
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class ProviderRateLimiter:
+    """
+    Admission control for a single LLM provider.
+    Requests must fit both the requests-per-minute and tokens-per-minute buckets.
+    When they don't, callers wait in a priority queue drained by a single task,
+    so bursts are smoothed out instead of hitting provider 429s.
+    A limit of 0 (or less) disables that bucket.
+    """
+
+    def __init__(self, provider: str, requests_per_minute: int = 0, tokens_per_minute: int = 0,
+                 max_queue_wait: float = 30.0):
+        self.provider = provider
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_queue_wait = max_queue_wait
+        self._waiters: List = [] # heap of (priority, seq, tokens, future)
+        self._seq = itertools.count()
+        self._drain_task: Optional[asyncio.Task] = None
+        # Metrics
+        self.admitted = 0
+        self.queued = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._recent_waits = deque(maxlen=500)
+
+    @property
+    def enabled(self) -> bool:
+        return self.request_bucket is not None or self.token_bucket is not None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    def _wait_time(self, tokens: int) -> float:
+        now = time.monotonic()
+        wait = 0.0
+        if self.request_bucket: wait = max(wait, self.request_bucket.time_until_available(1, now))
+        if self.token_bucket: wait = max(wait, self.token_bucket.time_until_available(tokens, now))
+        return wait
+
+    def _consume(self, tokens: int):
+        if self.request_bucket: self.request_bucket.consume(1)
+        if self.token_bucket: self.token_bucket.consume(tokens)
+
+    def _record_wait(self, waited: float):
+        self.admitted += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self._recent_waits.append(waited)
+
+    async def acquire(self, tokens: int = 1, priority: int = PRIORITY_DEFAULT) -> float:
+        """ Waits until the request may be sent. Returns seconds spent queued. """
+        if not self.enabled:
+            self._record_wait(0.0)
+            return 0.0
+        # Fast path: nobody queued ahead of us and capacity is available
+        if not self._waiters and self._wait_time(tokens) == 0.0:
+            self._consume(tokens)
+            self._record_wait(0.0)
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self.queued += 1
+        self._ensure_drain_task(loop)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout=self.max_queue_wait if self.max_queue_wait > 0 else None)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"LLM request for '{self.provider}' timed out after {self.max_queue_wait}s in rate limit queue.")
+            raise RateLimitQueueTimeout(f"{self.provider} rate limit queue wait exceeded {self.max_queue_wait}s")
+        waited = time.monotonic() - started
+        self._record_wait(waited)
+        if waited > 1.0:
+            logger.debug("LLM request for '%s' queued %.2fs (priority %s).", self.provider, waited, priority)
+        return waited
+
+    def _ensure_drain_task(self, loop: asyncio.AbstractEventLoop):
+        if self._drain_task is None or self._drain_task.done() or self._drain_task.get_loop() is not loop:
+            self._drain_task = loop.create_task(self._drain())
+
+    async def _drain(self):
+        """ Releases queued requests in priority order as bucket capacity frees up. """
+        while self._waiters:
+            priority, seq, tokens, future = self._waiters[0]
+            if future.done(): # Timed out or cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            heapq.heappop(self._waiters)
+            self._consume(tokens)
+            future.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ Queue-time metrics for logging/monitoring. """
+        waits = sorted(self._recent_waits)
+        def pct(p: float) -> float:
+            return waits[min(len(waits) - 1, int(p * len(waits)))] if waits else 0.0
+        return {
+            "provider": self.provider,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "timeouts": self.timeouts,
+            "queue_depth": self.queue_depth,
+            "avg_wait_seconds": (self.total_wait_seconds / self.admitted) if self.admitted else 0.0,
+            "p95_wait_seconds": pct(0.95),
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+# --- Limiter Registry (one per provider, shared across service instances) ---
+_rate_limiters: Dict[str, ProviderRateLimiter] = {}
+
+PROVIDER_LIMIT_SETTINGS = {
+    "openai": ("OPENAI_REQUESTS_PER_MINUTE", "OPENAI_TOKENS_PER_MINUTE"),
+    "gemini": ("GEMINI_REQUESTS_PER_MINUTE", "GEMINI_TOKENS_PER_MINUTE"),
+    "ollama": ("OLLAMA_REQUESTS_PER_MINUTE", "OLLAMA_TOKENS_PER_MINUTE"),
+}
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """ Returns the shared limiter for a provider, creating it from settings on first use. """
+    limiter = _rate_limiters.get(provider)
+    if limiter is None:
+        rpm_name, tpm_name = PROVIDER_LIMIT_SETTINGS.get(provider, (None, None))
+        limiter = ProviderRateLimiter(
+            provider,
+            requests_per_minute=getattr(settings, rpm_name, 0) if rpm_name else 0,
+            tokens_per_minute=getattr(settings, tpm_name, 0) if tpm_name else 0,
+            max_queue_wait=settings.LLM_QUEUE_MAX_WAIT_SECONDS,
+        )
+        _rate_limiters[provider] = limiter
+    return limiter
+
+def get_rate_limiter_metrics() -> List[Dict[str, Any]]:
+    return [limiter.snapshot() for limiter in _rate_limiters.values()]
+
+
+class RateLimitedLLMService(LLMService):
+    """
+    Wraps a provider service so every call passes through that provider's limiter.
+    Accepts an extra `priority` kwarg (see PRIORITY_* constants) which is not forwarded.
+    """
+
+    def __init__(self, inner: LLMService, limiter: Optional[ProviderRateLimiter] = None):
+        self.inner = inner
+        self.provider = inner.provider
+        self.limiter = limiter or get_rate_limiter(inner.provider)
+
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+
+    async def _admit(self, text: str, kwargs: Dict) -> None:
+        """ Waits for capacity; raises RateLimitQueueTimeout when the queue wait runs out. """
+        priority = kwargs.pop("priority", PRIORITY_DEFAULT)
+        max_tokens = kwargs.get("max_tokens") or resolve_task_profile(self.provider, kwargs.get("task"))[1].get("max_tokens")
+        waited = await self.limiter.acquire(estimate_tokens(text, max_tokens), priority=priority)
+        LLM_QUEUE_WAIT.observe(waited, provider=self.provider)
+
+    async def _call(self, method: str, text: str, args: tuple, kwargs: Dict) -> str:
+        task = kwargs.get("task") or "default"
+        try:
+            await self._admit(text, kwargs)
+        except RateLimitQueueTimeout:
+            LLM_LATENCY.observe(0.0, provider=self.provider, task=task, outcome="queue_timeout")
+            raise
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            reply = await getattr(self.inner, method)(*args, **kwargs)
+            outcome = "error" if is_error_reply(reply) else "ok"
+            LLM_TOKENS.inc(estimate_tokens(text), provider=self.provider, task=task, kind="prompt")
+            LLM_TOKENS.inc(estimate_tokens(reply), provider=self.provider, task=task, kind="completion")
+            return reply
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - started, provider=self.provider, task=task, outcome=outcome)
+
+    async def generate_text(self, prompt: str, **kwargs) -> str:
+        return await self._call("generate_text", prompt, (prompt,), kwargs)
+
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
+        return await self._call("generate_summary", "".join(documents or []), (documents,), kwargs)
+
+    async def close_client(self):
+        if hasattr(self.inner, "close_client"): await self.inner.close_client()
@@ -0,0 +1,160 @@
+# backend/services/llm/router.py
+# Routes LLM calls across all configured providers based on observed latency and errors.
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
+
+from .base import LLMService, is_error_reply
+from .circuit_breaker import CircuitOpenError
+from .rate_limiter import RateLimitQueueTimeout
+
+logger = logging.getLogger(__name__)
+
+MIN_SAMPLES = 3 # Calls needed before a provider's latency is trusted for ranking
+ERROR_PENALTY_SECONDS = 30.0 # Added to the score per unit of error rate
+
+
+class ProviderStats:
+    """ Rolling latency and error window for a single provider. """
+
+    def __init__(self, window: int = 100):
+        self.latencies = deque(maxlen=window) # Successful call latencies (seconds)
+        self.outcomes = deque(maxlen=window) # True = success, False = error
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, latency: float, ok: bool):
+        self.calls += 1
+        self.outcomes.append(ok)
+        if ok: self.latencies.append(latency)
+        else: self.errors += 1
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies: return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    @property
+    def p50(self) -> float: return self.percentile(0.50)
+
+    @property
+    def p95(self) -> float: return self.percentile(0.95)
+
+    @property
+    def error_rate(self) -> float:
+        return (self.outcomes.count(False) / len(self.outcomes)) if self.outcomes else 0.0
+
+    def score(self) -> float:
+        """ Lower is better. Providers without enough samples score 0 so they get explored. """
+        if len(self.outcomes) < MIN_SAMPLES: return 0.0
+        return self.p95 + self.error_rate * ERROR_PENALTY_SECONDS
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "errors": self.errors, "p50_seconds": self.p50,
+                "p95_seconds": self.p95, "error_rate": self.error_rate}
+
+
+class LLMRouter(LLMService):
+    """
+    LLMService that holds one service per configured provider and sends each call
+    to the best-ranked one (rolling p95 latency + error penalty).
+    On an error reply or exception it fails over to the next provider.
+    Providers whose circuit is open are skipped; if none are available CircuitOpenError is raised.
+    If `hedge_after` > 0 and the primary hasn't answered by then, the next provider
+    is raced against it and the first successful reply wins.
+    """
+    provider = "router"
+
+    def __init__(self, services: Dict[str, LLMService], default_provider: Optional[str] = None,
+                 hedge_after: float = 0.0):
+        if not services: raise ValueError("LLMRouter needs at least one provider service.")
+        self.services = services
+        self.default_provider = default_provider
+        self.hedge_after = hedge_after
+        self.stats: Dict[str, ProviderStats] = {name: ProviderStats() for name in services}
+        self.hedges = 0
+        self.failovers = 0
+        logger.info(f"LLM router initialized with providers: {list(services)} (hedge after: {hedge_after or 'disabled'})")
+
+    def is_available(self) -> bool:
+        return any(service.is_available() for service in self.services.values())
+
+    def ranked_providers(self) -> List[str]:
+        """ Providers ordered best first; ties go to the default provider, then config order. """
+        order = list(self.services)
+        return sorted(order, key=lambda name: (self.stats[name].score(), name != self.default_provider, order.index(name)))
+
+    async def _timed_call(self, name: str, method: str, args: Tuple, kwargs: Dict) -> Tuple[bool, str]:
+        started = time.monotonic()
+        try:
+            reply = await getattr(self.services[name], method)(*args, **kwargs)
+            ok = not is_error_reply(reply)
+        except asyncio.CancelledError:
+            raise # Losing hedge, don't count it
+        except (CircuitOpenError, RateLimitQueueTimeout):
+            raise # Opened since ranking / our queue is full; not a latency/error sample
+        except Exception as e:
+            logger.error(f"LLM provider '{name}' raised during {method}: {e}", exc_info=True)
+            reply, ok = f"[Error: {name} request failed. {e}]", False
+        self.stats[name].record(time.monotonic() - started, ok)
+        if not ok: logger.warning(f"LLM provider '{name}' failed {method}: {reply[:200]}")
+        return ok, reply
+
+    async def _dispatch(self, method: str, args: Tuple, kwargs: Dict) -> str:
+        candidates = [name for name in self.ranked_providers() if self.services[name].is_available()]
+        if not candidates: raise CircuitOpenError("No LLM provider is currently available (all circuits open).")
+        pending: Dict[asyncio.Task, str] = {}
+        next_index = 0
+        hedged = False
+        rejected = 0 # Candidates whose circuit opened before they could be called
+        busy = 0 # Candidates whose rate limit queue timed out
+        last_reply = "[Error: No LLM provider available]"
+
+        def launch():
+            nonlocal next_index
+            name = candidates[next_index]; next_index += 1
+            task = asyncio.ensure_future(self._timed_call(name, method, args, dict(kwargs)))
+            pending[task] = name
+
+        launch()
+        try:
+            while pending:
+                can_hedge = self.hedge_after > 0 and not hedged and next_index < len(candidates)
+                done, _ = await asyncio.wait(pending, timeout=self.hedge_after if can_hedge else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done: # Primary is slow, race the next provider against it
+                    hedged = True; self.hedges += 1
+                    logger.info(f"Hedging slow '{list(pending.values())[0]}' call with '{candidates[next_index]}'.")
+                    launch()
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    try: ok, reply = task.result()
+                    except CircuitOpenError as e: ok, reply = False, f"[Error: {e}]"; rejected += 1
+                    except RateLimitQueueTimeout as e: ok, reply = False, f"[Error: {e}]"; busy += 1
+                    if ok: return reply
+                    last_reply = reply
+                if not pending and next_index < len(candidates): # Fail over
+                    self.failovers += 1
+                    launch()
+            if rejected == next_index: raise CircuitOpenError("No LLM provider is currently available (all circuits open).")
+            if rejected + busy == next_index: raise RateLimitQueueTimeout("Every available LLM provider's rate limit queue is full")
+            return last_reply
+        finally:
+            for task in pending: task.cancel()
+
+    async def generate_text(self, prompt: str, **kwargs) -> str:
+        return await self._dispatch("generate_text", (prompt,), kwargs)
+
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
+        return await self._dispatch("generate_summary", (documents,), kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"ranking": self.ranked_providers(), "hedges": self.hedges, "failovers": self.failovers,
+                "providers": {name: stats.snapshot() for name, stats in self.stats.items()}}
+
+    async def close_client(self):
+        for service in self.services.values():
+            if hasattr(service, "close_client"): await service.close_client()
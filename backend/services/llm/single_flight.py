@@ -0,0 +1,73 @@
+# backend/services/llm/single_flight.py
+# Coalesces identical concurrent LLM calls into a single upstream request. It wraps the services
+# get_llm_service() hands out, outside the rate limiter and breaker, so a burst of identical prompts
+# (e.g. many users asking for the same summary) costs one admission and one provider call.
+# Nothing is cached after a call completes, so results are never stale. This is deliberately not a
+# response cache.
+import asyncio
+import logging
+from typing import Dict, List, Any, Tuple
+
+from .base import LLMService
+from .rate_limiter import RateLimitQueueTimeout, BUSY_REPLY
+from backend.core.timing import stage_timer
+
+logger = logging.getLogger(__name__)
+
+# Kwargs that affect scheduling only, not the generated output
+NON_KEY_KWARGS = ("priority",)
+
+
+class SingleFlightLLMService(LLMService):
+    """
+    Wraps an LLMService so concurrent calls with the same provider, prompt and parameters share one
+    in-flight upstream request and its result. The model isn't looked up on the wrapped service: it
+    is chosen below this layer from the `task` profile (tasks.py) or an explicit `model` kwarg, and
+    both are part of the parameters.
+    The upstream call runs as its own task, so a caller disconnecting doesn't cancel it for the others.
+    Nothing is cached once the call completes. As the public service, it turns RateLimitQueueTimeout
+    into the "busy" error reply callers handle like any other.
+    """
+
+    def __init__(self, inner: LLMService):
+        self.inner = inner
+        self.provider = inner.provider
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        # Counters
+        self.leaders = 0 # Calls that went upstream
+        self.coalesced = 0 # Calls that joined an in-flight request
+
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+
+    def _key(self, method: str, payload: Any, kwargs: Dict) -> Tuple:
+        params = repr(sorted((k, v) for k, v in kwargs.items() if k not in NON_KEY_KWARGS)) # Includes task / model
+        return (method, self.provider, payload, params)
+
+    async def _call(self, method: str, payload: Any, args: Tuple, kwargs: Dict) -> str:
+        key = self._key(method, payload, kwargs)
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug("Coalesced identical in-flight %s call for provider '%s'.", method, self.provider)
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(getattr(self.inner, method)(*args, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        with stage_timer("llm"): # Callers' view of LLM time, incl. queueing
+            try: return await asyncio.shield(task)
+            except RateLimitQueueTimeout: return BUSY_REPLY.format(provider=self.provider) # Outermost layer: reply as before
+
+    async def generate_text(self, prompt: str, **kwargs) -> str:
+        return await self._call("generate_text", prompt, (prompt,), kwargs)
+
+    async def generate_summary(self, documents: List[str], **kwargs) -> str:
+        return await self._call("generate_summary", tuple(documents or ()), (documents,), kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"provider": self.provider, "leaders": self.leaders, "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight)}
+
+    async def close_client(self):
+        if hasattr(self.inner, "close_client"): await self.inner.close_client()
@@ -0,0 +1,28 @@
+# backend/services/llm/tasks.py
+# Task tags let callers say *what* a call is for; each provider resolves the tag to a model and defaults.
+from typing import Dict, Any, Optional, Tuple
+
+from backend.core.config import settings
+
+TASK_NLU = "nlu" # Short JSON intent/entity extraction
+TASK_CHAT = "chat" # Conversational fallback
+TASK_SUMMARY = "summary" # Daily / note / spending / search summaries
+TASK_RAG_ANSWER = "rag_answer" # Question answering over retrieved notes
+
+VALID_TASKS = (TASK_NLU, TASK_CHAT, TASK_SUMMARY, TASK_RAG_ANSWER)
+
+# Profile keys that are generation defaults (everything except the per-provider model names)
+GENERATION_KEYS = ("max_tokens", "temperature", "top_p", "stop")
+
+
+def resolve_task_profile(provider: str, task: Optional[str]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Looks up settings.LLM_TASK_PROFILES[task] and returns (model for this provider or None, generation defaults).
+    A profile looks like {"models": {"openai": "gpt-4o-mini"}, "max_tokens": 300, "temperature": 0.1}.
+    Unknown/missing tasks resolve to (None, {}) so the service's own defaults apply.
+    """
+    if not task: return None, {}
+    profile = settings.LLM_TASK_PROFILES.get(task) or {}
+    model = (profile.get("models") or {}).get(provider)
+    defaults = {key: profile[key] for key in GENERATION_KEYS if profile.get(key) is not None}
+    return model, defaults
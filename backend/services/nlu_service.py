@@ -5,23 +5,15 @@ from typing import Dict, Any, List
 import json
 import re
 import datetime
-from datetime import timezone, date 
+from datetime import date
 from collections import defaultdict
 
-try:
-    import dateutil.parser
-    from dateutil.relativedelta import relativedelta
-    DATEUTIL_AVAILABLE = True
-except ImportError:
-    DATEUTIL_AVAILABLE = False
-    logging.warning("python-dateutil not installed. Date parsing disabled.")
-
-
-from backend.services.llm import get_llm_service
+from backend.services.llm import get_llm_service, is_llm_available, PRIORITY_INTERACTIVE, TASK_NLU
+from backend.services.temporal_service import parse_time_expression # Fast-path temporal parsing (dateutil fallback)
 from backend.core.config import logger
+from backend.core.timing import stage_timer, timed_stage
 
-logger = logging.getLogger("aura_backend.nlu")
-logger.setLevel(logging.DEBUG) # Ensure debug level is set
+logger = logging.getLogger("aura_backend.nlu") # Level comes from LOG_LEVEL; per-call logs below are DEBUG with lazy args
 
 # === Intent Taxonomy ===
 VALID_INTENTS = [
@@ -164,62 +156,6 @@ Respond ONLY with JSON object: {{"intent": "...", "entities": {{...}}}}
 {LLM_EXAMPLES}
 JSON Response:"""
 
-# === Advanced Time Parsing ===
-def parse_time_expression(text: str) -> Dict[str, Any]:
-    """Enhanced time parsing with relative expressions and fallbacks"""
-    parsed = {"date": None, "time": None, "datetime": None}
-    if not text: return parsed
-    now = datetime.datetime.now(timezone.utc)
-
-    if DATEUTIL_AVAILABLE:
-        try:
-            # Use fuzzy parsing which is good at finding dates/times within text
-            dt = dateutil.parser.parse(text, fuzzy=True, default=now)
-            # Ensure timezone aware (UTC)
-            if dt.tzinfo is None: dt = dt.replace(tzinfo=timezone.utc)
-            else: dt = dt.astimezone(timezone.utc)
-            parsed.update({
-                "date": dt.date().isoformat(),
-                "time": dt.time().isoformat(timespec='seconds'), # Include seconds
-                "datetime": dt.isoformat(timespec='seconds') # ISO format with seconds
-            })
-            logger.debug(f"dateutil parsed '{text}' into: {parsed}")
-            return parsed
-        except (ValueError, OverflowError, TypeError) as e:
-             logger.warning(f"dateutil failed for '{text}': {e}")
-             # Don't return here, let regex try below if dateutil fails
-
-    # Fallback relative time parsing (if dateutil failed or not available)
-    relative_match = re.search(r'in\s+(\d+)\s+(hour|day|week)s?', text, re.I)
-    if relative_match:
-        num, unit = relative_match.groups()
-        delta = relativedelta(**{f"{unit}s": int(num)})
-        future = now + delta
-        parsed["datetime"] = future.isoformat(timespec='seconds')
-        parsed["date"] = future.date().isoformat()
-        parsed["time"] = future.time().isoformat(timespec='seconds')
-        logger.debug(f"Relative time parsed '{text}' into: {parsed}")
-
-    # Add more specific regex or keyword checks if needed (e.g., for 'tomorrow')
-    elif 'tomorrow' in text.lower():
-        tomorrow_date = (now + relativedelta(days=1)).date()
-        parsed["date"] = tomorrow_date.isoformat()
-        # Try to find time mentioned alongside tomorrow
-        time_match = TIME_RELATED.search(text)
-        if time_match and DATEUTIL_AVAILABLE:
-             try:
-                 # Parse just the time part with today's date as default, then add a day
-                 time_only_dt = dateutil.parser.parse(time_match.group(0), default=now)
-                 final_dt = datetime.datetime.combine(tomorrow_date, time_only_dt.time(), tzinfo=timezone.utc)
-                 parsed["datetime"] = final_dt.isoformat(timespec='seconds')
-                 parsed["time"] = final_dt.time().isoformat(timespec='seconds')
-             except Exception as e:
-                 logger.warning(f"Could not parse time with 'tomorrow': {e}")
-        logger.debug(f"Parsed 'tomorrow' in '{text}' into: {parsed}")
-
-
-    return parsed
-
 # === Enhanced Rule-Based Processing ===
 def rule_based_processing(text: str) -> Dict[str, Any]:
     """Advanced pattern matching with context awareness"""
@@ -243,14 +179,14 @@ def rule_based_processing(text: str) -> Dict[str, Any]:
             # --- End Fix ---
             match = compiled_pattern.search(text)
             if match:
-                logger.debug(f"Regex pattern matched for intent '{intent_key}'")
+                logger.debug("Regex pattern matched for intent '%s'", intent_key)
                 result["intent"] = intent_key
                 result["entities"] = extract_entities(intent_key, match.groups(), text)
                 if validate_entities(intent_key, result["entities"]):
-                    logger.debug(f"--> RULE Matched & Validated: {result['intent']}")
+                    logger.debug("--> RULE Matched & Validated: %s", result['intent'])
                     return result # Return first valid match
                 else:
-                    logger.warning(f"Rule matched '{intent_key}' but entities failed validation: {result['entities']}")
+                    logger.warning("Rule matched '%s' but entities failed validation: %s", intent_key, result['entities'])
                     result["intent"] = "unknown" # Reset if invalid entities
 
 
@@ -261,7 +197,7 @@ def rule_based_processing(text: str) -> Dict[str, Any]:
             result["entities"] = parse_time_expression(text)
             result["entities"]["subject"] = text # Default subject
             if validate_entities(result["intent"], result["entities"]):
-                 logger.debug(f"--> RULE Matched intent (specialized): {result['intent']}")
+                 logger.debug("--> RULE Matched intent (specialized): %s", result['intent'])
                  return result
             else: result["intent"] = "unknown"
 
@@ -272,7 +208,7 @@ def extract_entities(intent: str, match_groups: tuple, original_text: str) -> Di
     """Entity extraction based on intent patterns, includes time parsing"""
     entities = {}
     if not match_groups: return entities
-    logger.debug(f"Extracting entities for intent '{intent}' from groups: {match_groups}")
+    logger.debug("Extracting entities for intent '%s' from groups: %s", intent, match_groups)
     try:
         if intent == "log_spending":
             # Determine pattern match based on group content
@@ -309,7 +245,7 @@ def extract_entities(intent: str, match_groups: tuple, original_text: str) -> Di
     except Exception as e: logger.error(f"Unexpected error during entity extraction: {e}", exc_info=True)
 
     entities["raw_text"] = original_text # Always include raw text
-    logger.debug(f"Extracted Entities: {entities}")
+    logger.debug("Extracted Entities: %s", entities)
     return entities
 # --- End Entity Extraction ---
 
@@ -318,7 +254,7 @@ def validate_entities(intent: str, entities: Dict) -> bool:
     rules = ENTITY_VALIDATION.get(intent, {})
     for field in rules.get("required", []):
         if field not in entities or entities.get(field) is None: # Check for None as well
-            logger.debug(f"Validation failed for {intent}: Missing required entity '{field}'")
+            logger.debug("Validation failed for %s: Missing required entity '%s'", intent, field)
             return False
     for field, types in rules.get("types", {}).items():
         # Allow optional fields to be missing
@@ -326,41 +262,46 @@ def validate_entities(intent: str, entities: Dict) -> bool:
              # Handle Union types if specified in rules (e.g., (str, datetime.datetime))
              if isinstance(types, tuple):
                  if not isinstance(entities.get(field), types):
-                     logger.debug(f"Validation failed for {intent}: Entity '{field}' type {type(entities.get(field))} not in {types}")
+                     logger.debug("Validation failed for %s: Entity '%s' type %s not in %s", intent, field, type(entities.get(field)), types)
                      return False
              # Handle single type
              elif not isinstance(entities.get(field), types):
-                 logger.debug(f"Validation failed for {intent}: Entity '{field}' type {type(entities.get(field))}, expected {types}")
+                 logger.debug("Validation failed for %s: Entity '%s' type %s, expected %s", intent, field, type(entities.get(field)), types)
                  return False
-    logger.debug(f"Entity validation passed for intent '{intent}'")
+    logger.debug("Entity validation passed for intent '%s'", intent)
     return True
 
+@timed_stage("nlu")
 async def get_nlu_results_hybrid(text: str, user_context: Dict = None) -> Dict[str, Any]:
     """Advanced hybrid processing with validation and context awareness"""
-    logger.debug(f"Processing: '{text}'")
-    rule_result = rule_based_processing(text) # Try rules first
+    logger.debug("Processing: '%s'", text)
+    with stage_timer("nlu_rules"): rule_result = rule_based_processing(text) # Try rules first
 
     if rule_result["intent"] != "unknown":
-        logger.info(f"Rule-based match successful: {rule_result}")
+        logger.debug("Rule-based match successful: %s", rule_result)
         return rule_result # Return if rule matched and validated
 
-    # If rules failed or didn't match, fall back to LLM
-    logger.info(f"No valid rule match. Falling back to LLM NLU: '{text}'")
-    llm_result = await get_intent_and_entities_from_llm(text)
+    # If rules failed or didn't match, fall back to LLM (skipped while its circuit is open)
+    if is_llm_available():
+        logger.debug("No valid rule match. Falling back to LLM NLU: '%s'", text)
+        llm_result = await get_intent_and_entities_from_llm(text)
+    else:
+        logger.debug("No valid rule match and LLM unavailable (circuit open). Using rules-only result.")
+        llm_result = {"intent": "unknown", "entities": {}}
 
     # Validate LLM result before returning
     if llm_result["intent"] != "unknown":
          if validate_entities(llm_result["intent"], llm_result["entities"]):
-             logger.info(f"LLM NLU valid result: {llm_result}")
+             logger.debug("LLM NLU valid result: %s", llm_result)
              llm_result["entities"]["llm_fallback"] = True # Mark as LLM result
              return llm_result
          else:
-             logger.warning(f"LLM NLU result failed entity validation: {llm_result}")
+             logger.warning("LLM NLU result failed entity validation: %s", llm_result)
              # Optionally keep entities even if validation fails? Or discard? Discarding for now.
              llm_result["intent"] = "unknown" # Treat as unknown if validation fails
 
     # Final Fallback if both rules and LLM NLU fail or return unknown/invalid
-    logger.info("Rules and LLM NLU failed or returned unknown. Using final fallback.")
+    logger.debug("Rules and LLM NLU failed or returned unknown. Using final fallback.")
     final_intent = "save_note" if len(text) > 10 else "unknown" # Basic heuristic
     final_entities = {"content": text} if final_intent == "save_note" else {"raw_text": text}
     if "llm_error" in llm_result.get("entities", {}): # Preserve LLM error if it occurred
@@ -405,11 +346,11 @@ def validate_llm_response(response: Dict) -> bool:
 
 async def get_intent_and_entities_from_llm(text: str) -> Dict[str, Any]:
     """Improved LLM response handling with validation"""
-    result = {"intent": "unknown", "entities": {}}; logger.debug(f"--- Calling LLM for NLU: '{text}' ---")
+    result = {"intent": "unknown", "entities": {}}; logger.debug("--- Calling LLM for NLU: '%s' ---", text)
     try:
         llm_service = get_llm_service(); prompt = build_llm_nlu_prompt(text)
-        response = await llm_service.generate_text(prompt=prompt, max_tokens=300, temperature=0.1)
-        logger.debug(f"Raw LLM NLU response: {response}")
+        response = await llm_service.generate_text(prompt=prompt, task=TASK_NLU, priority=PRIORITY_INTERACTIVE) # Profile sets model, max_tokens=300, temperature=0.1
+        logger.debug("Raw LLM NLU response: %s", response)
         json_str = extract_json(response)
         if json_str:
             try:
@@ -417,7 +358,7 @@ async def get_intent_and_entities_from_llm(text: str) -> Dict[str, Any]:
                 if validate_llm_response(parsed):
                     result["intent"] = parsed["intent"]
                     result["entities"] = filter_entities(parsed.get("entities", {}))
-                    logger.info(f"LLM NLU Parsed: {result}")
+                    logger.debug("LLM NLU Parsed: %s", result)
                 else: logger.warning(f"LLM JSON invalid structure or intent: {parsed}")
             except json.JSONDecodeError as e: logger.error(f"LLM JSON Decode Error: {e} - Response: {json_str}")
         else: logger.warning(f"LLM response had no JSON: {response}")
@@ -0,0 +1,184 @@
+# backend/services/reminder_dispatcher.py
+# Fires reminders at their remind_at. A dispatcher holds the reminders due within the next
+# REMINDER_DISPATCH_WINDOW_SECONDS in a min-heap (loaded through the partial index on pending
+# remind_at) and sleeps until the earliest is due, so there is no per-second polling. Creating,
+# rescheduling or cancelling a reminder NOTIFYs the `reminders` channel (crud_reminder) and every
+# dispatcher LISTENs on it, so changes reach all instances within milliseconds; the window is
+# reloaded every half window as a safety net (missed notifications, listener reconnects).
+#
+# Any number of instances can dispatch: they all wake for the same reminder and the claim
+# (FOR UPDATE SKIP LOCKED, re-checking triggered_at) lets exactly one fire it. Delivery is
+# at-most-once (the claim marks it fired, or moves a recurring reminder to its next occurrence
+# and announces that). Delivering to the user is the claim's `reminder` push event (crud/events.py,
+# sent on commit to the user's /events streams); this module only schedules, claims and measures.
+# The API process dispatches unless REMINDER_DISPATCH_ENABLED=false; to run it separately:
+#
+#   python -m backend.services.reminder_dispatcher
+import argparse
+import asyncio
+import datetime
+import heapq
+import math
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from backend.db import session as db_session
+from backend.db.listener import PgListener
+from backend.crud.crud_reminder import REMINDER_CHANNEL
+from backend import crud
+from backend.core.config import settings, logger
+from backend.core import metrics
+
+CLAIM_SLACK_SECONDS = 1.0 # Tolerated clock skew between this host and the database when claiming
+RETRY_SECONDS = 5.0 # Reload delay after a database error
+
+REMINDERS_FIRED = metrics.counter("reminders_fired_total", "Reminders claimed and delivered by this process.")
+DISPATCH_LAG = metrics.histogram("reminder_dispatch_lag_seconds", "Delay between a reminder's remind_at and its delivery.")
+REMINDERS_LOADED = metrics.gauge("reminder_dispatch_loaded", "Pending reminders held in this dispatcher's heap.")
+
+
+class FiredReminder(NamedTuple):
+    id: int
+    user_id: int
+    content: str
+    remind_at: datetime.datetime
+
+
+class ReminderDispatcher:
+    def __init__(self, window_seconds: Optional[float] = None, max_loaded: Optional[int] = None):
+        self.window = window_seconds or settings.REMINDER_DISPATCH_WINDOW_SECONDS
+        self.max_loaded = max_loaded or settings.REMINDER_DISPATCH_MAX_LOADED
+        self._heap: List[Tuple[float, int]] = [] # (due epoch, id); entries not matching _due are stale
+        self._due: Dict[int, float] = {}
+        self._horizon = 0.0 # Reminders due after this aren't loaded; the next reload picks them up
+        self._next_reload = 0.0
+        self._reloading: Optional[List[Tuple[int, Optional[float]]]] = None # Changes seen while a reload runs
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listener = PgListener("Reminder dispatcher", {REMINDER_CHANNEL: self._on_notify}, on_reconnect=self._on_reconnect)
+        self._stopping = False
+
+    async def start(self):
+        self._loop, self._wake, self._stopping = asyncio.get_running_loop(), asyncio.Event(), False
+        listening = await self._listener.start()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Reminder dispatcher started (window {self.window:.0f}s, LISTEN {'on' if listening else 'off'})")
+
+    async def stop(self, timeout: float = 5.0):
+        self._stopping = True
+        self._listener.stop()
+        if self._wake is not None: self._wake.set()
+        if self._task is None: return
+        try: await asyncio.wait_for(self._task, timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError): pass
+        self._task = None
+        logger.info("Reminder dispatcher stopped.")
+
+    def schedule(self, reminder_id: int, due: Optional[float]):
+        """ (Re)schedules a reminder at epoch `due`, or drops it (due=None: cancelled or fired). Must run on the loop. """
+        if self._reloading is not None: self._reloading.append((reminder_id, due))
+        if due is None or due > self._horizon:
+            self._due.pop(reminder_id, None); return
+        if self._due.get(reminder_id) == due: return
+        self._due[reminder_id] = due
+        heapq.heappush(self._heap, (due, reminder_id))
+        if self._heap[0][1] == reminder_id and self._wake is not None: self._wake.set() # New earliest: re-arm the sleep
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                if time.time() >= self._next_reload: await self._reload()
+                due_ids = self._pop_due()
+                if due_ids: self._record(await asyncio.to_thread(self._claim, due_ids))
+            except Exception as e:
+                logger.error(f"Reminder dispatch failed: {e}", exc_info=True)
+                self._next_reload = min(self._next_reload, time.time() + RETRY_SECONDS) # Reload restores anything popped but unclaimed
+            REMINDERS_LOADED.set(len(self._due))
+            self._wake.clear()
+            next_at = min(self._heap[0][0] if self._heap else math.inf, self._next_reload)
+            try: await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, next_at - time.time()))
+            except asyncio.TimeoutError: pass
+
+    async def _reload(self):
+        started = time.time()
+        until = started + self.window
+        self._reloading = []
+        try: rows = await asyncio.to_thread(self._load_window, until)
+        finally: changes, self._reloading = self._reloading, None
+        # A full load may cut a busy window short: only trust it up to the last row it returned
+        self._horizon = rows[-1][1] if len(rows) >= self.max_loaded else until
+        self._due = dict(rows)
+        self._heap = [(due, reminder_id) for reminder_id, due in rows]
+        heapq.heapify(self._heap)
+        for reminder_id, due in changes: self.schedule(reminder_id, due) # Notifications that raced the query
+        self._next_reload = min(started + self.window / 2, self._horizon)
+        logger.debug("Reminder window reloaded: %d pending until %s", len(rows), self._horizon)
+
+    def _load_window(self, until: float) -> List[Tuple[int, float]]:
+        db = db_session.SessionLocal()
+        try:
+            rows = crud.reminder.get_due_window(db, until=datetime.datetime.fromtimestamp(until, datetime.timezone.utc), limit=self.max_loaded)
+            return [(reminder_id, remind_at.timestamp()) for reminder_id, remind_at in rows]
+        finally:
+            db.close()
+
+    def _pop_due(self) -> List[int]:
+        now = time.time()
+        due_ids = []
+        while self._heap and self._heap[0][0] <= now:
+            due, reminder_id = heapq.heappop(self._heap)
+            if self._due.get(reminder_id) == due:
+                del self._due[reminder_id]
+                due_ids.append(reminder_id)
+        return due_ids
+
+    def _claim(self, ids: List[int]) -> List[FiredReminder]:
+        db = db_session.SessionLocal()
+        try:
+            due_by = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=CLAIM_SLACK_SECONDS)
+            return [FiredReminder(*row) for row in crud.reminder.claim_due(db, ids=ids, due_by=due_by)]
+        finally:
+            db.close()
+
+    def _record(self, fired: List[FiredReminder]):
+        """ Metrics and log for reminders this process claimed (already delivered by claim_due's events). """
+        now = time.time()
+        for reminder in fired:
+            REMINDERS_FIRED.inc()
+            DISPATCH_LAG.observe(max(0.0, now - reminder.remind_at.timestamp()))
+            logger.info(f"Reminder {reminder.id} fired for user {reminder.user_id} (due {reminder.remind_at.isoformat()})")
+
+    def _on_notify(self, payload: str):
+        reminder_id, _, due = payload.partition(":")
+        try: self.schedule(int(reminder_id), float(due) if due else None)
+        except ValueError: logger.debug("Ignoring malformed reminder notification: %s", payload)
+
+    def _on_reconnect(self):
+        self._next_reload = 0.0 # Anything announced while disconnected was missed
+        if self._wake is not None: self._wake.set()
+
+
+async def _serve(window_seconds: float):
+    dispatcher = ReminderDispatcher(window_seconds)
+    await dispatcher.start()
+    try:
+        while True: await asyncio.sleep(3600)
+    finally:
+        await dispatcher.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the reminder dispatcher (separately from the API process).")
+    parser.add_argument("--window", type=float, default=settings.REMINDER_DISPATCH_WINDOW_SECONDS, help="Seconds of due reminders held in memory.")
+    args = parser.parse_args(argv)
+    if db_session.SessionLocal is None:
+        print("DATABASE_URL is not configured."); return 2
+    try: asyncio.run(_serve(args.window))
+    except KeyboardInterrupt: pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
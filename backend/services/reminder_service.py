@@ -10,7 +10,7 @@ def schedule_new_reminder(db: Session, reminder_data: Dict[str, Any], user_id: i
             reminder_data["remind_at"] = remind_at.replace(tzinfo=datetime.timezone.utc)
         reminder_schema = ReminderCreate(**reminder_data)
         saved_reminder = crud.reminder.create_with_owner(db=db, obj_in=reminder_schema, user_id=user_id)
-        logger.info(f"Reminder {saved_reminder.id} saved to DB for user {user_id}.")
-        logger.info(f"TASK QUEUE PLACEHOLDER: Would schedule task for reminder {saved_reminder.id} at {saved_reminder.remind_at}")
+        # The insert NOTIFYs the reminder dispatchers (crud_reminder), which fire it at remind_at
+        logger.info(f"Reminder {saved_reminder.id} saved to DB for user {user_id}, due {saved_reminder.remind_at}.")
         return True
     except Exception as e: logger.error(f"Error scheduling reminder for user {user_id}: {e}", exc_info=True); return False
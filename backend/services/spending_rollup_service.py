@@ -0,0 +1,64 @@
+# backend/services/spending_rollup_service.py
+# Maintenance commands for the spending_daily_rollups table (see backend/crud/crud_spending_rollup.py).
+#
+#   python -m backend.services.spending_rollup_service check              # exit 1 if any rollup row drifted
+#   python -m backend.services.spending_rollup_service check --repair     # ...and rebuild the affected users
+#   python -m backend.services.spending_rollup_service rebuild            # recompute every user's rollups
+#   python -m backend.services.spending_rollup_service rebuild --user-id 42
+#
+# Rollups are kept in step by CRUDSpendingLog, so drift only comes from writes that bypass it
+# (manual SQL, bulk imports); the migration that creates the table backfills it.
+import argparse
+import sys
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.db import session as db_session
+from backend import crud
+from backend.core.config import logger
+
+MAX_REPORTED = 20 # Drifted rows printed by `check`; the count is always printed
+
+
+def check_rollups(db: Session, *, user_id: Optional[int] = None, repair: bool = False) -> List[Dict[str, Any]]:
+    """ Compares rollups with spending_logs; with `repair`, rebuilds every user that drifted. Returns the drift found. """
+    drift = crud.spending_rollup.find_drift(db, user_id=user_id)
+    if drift: logger.warning(f"Spending rollups: {len(drift)} rows out of step with spending_logs")
+    if repair:
+        for drifted_user in sorted({row["user_id"] for row in drift}): crud.spending_rollup.rebuild(db, user_id=drifted_user)
+    return drift
+
+
+def _format_drift(row: Dict[str, Any]) -> str:
+    expected = "missing" if row["expected_count"] is None else f"{row['expected_count']} logs / {row['expected_total']:.2f}"
+    actual = "missing" if row["count"] is None else f"{row['count']} logs / {row['total']:.2f}"
+    return f"user {row['user_id']} {row['day']} [{row['category'] or 'uncategorized'}] {row['currency']}: expected {expected}, rollup {actual}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check or rebuild the spending_daily_rollups table.")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    parser.add_argument("--user-id", type=int, default=None, help="Limit to one user (default: all users).")
+    parser.add_argument("--repair", action="store_true", help="With check: rebuild users whose rollups drifted.")
+    args = parser.parse_args(argv)
+    if db_session.SessionLocal is None:
+        print("DATABASE_URL is not configured."); return 2
+
+    db = db_session.SessionLocal()
+    try:
+        if args.command == "rebuild":
+            print(f"Rebuilt {crud.spending_rollup.rebuild(db, user_id=args.user_id)} rollup rows.")
+            return 0
+        drift = check_rollups(db, user_id=args.user_id, repair=args.repair)
+        for row in drift[:MAX_REPORTED]: print(_format_drift(row))
+        if len(drift) > MAX_REPORTED: print(f"... and {len(drift) - MAX_REPORTED} more")
+        if not drift: print("Spending rollups match spending_logs."); return 0
+        print(f"{len(drift)} drifted rollup rows" + (" (affected users rebuilt)." if args.repair else "."))
+        return 0 if args.repair else 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
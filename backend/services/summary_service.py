@@ -1,11 +1,13 @@
 # backend/services/summary_service.py
-import logging; from typing import List, Dict, Any, Optional; from backend.services.llm import get_llm_service; from backend.core.config import logger
+import datetime; import logging; from typing import List, Dict, Any, Optional, Tuple; from backend.services.llm import get_llm_service, TASK_SUMMARY; from backend.services import analytics_service; from backend.core.config import logger
 logger = logging.getLogger(__name__)
+# NOTE: While the LLM circuit is open, get_llm_service() calls raise CircuitOpenError immediately,
+# so each summary below drops straight into its non-LLM fallback (raw entries / templated stats / excerpts).
 async def generate_daily_summary(data_to_summarize: List[Dict[str, Any]], user_preferences: Dict = None) -> str:
     if not data_to_summarize: return "No activities found for this period."
     timeline_entries = [f"{item.get('timestamp', '')} - {item.get('type', 'event').upper()}: {item.get('content', '')}" for item in data_to_summarize]
     activities_str = '\n'.join(timeline_entries); prompt = f"""Analyze daily activities:\n{activities_str}\nProvide:\n1. Time-bound summary\n2. Notable patterns\n3. Follow-ups\nSummary:"""
-    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, max_tokens=500)
+    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, task=TASK_SUMMARY, max_tokens=500)
     except Exception as e: logger.error(f"Daily summary error: {e}"); return "Couldn't generate daily summary. Raw entries:\n" + '\n'.join(timeline_entries[:5])
 async def generate_note_summary(notes_content: List[str], criteria_tags: List[str] = None, criteria_keywords: List[str] = None) -> str:
     if not notes_content: return "No notes available for summarization."
@@ -13,25 +15,46 @@ async def generate_note_summary(notes_content: List[str], criteria_tags: List[st
     if criteria_tags: criteria_desc.append(f"tags: {', '.join(criteria_tags)}")
     if criteria_keywords: criteria_desc.append(f"keywords: {', '.join(criteria_keywords)}")
     notes_str = '\n---\n'.join(notes_content[:10]); prompt = f"""Synthesize insights from notes{' filtered by ' + ' and '.join(criteria_desc) if criteria_desc else ''}:\nNotes:\n{notes_str}\nIdentify:\n1. Core themes\n2. Contradictions\n3. Actionable points\n4. Gaps\nSummary:"""
-    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, temperature=0.3)
+    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, task=TASK_SUMMARY, temperature=0.3)
     except Exception as e: logger.error(f"Note summary error: {e}"); return "Summary unavailable. Excerpts:\n" + '\n'.join(n[:100] for n in notes_content[:3])
-async def generate_spending_summary(spending_data: List[Dict], time_range: str = "month") -> str:
-    if not spending_data: return "No spending records found."
-    total = sum(float(item['amount']) for item in spending_data); currency = spending_data[0].get('currency', 'USD') if spending_data else 'USD' # Get currency from first item
-    breakdown = [f"- {item['date']}: {currency}{item['amount']:.2f} [{item.get('category', 'uncat.')}] {item.get('description', '')}" for item in spending_data]
-    breakdown_str = '\n'.join(breakdown); prompt = f"""Analyze spending (Total: {currency}{total:.2f}):\n{breakdown_str}\nProvide:\n1. Trends by category\n2. Unusual expenditures\n3. Comparisons\n4. Budget suggestions\nAnalysis:"""
-    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, max_tokens=600)
-    except Exception as e: logger.error(f"Spending summary error: {e}"); return f"Total spending: {currency}{total:.2f}\n" + '\n'.join(breakdown[:5])
+# Caps on the spending-analysis prompt: it is built from aggregates (analytics_service.spending_stats), so
+# its size depends on these limits only, not on how many logs fall in the range
+PROMPT_MAX_CURRENCIES = 3; PROMPT_MAX_CATEGORIES = 8; PROMPT_MAX_ITEMS = 5; PROMPT_MAX_OUTLIERS = 3; PROMPT_LABEL_CHARS = 40
+def _clip(text: Any) -> str: return " ".join(str(text or "").split())[:PROMPT_LABEL_CHARS].rstrip() # One line, bounded length (user-entered text)
+def build_spending_prompt(stats: List[Dict[str, Any]], time_range: str = "month", category: Optional[str] = None, explicit_range: Optional[Tuple[datetime.date, datetime.date]] = None) -> str:
+    if explicit_range: period = f"{explicit_range[0]} to {explicit_range[1]} (compared with the equally long period before)"
+    elif time_range in analytics_service.PERIOD_NAMES: current, previous = analytics_service.PERIOD_NAMES[time_range]; period = f"{current} so far (compared with the same stretch of {previous})"
+    else: period = "all time"
+    facts = []
+    for entry in stats[:PROMPT_MAX_CURRENCIES]:
+        currency, change = entry['currency'], entry['change_pct']
+        line = f"{currency}: total {entry['total']:.2f} over {entry['count']} purchases (typical purchase {entry['median']:.2f})"
+        if entry['previous_total'] is not None: line += f"; previous period {entry['previous_total']:.2f}" + (f" ({change:+.0f}%)" if change is not None else "")
+        facts.append(line)
+        shown, rest = entry['categories'][:PROMPT_MAX_CATEGORIES], entry['categories'][PROMPT_MAX_CATEGORIES:]
+        if shown: facts.append("  By category: " + "; ".join(f"{_clip(name)} {total:.2f} ({share:.0%}" + (f", previous {prev:.2f}" if prev is not None else "") + ")" for name, total, share, prev in shown)
+                               + (f"; {len(rest)} other categories {sum(c[1] for c in rest):.2f}" if rest else ""))
+        if entry['top_items']: facts.append("  Largest purchases: " + "; ".join(f"{day} {amount:.2f} {_clip(description or name)} [{_clip(name)}]" for amount, name, description, day in entry['top_items'][:PROMPT_MAX_ITEMS]))
+        if entry['outliers']: facts.append("  Flagged as unusually large: " + "; ".join(f"{day} {amount:.2f} {_clip(description or name)}" for amount, name, description, day in entry['outliers'][:PROMPT_MAX_OUTLIERS]))
+    if len(stats) > PROMPT_MAX_CURRENCIES: facts.append(f"({len(stats) - PROMPT_MAX_CURRENCIES} smaller currencies omitted)")
+    facts_str = '\n'.join(facts); subject = f" on {_clip(category)}" if category else ""
+    return f"""Analyze spending{subject} for {period}. Figures are precomputed aggregates; never add amounts in different currencies.\n{facts_str}\nProvide:\n1. Trends by category\n2. Unusual expenditures\n3. Comparisons with the previous period\n4. Budget suggestions\nAnalysis:"""
+async def generate_spending_summary(stats: List[Dict[str, Any]], time_range: str = "month", category: Optional[str] = None, explicit_range: Optional[Tuple[datetime.date, datetime.date]] = None) -> str:
+    """ LLM analysis of analytics_service.spending_stats output; falls back to the templated reply. """
+    if not any(entry['count'] for entry in stats): return "No spending records found."
+    prompt = build_spending_prompt(stats, time_range, category, explicit_range)
+    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, task=TASK_SUMMARY, max_tokens=600)
+    except Exception as e: logger.error(f"Spending summary error: {e}"); return analytics_service.render_spending_reply(stats, time_range, category, explicit_range)
 async def generate_search_summary(results: List[Dict], query: str, context: Dict = None) -> str:
     if not results: return f"No results found for '{query}'."
     context_str = f" in context of {context['topic']}" if context and context.get('topic') else ""
     documents_str = '\n\n'.join(r.get('content','')[:500] for r in results) # Use get with default
     prompt = f"""Synthesize results for "{query}"{context_str}:\nDocuments:\n{documents_str}\nInclude:\n1. Relevance\n2. Findings\n3. Reliability\n4. Missing info\nSynthesis:"""
-    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, temperature=0.4, max_tokens=700)
+    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, task=TASK_SUMMARY, temperature=0.4, max_tokens=700)
     except Exception as e: logger.error(f"Search summary error: {e}"); return f"Top results for '{query}':\n" + '\n'.join(r.get('title', r.get('content',''))[:50] for r in results[:3]) # Use get with default
 async def generate_meeting_summary(transcript: str, participants: List[str]) -> str:
     transcript_str = transcript[:5000]; participants_str = ', '.join(participants)
     prompt = f"""Convert transcript to minutes:\nParticipants: {participants_str}\nTranscript:\n{transcript_str}\nInclude:\n1. Decisions\n2. Action items\n3. Topics\n4. Follow-ups\nMinutes:"""
-    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, temperature=0.1, max_tokens=800)
+    try: llm = get_llm_service(); return await llm.generate_text(prompt=prompt, task=TASK_SUMMARY, temperature=0.1, max_tokens=800)
     except Exception as e: logger.error(f"Meeting summary error: {e}"); return "Minutes unavailable. Transcript start:\n" + transcript[:500]
 
@@ -0,0 +1,211 @@
+# backend/services/temporal_service.py
+# Temporal expression parsing shared by the NLU rules and the /process entity helpers.
+# Precompiled fast paths cover ISO dates, relative offsets ("in 3 days"), day words, weekday names
+# and clock times; dateutil's fuzzy parser only sees text those can't explain.
+# Results are memoized per (normalized text, reference day). All datetimes are UTC.
+import datetime
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from backend.core import metrics
+
+try:
+    import dateutil.parser
+    DATEUTIL_AVAILABLE = True
+except ImportError:
+    DATEUTIL_AVAILABLE = False
+    logging.warning("python-dateutil not installed. Only fast-path date parsing available.")
+
+logger = logging.getLogger(__name__)
+
+UTC = datetime.timezone.utc
+DEFAULT_TIME_OF_DAY = datetime.time(9, 0) # When only a date is given ("on friday")
+TONIGHT_TIME = datetime.time(20, 0)
+
+WEEKDAYS = {"monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3, "friday": 4, "saturday": 5, "sunday": 6}
+DAY_WORD_OFFSETS = {"today": 0, "tonight": 0, "tomorrow": 1, "yesterday": -1, "day after tomorrow": 2}
+
+# --- Precompiled fast paths (matched against lowercased, whitespace-collapsed text) ---
+ISO_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:z|[+-]\d{2}:?\d{2})?)?$')
+RELATIVE_PATTERN = re.compile(r'\bin\s+(\d+|an?)\s+(minute|min|hour|hr|day|week|month|year)s?\b')
+DAY_WORD_PATTERN = re.compile(r'\b(day after tomorrow|today|tonight|tomorrow|yesterday)\b')
+WEEKDAY_PATTERN = re.compile(r'\b(?:(next|this|coming)\s+)?(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b')
+NEXT_PERIOD_PATTERN = re.compile(r'\bnext\s+(week|month|year)\b')
+CLOCK_PATTERN = re.compile(
+    r'\b(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)|' # 5pm, 9:30 am
+    r'\b(\d{1,2}):(\d{2})\b|' # 15:45
+    r'\b(noon|midnight)\b'
+)
+FILLER_PATTERN = re.compile(r'\b(?:at|on|by|the|for|of|around|from)\b|[,.]')
+# Leftover text with digits or month names may hold a date the fast paths missed
+FALLBACK_HINT_PATTERN = re.compile(r'\d|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b')
+
+# (date, time, delta): delta is set for sub-day offsets ("in 2 hours") resolved against the reference time
+ParsedSpec = Tuple[Optional[datetime.date], Optional[datetime.time], Optional[datetime.timedelta]]
+
+_parse_stats = {"fast_path": 0, "dateutil": 0, "unparsed": 0}
+
+
+def _add_months(day: datetime.date, months: int) -> datetime.date:
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    for last_day in (day.day, 30, 29, 28): # Clamp e.g. Jan 31 + 1 month to Feb 28/29
+        try: return day.replace(year=year, month=month, day=min(day.day, last_day))
+        except ValueError: continue
+    return day
+
+
+def _clock_time(match: re.Match) -> Optional[datetime.time]:
+    hour_12, minute_12, meridiem, hour_24, minute_24, word = match.groups()
+    if word: return datetime.time(12, 0) if word == "noon" else datetime.time(0, 0)
+    if meridiem:
+        hour, minute = int(hour_12), int(minute_12 or 0)
+        if not 1 <= hour <= 12 or minute > 59: return None
+        if meridiem.startswith("p") and hour != 12: hour += 12
+        elif meridiem.startswith("a") and hour == 12: hour = 0
+        return datetime.time(hour, minute)
+    hour, minute = int(hour_24), int(minute_24)
+    if hour > 23 or minute > 59: return None
+    return datetime.time(hour, minute)
+
+
+def _parse_iso(text: str) -> Optional[ParsedSpec]:
+    try: dt = datetime.datetime.fromisoformat(text.upper().replace("Z", "+00:00"))
+    except ValueError: return None
+    if len(text) == 10: return dt.date(), None, None # Date only
+    if dt.tzinfo is not None: dt = dt.astimezone(UTC)
+    return dt.date(), dt.time().replace(microsecond=0, tzinfo=None), None
+
+
+def _fast_parse(text: str, day: datetime.date) -> Optional[ParsedSpec]:
+    """ Regex-only parse. None when nothing temporal was found or the rest needs dateutil. """
+    if ISO_PATTERN.match(text): return _parse_iso(text)
+    found_date, found_time, delta, spans = None, None, None, []
+
+    relative = RELATIVE_PATTERN.search(text)
+    if relative:
+        amount = 1 if relative.group(1) in ("a", "an") else int(relative.group(1))
+        unit = relative.group(2)
+        if unit in ("minute", "min"): delta = datetime.timedelta(minutes=amount)
+        elif unit in ("hour", "hr"): delta = datetime.timedelta(hours=amount)
+        elif unit == "day": found_date = day + datetime.timedelta(days=amount)
+        elif unit == "week": found_date = day + datetime.timedelta(weeks=amount)
+        else: found_date = _add_months(day, amount * (12 if unit == "year" else 1))
+        spans.append(relative.span())
+
+    day_word = DAY_WORD_PATTERN.search(text)
+    if day_word and found_date is None and delta is None:
+        found_date = day + datetime.timedelta(days=DAY_WORD_OFFSETS[day_word.group(1)])
+        spans.append(day_word.span())
+
+    weekday = WEEKDAY_PATTERN.search(text)
+    if weekday and found_date is None and delta is None:
+        days_ahead = (WEEKDAYS[weekday.group(2)] - day.weekday()) % 7
+        if weekday.group(1) == "next" and days_ahead == 0: days_ahead = 7 # "next friday" on a friday
+        found_date = day + datetime.timedelta(days=days_ahead)
+        spans.append(weekday.span())
+
+    next_period = NEXT_PERIOD_PATTERN.search(text)
+    if next_period and found_date is None and delta is None:
+        unit = next_period.group(1)
+        found_date = day + datetime.timedelta(weeks=1) if unit == "week" else _add_months(day, 12 if unit == "year" else 1)
+        spans.append(next_period.span())
+
+    clock = CLOCK_PATTERN.search(text)
+    if clock:
+        found_time = _clock_time(clock)
+        spans.append(clock.span())
+
+    if found_date is None and found_time is None and delta is None: return None
+    leftover = text
+    for start, end in sorted(spans, reverse=True): leftover = leftover[:start] + " " + leftover[end:]
+    if FALLBACK_HINT_PATTERN.search(FILLER_PATTERN.sub(" ", leftover)): return None
+
+    if delta is not None: return None, None, delta
+    if found_time is None and day_word and day_word.group(1) == "tonight": found_time = TONIGHT_TIME
+    return found_date or day, found_time, None
+
+
+def _dateutil_parse(text: str, day: datetime.date) -> Optional[ParsedSpec]:
+    if not DATEUTIL_AVAILABLE or not FALLBACK_HINT_PATTERN.search(text): return None
+    try:
+        dt = dateutil.parser.parse(text, fuzzy=True, default=datetime.datetime.combine(day, DEFAULT_TIME_OF_DAY))
+    except (ValueError, OverflowError, TypeError) as e:
+        logger.debug(f"dateutil could not parse '{text}': {e}")
+        return None
+    if dt.tzinfo is not None: dt = dt.astimezone(UTC)
+    return dt.date(), dt.time().replace(microsecond=0, tzinfo=None), None
+
+
+@lru_cache(maxsize=4096)
+def _parse_for_day(text: str, day: datetime.date) -> Optional[ParsedSpec]:
+    spec = _fast_parse(text, day)
+    if spec is not None:
+        _parse_stats["fast_path"] += 1
+        return spec
+    spec = _dateutil_parse(text, day)
+    _parse_stats["dateutil" if spec is not None else "unparsed"] += 1
+    return spec
+
+
+def _reference(reference: Optional[datetime.datetime]) -> datetime.datetime:
+    if reference is None: return datetime.datetime.now(UTC)
+    return reference.replace(tzinfo=UTC) if reference.tzinfo is None else reference.astimezone(UTC)
+
+
+def parse_datetime_text(text: str, reference: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """ Parses free text ("5pm tomorrow", "next monday", "in 2 hours", "2030-03-01") into a UTC datetime. """
+    if not text or not isinstance(text, str): return None
+    reference = _reference(reference)
+    spec = _parse_for_day(" ".join(text.lower().split()), reference.date())
+    if spec is None: return None
+    found_date, found_time, delta = spec
+    if delta is not None: return (reference + delta).replace(microsecond=0)
+    return datetime.datetime.combine(found_date, found_time or DEFAULT_TIME_OF_DAY, tzinfo=UTC)
+
+
+def parse_time_expression(text: str, reference: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+    """ NLU entity form: {"date", "time", "datetime"} as ISO strings (all None if unparseable). """
+    dt = parse_datetime_text(text, reference)
+    if dt is None: return {"date": None, "time": None, "datetime": None}
+    return {
+        "date": dt.date().isoformat(),
+        "time": dt.time().isoformat(timespec='seconds'),
+        "datetime": dt.isoformat(timespec='seconds'),
+    }
+
+
+def parse_date(value: Any, reference: Optional[datetime.datetime] = None) -> Optional[datetime.date]:
+    """ Parses a date entity (date, datetime or text) into a date. """
+    if isinstance(value, datetime.datetime): return _reference(value).date()
+    if isinstance(value, datetime.date): return value
+    dt = parse_datetime_text(value, reference) if isinstance(value, str) else None
+    if dt is None: logger.debug(f"Could not parse '{value}' as date.")
+    return dt.date() if dt else None
+
+
+def parse_datetime(value: Any, reference: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """ Parses a datetime entity (datetime, date or text) into a timezone-aware UTC datetime. """
+    if isinstance(value, datetime.datetime): return _reference(value)
+    if isinstance(value, datetime.date): return datetime.datetime.combine(value, DEFAULT_TIME_OF_DAY, tzinfo=UTC)
+    dt = parse_datetime_text(value, reference) if isinstance(value, str) else None
+    if dt is None: logger.debug(f"Could not parse '{value}' as datetime.")
+    return dt
+
+
+def get_temporal_parser_metrics() -> Dict[str, Any]:
+    """ Which tier resolved cache misses, plus memoization hit/miss counts. """
+    info = _parse_for_day.cache_info()
+    return {**_parse_stats, "cache_hits": info.hits, "cache_misses": info.misses, "cache_size": info.currsize}
+
+
+def _temporal_metrics():
+    m = get_temporal_parser_metrics()
+    yield ("cache_hit_ratio", "gauge", "Hit ratio per in-process cache.", [({"cache": "temporal_parser"}, metrics.ratio(m["cache_hits"], m["cache_misses"]))])
+    yield ("cache_entries", "gauge", "Entries per in-process cache.", [({"cache": "temporal_parser"}, m["cache_size"])])
+    yield ("temporal_parse_total", "counter", "Uncached temporal parses by resolving tier.",
+           [({"tier": tier}, m[tier]) for tier in ("fast_path", "dateutil", "unparsed")])
+
+metrics.register_collector(_temporal_metrics)